@@ -0,0 +1,16 @@
+"""
+pytest 配置：把后端包和 Home Assistant 集成加入导入路径
+
+集成的 __init__.py 依赖 Home Assistant，这里只注册包路径而不执行它，
+测试只导入不依赖 Home Assistant 的模块（breaker、schema、snapshot 等）
+"""
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / "hvac-backend"))
+
+_package = types.ModuleType("hvac_modbus")
+_package.__path__ = [str(ROOT / "custom_components" / "hvac_modbus")]
+sys.modules.setdefault("hvac_modbus", _package)
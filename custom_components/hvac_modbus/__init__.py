@@ -5,16 +5,28 @@ from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.typing import ConfigType
 
 from .modbus import HVACModbusClient
-from .const import CONF_HOST, CONF_PORT, CONF_SLAVE_ID, CONF_SCAN_INTERVAL, DOMAIN, DEFAULT_PORT, DEFAULT_SLAVE_ID
+from .const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SLAVE_ID,
+    CONF_SCAN_INTERVAL,
+    CONF_PIPELINE_DEPTH,
+    DOMAIN,
+    DEFAULT_PORT,
+    DEFAULT_SLAVE_ID,
+    DEFAULT_PIPELINE_DEPTH,
+)
 from .coordinator import HVACDataCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
     Platform.CLIMATE,
     Platform.SENSOR,
     Platform.SWITCH,
@@ -31,7 +43,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate old entry to new version."""
-    _LOGGER.info("Migrating from version %s to version 2", config_entry.version)
+    _LOGGER.info("Migrating from version %s to version 3", config_entry.version)
 
     if config_entry.version == 1:
         # v1 used HTTP API, v2 uses direct Modbus
@@ -55,6 +67,19 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
             new_data[CONF_PORT],
         )
 
+    if config_entry.version == 2:
+        # v3 prefixes entity unique IDs with the entry ID so that several
+        # units (slave IDs) behind one gateway can coexist
+        @callback
+        def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict[str, Any] | None:
+            if entity_entry.unique_id.startswith("hvac_"):
+                return {"new_unique_id": f"{config_entry.entry_id}_{entity_entry.unique_id}"}
+            return None
+
+        await er.async_migrate_entries(hass, config_entry.entry_id, _migrate_unique_id)
+        hass.config_entries.async_update_entry(config_entry, version=3)
+        _LOGGER.info("Migration successful: entity unique IDs scoped to entry %s", config_entry.entry_id)
+
     return True
 
 
@@ -66,24 +91,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     scan_interval = entry.options.get(
         CONF_SCAN_INTERVAL, entry.data.get(CONF_SCAN_INTERVAL, 30)
     )
+    pipeline_depth = entry.options.get(CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH)
     
-    # Create Modbus client
-    modbus = HVACModbusClient(host=host, port=port, slave_id=slave_id)
-    
-    # Connect to Modbus device
-    connected = await modbus.connect()
-    if not connected:
-        _LOGGER.error("Failed to connect to Modbus device at %s:%s", host, port)
-        # Still proceed - coordinator will handle reconnection
+    # Create Modbus client (shares one connection per gateway host:port);
+    # it connects on the first poll, so setup never waits on the bus
+    modbus = HVACModbusClient(
+        host=host, port=port, slave_id=slave_id, pipeline_depth=pipeline_depth
+    )
     
     coordinator = HVACDataCoordinator(
         hass=hass,
         modbus=modbus,
         scan_interval=scan_interval,
+        unique_id_prefix=entry.entry_id,
     )
     
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the last persisted registers instead of waiting for a poll
+    if not await coordinator.async_restore():
+        _LOGGER.debug("No register snapshot for %s:%s, waiting for the first poll", host, port)
     
     hass.data[DOMAIN][entry.entry_id] = {
         "modbus": modbus,
@@ -93,6 +118,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
+    # First live refresh runs in the background; a slow or offline gateway
+    # no longer holds up Home Assistant startup
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
+    )
+    
     # Set up update listener for options
     entry.async_on_unload(entry.add_update_listener(async_update_options))
     
@@ -103,6 +134,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["coordinator"].async_save_snapshot()
         await data["modbus"].disconnect()
     
     return unload_ok
@@ -0,0 +1,77 @@
+"""Binary sensor platform for HVAC Modbus integration."""
+
+import logging
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, ROOM_IDS, ROOM_NAMES
+from .coordinator import HVACDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up HVAC binary sensor platform."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+
+    # 结露风险：供水温度与露点的裕量低于安全值
+    entities = [HVACCondensationRiskSensor(coordinator, None, "辐射结露风险")]
+    for room_id in ROOM_IDS:
+        room_name = ROOM_NAMES.get(room_id, room_id)
+        entities.append(HVACCondensationRiskSensor(coordinator, room_id, f"{room_name}结露风险"))
+
+    async_add_entities(entities)
+
+
+class HVACCondensationRiskSensor(BinarySensorEntity):
+    """Binary sensor for radiant panel condensation risk."""
+
+    _attr_has_entity_name = True
+    _attr_device_class = BinarySensorDeviceClass.MOISTURE
+
+    def __init__(
+        self,
+        coordinator: HVACDataCoordinator,
+        room_id: str | None,
+        name: str,
+    ) -> None:
+        """Initialize the binary sensor."""
+        self.coordinator = coordinator
+        self._room_id = room_id
+        scope = room_id or "system"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_derived_{scope}_condensation_risk"
+        self._attr_name = name
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if there is a condensation risk."""
+        return self.coordinator.get_derived_data(self._room_id).get("condensation_risk")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | None]:
+        """Return the dew point margin behind the state."""
+        derived = self.coordinator.get_derived_data(self._room_id)
+        key = "dew_point_margin" if self._room_id else "min_dew_point_margin"
+        return {"dew_point_margin": derived.get(key)}
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.data_available
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        self.async_on_remove(
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.derived_addresses("condensation_risk", self._room_id),
+            )
+        )
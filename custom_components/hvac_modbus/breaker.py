@@ -0,0 +1,96 @@
+"""Circuit breaker for the HVAC Modbus gateway connection."""
+
+import random
+import time
+from collections.abc import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while the gateway is unreachable.
+
+    The circuit opens after failure_threshold consecutive failures (or at
+    once via trip(), e.g. when a connection attempt fails). While open every
+    call is rejected; after a jittered exponential backoff a single trial is
+    let through (half-open). Success closes the circuit and resets the
+    backoff, failure re-opens it with a doubled delay up to max_delay.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._jitter = jitter
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Return the current state, moving from open to half-open when due."""
+        if self._state == OPEN and self._clock() >= self._open_until:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Return seconds until the next attempt is allowed (0 if allowed now)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self._open_until - self._clock(), 0.0)
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self._state = CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call and open the circuit at the threshold."""
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self._failure_threshold:
+            self.trip()
+
+    def trip(self) -> None:
+        """Open the circuit now with the next backoff delay."""
+        delay = min(self._base_delay * (2 ** self._trips), self._max_delay)
+        delay *= 1 + random.uniform(-self._jitter, self._jitter)
+        self._trips += 1
+        self._failures = 0
+        self._state = OPEN
+        self._open_until = self._clock() + delay
+        self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """Forget all failures (e.g. after the target changed)."""
+        self.record_success()
+
+    def as_dict(self) -> dict[str, float | str | int]:
+        """Return the breaker state (for diagnostics)."""
+        return {"state": self.state, "retry_in": round(self.retry_in, 3), "trips": self._trips}
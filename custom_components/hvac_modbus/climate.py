@@ -1,5 +1,6 @@
 """Climate platform for HVAC Modbus integration."""
 
+import asyncio
 import logging
 from typing import Any
 
@@ -52,7 +53,7 @@ class HVACRoomClimate(ClimateEntity):
         self.coordinator = coordinator
         self._modbus = modbus
         self._room_id = room_id
-        self._attr_unique_id = f"hvac_{room_id}_climate"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_{room_id}_climate"
         self._attr_translation_key = f"hvac_{room_id}"
         self._attr_name = f"{ROOM_NAMES.get(room_id, room_id)} 恒温器"
 
@@ -107,40 +108,42 @@ class HVACRoomClimate(ClimateEntity):
             return
         
         await self._modbus.set_room_setpoint(self._room_id, temperature)
-        await self.coordinator.async_request_refresh()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set hvac mode."""
         if hvac_mode == HVACMode.OFF:
             await self._modbus.set_system_power(False)
         else:
-            # Turn on power first
-            await self._modbus.set_system_power(True)
             # Map HVAC mode to run mode
             run_mode_map = {
                 HVACMode.COOL: 1,
                 HVACMode.HEAT: 2,
             }
             run_mode = run_mode_map.get(hvac_mode, 1)
-            await self._modbus.set_run_mode(run_mode)
-        
-        await self.coordinator.async_request_refresh()
+            # Power and run mode go out in the same write batch (power first)
+            await asyncio.gather(
+                self._modbus.set_system_power(True),
+                self._modbus.set_run_mode(run_mode),
+            )
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set preset mode."""
         home_mode = preset_mode == PRESET_HOME
         await self._modbus.set_home_mode(home_mode)
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self.room_data is not None
+        return self.coordinator.data_available and self.room_data is not None
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.room_addresses(self._room_id, "temp", "setpoint", "humidity", "dew_point")
+                | self.coordinator.field_addresses("system", "power", "run_mode", "home_mode"),
+            )
         )
 
     @property
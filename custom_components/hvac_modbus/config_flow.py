@@ -15,10 +15,13 @@ from .const import (
     CONF_PORT,
     CONF_SLAVE_ID,
     CONF_SCAN_INTERVAL,
+    CONF_PIPELINE_DEPTH,
     DEFAULT_HOST,
     DEFAULT_PORT,
     DEFAULT_SLAVE_ID,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_PIPELINE_DEPTH,
+    MAX_PIPELINE_DEPTH,
     DOMAIN,
 )
 
@@ -53,13 +56,13 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     if not connected:
         raise ValueError("cannot_connect")
     
-    return {"title": f"HVAC Modbus ({data[CONF_HOST]}:{data[CONF_PORT]})"}
+    return {"title": f"HVAC Modbus ({data[CONF_HOST]}:{data[CONF_PORT]} #{data[CONF_SLAVE_ID]})"}
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for HVAC Modbus."""
 
-    VERSION = 2
+    VERSION = 3
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -68,6 +71,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         
         if user_input is not None:
+            # One entry per unit: gateway host:port plus slave ID
+            await self.async_set_unique_id(
+                f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}:{user_input[CONF_SLAVE_ID]}"
+            )
+            self._abort_if_unique_id_configured()
             try:
                 info = await validate_input(self.hass, user_input)
             except ValueError as err:
@@ -121,6 +129,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_SCAN_INTERVAL,
                         default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
                     ): int,
+                    vol.Optional(
+                        CONF_PIPELINE_DEPTH,
+                        default=options.get(CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH),
+                    ): vol.All(int, vol.Range(min=1, max=MAX_PIPELINE_DEPTH)),
                 }
             ),
         )
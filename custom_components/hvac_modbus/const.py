@@ -7,12 +7,26 @@ CONF_HOST = "host"
 CONF_PORT = "port"
 CONF_SLAVE_ID = "slave_id"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_PIPELINE_DEPTH = "pipeline_depth"
 
 # Default values
 DEFAULT_HOST = "192.168.110.200"
 DEFAULT_PORT = 502
 DEFAULT_SLAVE_ID = 1
 DEFAULT_SCAN_INTERVAL = 30
+# 1 = one request at a time; >1 pipelines requests by Modbus TCP transaction ID
+DEFAULT_PIPELINE_DEPTH = 1
+MAX_PIPELINE_DEPTH = 16
+
+# Writes issued within this window (seconds) are sent as one batch
+WRITE_COALESCE_WINDOW = 0.05
+
+# Persisted register snapshot (restored at startup before the first poll):
+# minimum seconds between writes while values keep changing
+SNAPSHOT_SAVE_INTERVAL = 30
+# Restored values older than this (seconds) and still not confirmed by a poll
+# make entities unavailable instead of showing them as live
+STALE_MAX_AGE = 900
 
 # Room IDs
 ROOM_IDS = ["living_room", "master_bedroom", "second_bedroom", "study_room"]
@@ -34,15 +48,3 @@ RUN_MODES = {
 }
 
 RUN_MODE_REVERSE = {v: k for k, v in RUN_MODES.items()}
-
-# Register addresses for direct access
-REGISTER_ADDRESSES = {
-    "system_power": 1033,
-    "home_mode": 1034,
-    "run_mode": 1041,
-    "fan_speed": 1047,
-    "kitchen_radiant": 1133,
-    "humidifier": 1168,
-    "heating_setpoint": 1062,
-    "cooling_setpoint": 1066,
-}
@@ -1,14 +1,20 @@
 """Data coordinator for HVAC integration."""
 
 import logging
+import time
+from collections.abc import Callable
 from datetime import timedelta
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .modbus import HVACModbusClient, HVACModbusError
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, SNAPSHOT_SAVE_INTERVAL, STALE_MAX_AGE
+from .derived import SYSTEM_INPUTS, room_inputs
+from .registers import DATA_FIELDS, ROOMS
+from .snapshot import encode_registers, encode_snapshot, read_snapshot, write_snapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,22 +27,57 @@ class HVACDataCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         hass: HomeAssistant,
         modbus: HVACModbusClient,
         scan_interval: int = DEFAULT_SCAN_INTERVAL,
+        unique_id_prefix: str = "",
     ) -> None:
         """Initialize the coordinator."""
         self.modbus = modbus
+        # Namespaces entity unique IDs so several units can be configured
+        self.unique_id_prefix = unique_id_prefix
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
+            name=f"{DOMAIN} {modbus.host}:{modbus.port}/{modbus.slave_id}",
             update_interval=timedelta(seconds=scan_interval),
         )
         self._scan_interval = scan_interval
+        # Raw registers of the previous cycle and the addresses that changed since
+        self._previous_raw: dict[int, int] = {}
+        self._changed_addresses: set[int] | None = None
+        self._last_notified_available: bool | None = None
+        # Register address (None = every update) -> listener token -> callback
+        self._register_listeners: dict[int | None, dict[object, CALLBACK_TYPE]] = {}
+        # Optimistic writes not yet confirmed by a read-back, and the values
+        # they replaced (restored if the write fails)
+        self._optimistic: dict[int, int] = {}
+        self._rollback: dict[int, int | None] = {}
+        self._unsub_queued = modbus.add_queued_write_listener(self._handle_queued)
+        # Verify once per flushed write batch instead of once per entity write
+        self._unsub_writes = modbus.add_write_listener(self._handle_written)
+        # Last polled registers, restored at startup before the bus is reached
+        self._snapshot_path = hass.config.path(
+            STORAGE_DIR, f"{DOMAIN}.{unique_id_prefix or modbus.slave_id}.snapshot.bin"
+        )
+        # Body of the last written snapshot and when it was written (monotonic)
+        self._saved_snapshot: bytes | None = None
+        self._snapshot_saved_at = 0.0
 
     @property
     def connected(self) -> bool:
         """Return if the Modbus device is connected."""
         return self.modbus.is_connected
 
+    @property
+    def data_available(self) -> bool:
+        """Return if entities may show the data as live.
+
+        False after a failed update, or once restored values have stayed
+        unconfirmed for longer than STALE_MAX_AGE (e.g. a block that keeps failing).
+        """
+        if not self.last_update_success:
+            return False
+        age = self.modbus.stale_age
+        return age is None or age < STALE_MAX_AGE
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from Modbus device."""
         try:
@@ -45,21 +86,231 @@ class HVACDataCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             
             if not data.get("connected", False):
                 _LOGGER.warning("Modbus device not connected, attempting reconnect...")
+            
+            if self._optimistic:
+                # Keep pending writes visible until their read-back confirms them
+                data = self.modbus.build_data({**data.get("raw", {}), **self._optimistic})
+
+            self._track_changes(data.get("raw", {}))
+            # Unchanged registers are skipped by comparing the encoded body
+            if time.monotonic() - self._snapshot_saved_at >= SNAPSHOT_SAVE_INTERVAL:
+                self.hass.async_create_task(self.async_save_snapshot())
                 
             return data
         except Exception as err:
             _LOGGER.error("Error reading from Modbus device: %s", err)
             raise UpdateFailed(f"Error communicating with Modbus: {err}") from err
 
+    async def async_restore(self) -> bool:
+        """Publish the last persisted registers, marked stale, so entities start with values.
+
+        Returns False if there is no usable snapshot.
+        """
+        try:
+            snapshot = await self.hass.async_add_executor_job(read_snapshot, self._snapshot_path)
+        except OSError as err:  # never block setup on an unreadable file
+            _LOGGER.warning("Ignoring unreadable register snapshot: %s", err)
+            return False
+        if snapshot is None or not snapshot[1]:
+            return False
+        timestamp, raw = snapshot
+        raw = self.modbus.restore_raw(raw, timestamp)
+        if not raw:
+            return False
+        self._track_changes(raw)
+        self.data = self.modbus.build_data(raw)
+        _LOGGER.debug(
+            "Restored %s registers from a snapshot %.0fs old", len(raw), time.time() - timestamp
+        )
+        return True
+
+    async def async_save_snapshot(self) -> None:
+        """Persist the polled registers if they changed since the last write.
+
+        Restored values not yet confirmed by a poll and pending optimistic
+        writes are left out.
+        """
+        raw = {
+            address: value
+            for address, value in self.modbus.confirmed(self._previous_raw).items()
+            if address not in self._optimistic
+        }
+        if not raw:
+            return
+        self._snapshot_saved_at = time.monotonic()
+        body = encode_registers(raw)
+        if body == self._saved_snapshot:
+            return
+        self._saved_snapshot = body
+        try:
+            await self.hass.async_add_executor_job(
+                write_snapshot, self._snapshot_path, encode_snapshot(body, time.time())
+            )
+        except OSError as err:
+            self._saved_snapshot = None
+            _LOGGER.warning("Error writing register snapshot: %s", err)
+
+    def _track_changes(self, raw: dict[int, int]) -> None:
+        """Record which addresses differ from the previously published data."""
+        previous = self._previous_raw
+        self._changed_addresses = {
+            address for address in raw.keys() | previous.keys()
+            if raw.get(address) != previous.get(address)
+        }
+        self._previous_raw = raw
+
+    @callback
+    def _publish_raw(self, raw: dict[int, int]) -> None:
+        """Rebuild data from patched raw registers and notify affected entities."""
+        data = self.modbus.build_data(raw)
+        self._track_changes(data["raw"])
+        self.data = data
+        self.async_update_listeners()
+
+    @callback
+    def _handle_queued(self, address: int, value: int) -> None:
+        """Show a queued write immediately, before the device confirms it."""
+        if not self.data:
+            return
+        raw = dict(self.data.get("raw", {}))
+        if address not in self._rollback:
+            self._rollback[address] = raw.get(address)
+        self._optimistic[address] = value
+        raw[address] = value
+        self._publish_raw(raw)
+
+    @callback
+    def _handle_written(self, written: dict[int, int], failed: dict[int, int]) -> None:
+        """Verify a flushed write batch by reading back only its blocks."""
+        self.hass.async_create_task(self._async_verify_writes(written, failed))
+
+    async def _async_verify_writes(
+        self, written: dict[int, int], failed: dict[int, int]
+    ) -> None:
+        """Confirm written values from the device, roll back failed ones."""
+        values = await self.modbus.read_back(written) if written else {}
+        if values is None:
+            # Read-back failed: drop the optimistic values and fall back to a full poll
+            for address in written:
+                self._optimistic.pop(address, None)
+                self._rollback.pop(address, None)
+            await self.async_request_refresh()
+            return
+
+        raw = dict(self.data.get("raw", {})) if self.data else {}
+        for address, value in failed.items():
+            if self._optimistic.get(address) != value:
+                continue  # superseded by a newer queued write
+            self._optimistic.pop(address)
+            previous = self._rollback.pop(address, None)
+            _LOGGER.warning("Write of %s to register %s failed, rolling back", value, address)
+            if previous is None:
+                raw.pop(address, None)
+            else:
+                raw[address] = previous
+        for address, value in written.items():
+            if self._optimistic.get(address) == value:
+                self._optimistic.pop(address)
+                self._rollback.pop(address, None)
+            if values.get(address) != value:
+                _LOGGER.warning(
+                    "Register %s reads back %s after writing %s",
+                    address, values.get(address), value,
+                )
+        # Device values win, except for writes queued since this batch
+        raw.update(values)
+        raw.update(self._optimistic)
+        if self.data:
+            self._publish_raw(raw)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for every update."""
+        return self._add_listener(update_callback, None, context)
+
+    @callback
+    def async_add_register_listener(
+        self, update_callback: CALLBACK_TYPE, addresses: set[int] | frozenset[int] | None
+    ) -> Callable[[], None]:
+        """Listen for updates of the given register addresses only.
+
+        With addresses=None the listener is called on every update.
+        """
+        return self._add_listener(
+            update_callback, frozenset(addresses) if addresses is not None else None, None
+        )
+
+    @callback
+    def _add_listener(
+        self, update_callback: CALLBACK_TYPE, addresses: frozenset[int] | None, context: Any
+    ) -> Callable[[], None]:
+        """Register a listener with the base coordinator and in the register map.
+
+        The base coordinator still schedules refreshes and notifies everyone on
+        full updates; the register map decides who is notified after a partial one.
+        """
+        remove_listener = super().async_add_listener(update_callback, context)
+        token = object()
+        keys = addresses if addresses is not None else (None,)
+        for key in keys:
+            self._register_listeners.setdefault(key, {})[token] = update_callback
+
+        @callback
+        def remove() -> None:
+            remove_listener()
+            for key in keys:
+                listeners = self._register_listeners.get(key)
+                if listeners is not None:
+                    listeners.pop(token, None)
+                    if not listeners:
+                        del self._register_listeners[key]
+
+        return remove
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only listeners whose registers changed in the last cycle."""
+        changed = self._changed_addresses
+        self._changed_addresses = None
+        available = self.data_available
+        available_changed = available != self._last_notified_available
+        self._last_notified_available = available
+        if changed is None or available_changed:
+            super().async_update_listeners()
+            return
+        # Each listener once, even if several of its registers changed
+        notify = dict(self._register_listeners.get(None, {}))
+        for address in changed:
+            notify.update(self._register_listeners.get(address, {}))
+        for update_callback in notify.values():
+            update_callback()
+
+    @staticmethod
+    def field_addresses(section: str, *keys: str) -> set[int]:
+        """Return register addresses backing fields of a parsed data section."""
+        fields = DATA_FIELDS.get(section, {})
+        return {fields[key] for key in keys if key in fields}
+
+    @staticmethod
+    def room_addresses(room_id: str, *keys: str) -> set[int]:
+        """Return register addresses backing fields of a room."""
+        room = ROOMS.get(room_id, {})
+        return {room[key] for key in keys if isinstance(room.get(key), int)}
+
+    @staticmethod
+    def derived_addresses(key: str, room_id: str | None = None) -> set[int]:
+        """Return register addresses a derived metric depends on."""
+        if room_id is not None:
+            return room_inputs(room_id)
+        return set(SYSTEM_INPUTS.get(key, ()))
+
     def get_room_data(self, room_id: str) -> dict[str, Any] | None:
         """Get data for a specific room."""
         if not self.data:
             return None
-        rooms = self.data.get("rooms", [])
-        for room in rooms:
-            if room.get("id") == room_id:
-                return room
-        return None
+        return self.data.get("room_index", {}).get(room_id)
 
     def get_system_data(self) -> dict[str, Any]:
         """Get system control data."""
@@ -91,6 +342,15 @@ class HVACDataCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return {}
         return self.data.get("kitchen", {})
 
+    def get_derived_data(self, room_id: str | None = None) -> dict[str, Any]:
+        """Get derived metrics, for the whole system or a single room."""
+        if not self.data:
+            return {}
+        derived = self.data.get("derived", {})
+        if room_id is not None:
+            return derived.get("rooms", {}).get(room_id, {})
+        return derived
+
     def get_registers_by_group(self, group: str) -> dict[str, Any]:
         """Get registers for a specific group."""
         if not self.data:
@@ -100,17 +360,15 @@ class HVACDataCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     def get_register_value(self, group: str, register_name: str) -> Any:
         """Get a specific register value."""
-        registers = self.get_registers_by_group(group)
-        for addr, data in registers.items():
-            if data.get("name") == register_name:
-                return data.get("value")
+        if not self.data:
+            return None
+        data = self.data.get("name_index", {}).get((group, register_name))
+        if data:
+            return data.get("value")
         return None
 
     def get_register_data(self, address: int) -> dict[str, Any] | None:
         """Get register data by address."""
         if not self.data:
             return None
-        for group_data in self.data.get("registers", {}).values():
-            if address in group_data:
-                return group_data[address]
-        return None
+        return self.data.get("register_index", {}).get(address)
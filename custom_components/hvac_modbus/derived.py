@@ -0,0 +1,81 @@
+"""Derived comfort and condensation metrics for HVAC Modbus."""
+
+import math
+from typing import Any
+
+from .registers import DATA_FIELDS, ROOMS
+
+# 供水温度与露点的最小安全裕量（°C），低于该值辐射面板有结露风险
+CONDENSATION_MARGIN = 2.0
+
+# Register addresses each derived value depends on
+SYSTEM_INPUTS = {
+    "york_delta_t": {DATA_FIELDS["york"]["supply_temp"], DATA_FIELDS["york"]["return_temp"]},
+    "fresh_air_delta_t": {DATA_FIELDS["fresh_air"]["supply_temp"], DATA_FIELDS["fresh_air"]["return_temp"]},
+    "min_dew_point_margin": {DATA_FIELDS["york"]["supply_temp"]}
+    | {room["dew_point"] for room in ROOMS.values()},
+}
+SYSTEM_INPUTS["condensation_risk"] = SYSTEM_INPUTS["min_dew_point_margin"]
+
+
+def room_inputs(room_id: str) -> set[int]:
+    """Return register addresses the derived metrics of a room depend on."""
+    room = ROOMS[room_id]
+    return {
+        room["temp"],
+        room["dew_point"],
+        room["setpoint"],
+        DATA_FIELDS["york"]["supply_temp"],
+    }
+
+
+def humidex(temp: float, dew_point: float) -> float:
+    """Return the Humidex (felt temperature) from temperature and dew point."""
+    vapor_pressure = 6.11 * math.exp(5417.7530 * (1 / 273.16 - 1 / (273.15 + dew_point)))
+    return temp + 0.5555 * (vapor_pressure - 10)
+
+
+def _delta(section: dict[str, Any]) -> float | None:
+    supply, ret = section.get("supply_temp"), section.get("return_temp")
+    if supply is None or ret is None:
+        return None
+    return round(ret - supply, 2)
+
+
+def compute_derived(
+    rooms: list[dict[str, Any]], york: dict[str, Any], fresh_air: dict[str, Any]
+) -> dict[str, Any]:
+    """Compute derived metrics for all rooms from already parsed poll data.
+
+    The dew point margin compares each room's dew point against the York
+    supply water temperature feeding the radiant panels.
+    """
+    supply = york.get("supply_temp")
+    result_rooms: dict[str, dict[str, Any]] = {}
+    margins: list[float] = []
+    for room in rooms:
+        temp, dew_point, setpoint = room.get("temp"), room.get("dew_point"), room.get("setpoint")
+        margin = None
+        if supply is not None and dew_point is not None:
+            margin = round(supply - dew_point, 2)
+            margins.append(margin)
+        result_rooms[room["id"]] = {
+            "dew_point_margin": margin,
+            "condensation_risk": margin < CONDENSATION_MARGIN if margin is not None else None,
+            "setpoint_deviation": (
+                round(temp - setpoint, 2) if temp is not None and setpoint is not None else None
+            ),
+            "humidex": (
+                round(humidex(temp, dew_point), 1)
+                if temp is not None and dew_point is not None else None
+            ),
+        }
+
+    min_margin = min(margins) if margins else None
+    return {
+        "york_delta_t": _delta(york),
+        "fresh_air_delta_t": _delta(fresh_air),
+        "min_dew_point_margin": min_margin,
+        "condensation_risk": min_margin < CONDENSATION_MARGIN if min_margin is not None else None,
+        "rooms": result_rooms,
+    }
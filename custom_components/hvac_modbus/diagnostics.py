@@ -0,0 +1,25 @@
+"""Diagnostics support for HVAC Modbus integration."""
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry, including Modbus transport metrics."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    modbus = data["modbus"]
+    coordinator = data["coordinator"]
+
+    return {
+        "entry": dict(entry.data),
+        "connected": modbus.is_connected,
+        "last_update_success": coordinator.last_update_success,
+        "stale_age": modbus.stale_age,
+        "transport": modbus.transport_stats(),
+    }
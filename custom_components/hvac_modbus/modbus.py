@@ -2,23 +2,232 @@
 
 import asyncio
 import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 
 from pymodbus.client import AsyncModbusTcpClient
 from pymodbus.exceptions import ModbusException
 
-from .registers import REGISTERS, ROOMS, REGISTER_RANGES, scale_value, unscale_value
+from .derived import compute_derived
+from .registers import DATA_FIELDS, DECODER, ROOMS, REGISTER_RANGES, RANGE_POLL_TICKS, unscale_value
+from .breaker import CircuitBreaker
+from .scheduler import AdaptivePollScheduler
+from .stats import DurationStats, TransportStats
+from .transport import PipelinedModbusClient
+from .writer import QueuedListener, WriteListener, WriteQueue
+from .const import WRITE_COALESCE_WINDOW
 
 _LOGGER = logging.getLogger(__name__)
 
+# Addresses covered by the polled blocks; only these can be confirmed by a poll
+POLLED_ADDRESSES = frozenset(
+    address for start_address, count in REGISTER_RANGES for address in range(start_address, start_address + count)
+)
+
 
 class HVACModbusError(Exception):
     """Exception for HVAC Modbus errors."""
     pass
 
 
+class ModbusGateway:
+    """Shared Modbus TCP connection to one gateway.
+
+    Units behind the same gateway (different slave IDs) share one socket;
+    their requests are scheduled in FIFO order on the gateway lock. A circuit
+    breaker rejects reconnects while the gateway is unreachable, so polls
+    against a dead gateway fail fast instead of waiting for connect timeouts.
+
+    With pipeline_depth > 1 the gateway uses the pipelined transport and up to
+    pipeline_depth requests share the socket at once, matched by transaction ID.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float, pipeline_depth: int = 1) -> None:
+        """Initialize the gateway connection."""
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._pipeline_depth = pipeline_depth
+        self._client: AsyncModbusTcpClient | PipelinedModbusClient | None = None
+        # A plain lock serialises requests; a semaphore admits a pipeline of them
+        self._lock = asyncio.Lock() if pipeline_depth <= 1 else asyncio.Semaphore(pipeline_depth)
+        self._connect_lock = asyncio.Lock()
+        self._connected = False
+        self.users = 0
+        self.stats = TransportStats()
+        self.breaker = CircuitBreaker()
+
+    @property
+    def key(self) -> tuple[str, int]:
+        """Return the pool key of this gateway."""
+        return (self._host, self._port)
+
+    @property
+    def pipeline_depth(self) -> int:
+        """Return the maximum number of requests in flight."""
+        return self._pipeline_depth
+
+    @property
+    def is_connected(self) -> bool:
+        """Return connection status."""
+        return self._connected and self._client is not None and self._client.connected
+
+    async def connect(self) -> bool:
+        """Connect to the gateway unless another unit already did."""
+        async with self._connect_lock:
+            if self.is_connected:
+                return True
+            if not self.breaker.allow():
+                return False
+            return await self._connect()
+
+    async def _connect(self) -> bool:
+        """Open a new connection to the gateway."""
+        try:
+            if self._client is not None:
+                self._client.close()
+            if self._pipeline_depth > 1:
+                self._client = PipelinedModbusClient(
+                    self._host, self._port, self._timeout, self._pipeline_depth
+                )
+            else:
+                self._client = AsyncModbusTcpClient(
+                    host=self._host,
+                    port=self._port,
+                    timeout=self._timeout,
+                )
+            self._connected = await self._client.connect()
+            self.stats.reconnects["success" if self._connected else "failure"] += 1
+            if self._connected:
+                self.breaker.record_success()
+                _LOGGER.info("Connected to Modbus device at %s:%s", self._host, self._port)
+            else:
+                self.breaker.trip()
+                _LOGGER.error(
+                    "Failed to connect to Modbus device at %s:%s, retrying in %.1fs",
+                    self._host, self._port, self.breaker.retry_in,
+                )
+            return self._connected
+        except Exception as err:
+            self._connected = False
+            self.stats.reconnects["failure"] += 1
+            self.breaker.trip()
+            _LOGGER.error(
+                "Error connecting to Modbus device: %s, retrying in %.1fs", err, self.breaker.retry_in
+            )
+            return False
+
+    async def reconnect(self) -> bool:
+        """Re-establish the connection once for all units waiting on it.
+
+        Returns False at once while the circuit breaker is open.
+        """
+        async with self._connect_lock:
+            if self.is_connected:
+                return True
+            if not self.breaker.allow():
+                return False
+            _LOGGER.info("Attempting to reconnect to Modbus device...")
+            return await self._connect()
+
+    async def disconnect(self) -> None:
+        """Close the gateway connection."""
+        if self._client:
+            self._client.close()
+            self._connected = False
+            _LOGGER.info("Disconnected from Modbus device at %s:%s", self._host, self._port)
+
+    def mark_disconnected(self) -> None:
+        """Flag the connection as broken after a transport error.
+
+        Pipelined requests failing together on one broken connection count
+        as a single failure.
+        """
+        if self._connected:
+            self._connected = False
+            self.breaker.record_failure()
+
+    async def _request(self, function: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one request under the gateway lock and record its statistics."""
+        queued = time.monotonic()
+        async with self._lock:
+            started = time.monotonic()
+            self.stats.lock_wait.observe(started - queued)
+            try:
+                result = await call()
+            except Exception as err:
+                self.stats.record_error(function, err)
+                raise
+            finally:
+                self.stats.requests[function].observe(time.monotonic() - started)
+        if result.isError():
+            self.stats.record_error(function, None)
+        elif function == "03":
+            self.stats.bytes_read += 2 * len(result.registers)
+        return result
+
+    async def read_holding_registers(self, address: int, count: int, device_id: int) -> Any:
+        """Read holding registers of one unit behind the gateway."""
+        return await self._request(
+            "03",
+            lambda: self._client.read_holding_registers(
+                address=address,
+                count=count,
+                device_id=device_id,
+            ),
+        )
+
+    async def write_register(self, address: int, value: int, device_id: int) -> Any:
+        """Write a single holding register of one unit behind the gateway."""
+        return await self._request(
+            "06",
+            lambda: self._client.write_register(
+                address=address,
+                value=value,
+                device_id=device_id,
+            ),
+        )
+
+    async def write_registers(self, address: int, values: list[int], device_id: int) -> Any:
+        """Write contiguous holding registers (FC16) of one unit behind the gateway."""
+        return await self._request(
+            "16",
+            lambda: self._client.write_registers(
+                address=address,
+                values=values,
+                device_id=device_id,
+            ),
+        )
+
+
+# Process-wide gateway pool keyed by (host, port)
+_GATEWAYS: dict[tuple[str, int], ModbusGateway] = {}
+
+
+def acquire_gateway(host: str, port: int, timeout: float, pipeline_depth: int = 1) -> ModbusGateway:
+    """Return the shared gateway for host:port, creating it on first use.
+
+    The first unit to connect decides the pipeline depth of the connection.
+    """
+    gateway = _GATEWAYS.get((host, port))
+    if gateway is None:
+        gateway = _GATEWAYS[(host, port)] = ModbusGateway(host, port, timeout, pipeline_depth)
+    gateway.users += 1
+    return gateway
+
+
+async def release_gateway(gateway: ModbusGateway) -> None:
+    """Release a gateway and close it when its last unit is gone."""
+    gateway.users -= 1
+    if gateway.users <= 0:
+        if _GATEWAYS.get(gateway.key) is gateway:
+            del _GATEWAYS[gateway.key]
+        await gateway.disconnect()
+
+
 class HVACModbusClient:
-    """Async Modbus TCP client for HVAC system."""
+    """Async Modbus TCP client for one HVAC unit (slave) behind a gateway."""
 
     def __init__(
         self,
@@ -26,15 +235,28 @@ class HVACModbusClient:
         port: int = 502,
         slave_id: int = 1,
         timeout: float = 5.0,
+        pipeline_depth: int = 1,
     ):
         """Initialize the Modbus client."""
         self._host = host
         self._port = port
         self._slave_id = slave_id
         self._timeout = timeout
-        self._client: AsyncModbusTcpClient | None = None
-        self._lock = asyncio.Lock()
-        self._connected = False
+        self._pipeline_depth = pipeline_depth
+        self._gateway: ModbusGateway | None = None
+        # Blocks are polled on their own adaptive schedule; values of blocks
+        # that are not due are served from this cache
+        self._scheduler = AdaptivePollScheduler(REGISTER_RANGES, RANGE_POLL_TICKS)
+        self._raw_cache: dict[int, int] = {}
+        # Restored addresses not yet confirmed by a live read, and when the
+        # restored snapshot was taken (wall clock)
+        self._stale: set[int] = set()
+        self._restored_at: float | None = None
+        # Poll cycle duration and register bytes read by the last cycle
+        self._poll_stats = DurationStats()
+        self._last_poll_bytes = 0
+        # Entity writes are coalesced into batched FC16 requests
+        self._write_queue = WriteQueue(self._write_block, WRITE_COALESCE_WINDOW)
 
     @property
     def host(self) -> str:
@@ -46,43 +268,35 @@ class HVACModbusClient:
         """Return the port."""
         return self._port
 
+    @property
+    def slave_id(self) -> int:
+        """Return the slave ID."""
+        return self._slave_id
+
     @property
     def is_connected(self) -> bool:
         """Return connection status."""
-        return self._connected and self._client is not None and self._client.connected
+        return self._gateway is not None and self._gateway.is_connected
 
     async def connect(self) -> bool:
-        """Connect to the Modbus device."""
-        try:
-            self._client = AsyncModbusTcpClient(
-                host=self._host,
-                port=self._port,
-                timeout=self._timeout,
+        """Connect to the Modbus device through the shared gateway."""
+        if self._gateway is None:
+            self._gateway = acquire_gateway(
+                self._host, self._port, self._timeout, self._pipeline_depth
             )
-            self._connected = await self._client.connect()
-            if self._connected:
-                _LOGGER.info("Connected to Modbus device at %s:%s", self._host, self._port)
-            else:
-                _LOGGER.error("Failed to connect to Modbus device at %s:%s", self._host, self._port)
-            return self._connected
-        except Exception as err:
-            _LOGGER.error("Error connecting to Modbus device: %s", err)
-            self._connected = False
-            return False
+        return await self._gateway.connect()
 
     async def disconnect(self) -> None:
-        """Disconnect from the Modbus device."""
-        if self._client:
-            self._client.close()
-            self._connected = False
-            _LOGGER.info("Disconnected from Modbus device")
+        """Release this unit's use of the shared gateway."""
+        if self._gateway is not None:
+            gateway, self._gateway = self._gateway, None
+            await release_gateway(gateway)
 
     async def _reconnect(self) -> bool:
         """Attempt to reconnect."""
-        _LOGGER.info("Attempting to reconnect to Modbus device...")
-        await self.disconnect()
-        await asyncio.sleep(1)
-        return await self.connect()
+        if self._gateway is None:
+            return await self.connect()
+        return await self._gateway.reconnect()
 
     async def read_registers(self, address: int, count: int) -> list[int] | None:
         """Read holding registers from the device."""
@@ -90,25 +304,20 @@ class HVACModbusClient:
             if not await self._reconnect():
                 return None
 
-        async with self._lock:
-            try:
-                result = await self._client.read_holding_registers(
-                    address=address,
-                    count=count,
-                    device_id=self._slave_id,
-                )
-                if result.isError():
-                    _LOGGER.error("Modbus read error at address %s: %s", address, result)
-                    return None
-                return list(result.registers)
-            except ModbusException as err:
-                _LOGGER.error("Modbus exception reading address %s: %s", address, err)
-                self._connected = False
-                return None
-            except Exception as err:
-                _LOGGER.error("Unexpected error reading address %s: %s", address, err)
-                self._connected = False
+        try:
+            result = await self._gateway.read_holding_registers(address, count, self._slave_id)
+            if result.isError():
+                _LOGGER.error("Modbus read error at address %s: %s", address, result)
                 return None
+            return list(result.registers)
+        except ModbusException as err:
+            _LOGGER.error("Modbus exception reading address %s: %s", address, err)
+            self._gateway.mark_disconnected()
+            return None
+        except Exception as err:
+            _LOGGER.error("Unexpected error reading address %s: %s", address, err)
+            self._gateway.mark_disconnected()
+            return None
 
     async def write_register(self, address: int, value: int) -> bool:
         """Write a single holding register."""
@@ -116,138 +325,185 @@ class HVACModbusClient:
             if not await self._reconnect():
                 return False
 
-        async with self._lock:
-            try:
-                result = await self._client.write_register(
-                    address=address,
-                    value=value,
-                    device_id=self._slave_id,
-                )
-                if result.isError():
-                    _LOGGER.error("Modbus write error at address %s: %s", address, result)
-                    return False
-                _LOGGER.debug("Successfully wrote value %s to address %s", value, address)
-                return True
-            except ModbusException as err:
-                _LOGGER.error("Modbus exception writing address %s: %s", address, err)
-                self._connected = False
+        try:
+            result = await self._gateway.write_register(address, value, self._slave_id)
+            if result.isError():
+                _LOGGER.error("Modbus write error at address %s: %s", address, result)
                 return False
-            except Exception as err:
-                _LOGGER.error("Unexpected error writing address %s: %s", address, err)
-                self._connected = False
+            _LOGGER.debug("Successfully wrote value %s to address %s", value, address)
+            self._scheduler.mark_due(address)
+            return True
+        except ModbusException as err:
+            _LOGGER.error("Modbus exception writing address %s: %s", address, err)
+            self._gateway.mark_disconnected()
+            return False
+        except Exception as err:
+            _LOGGER.error("Unexpected error writing address %s: %s", address, err)
+            self._gateway.mark_disconnected()
+            return False
+
+    async def write_registers(self, address: int, values: list[int]) -> bool:
+        """Write contiguous holding registers in one request (FC16)."""
+        if not self.is_connected:
+            if not await self._reconnect():
+                return False
+
+        try:
+            result = await self._gateway.write_registers(address, values, self._slave_id)
+            if result.isError():
+                _LOGGER.error("Modbus write error at address %s: %s", address, result)
                 return False
+            _LOGGER.debug("Successfully wrote values %s to address %s", values, address)
+            for offset in range(len(values)):
+                self._scheduler.mark_due(address + offset)
+            return True
+        except ModbusException as err:
+            _LOGGER.error("Modbus exception writing address %s: %s", address, err)
+            self._gateway.mark_disconnected()
+            return False
+        except Exception as err:
+            _LOGGER.error("Unexpected error writing address %s: %s", address, err)
+            self._gateway.mark_disconnected()
+            return False
+
+    async def _write_block(self, address: int, values: list[int]) -> bool:
+        """Write one coalesced run: FC06 for a single register, FC16 otherwise."""
+        if len(values) == 1:
+            return await self.write_register(address, values[0])
+        return await self.write_registers(address, values)
+
+    async def queue_write(self, address: int, value: int) -> bool:
+        """Queue a register write; writes within a short window are batched."""
+        return await self._write_queue.write(address, value)
+
+    def add_write_listener(self, listener: WriteListener) -> Callable[[], None]:
+        """Register a callback invoked with written/failed values after each batch."""
+        return self._write_queue.add_listener(listener)
+
+    def add_queued_write_listener(self, listener: QueuedListener) -> Callable[[], None]:
+        """Register a callback invoked as soon as a write is queued."""
+        return self._write_queue.add_queued_listener(listener)
+
+    async def read_back(self, addresses: Iterable[int]) -> dict[int, int] | None:
+        """Re-read only the blocks containing addresses (e.g. to verify writes).
+
+        Returns the raw values of the blocks read, or None if a read failed.
+        """
+        wanted = set(addresses)
+        blocks = [
+            (start_address, count)
+            for start_address, count in REGISTER_RANGES
+            if any(start_address <= address < start_address + count for address in wanted)
+        ]
+        values: dict[int, int] = {}
+        for (start_address, count), registers in await self._read_blocks(blocks):
+            self._scheduler.record(start_address, registers)
+            if not registers:
+                return None
+            for i, value in enumerate(registers):
+                self._raw_cache[start_address + i] = value
+                values[start_address + i] = value
+            self._stale.difference_update(range(start_address, start_address + count))
+        return values
+
+    def restore_raw(self, raw_data: dict[int, int], timestamp: float) -> dict[int, int]:
+        """Seed the register cache from a persisted snapshot, marked stale.
+
+        Addresses outside the polled blocks are dropped, since no poll would
+        ever confirm them. Returns the registers that were restored.
+        """
+        raw_data = {address: value for address, value in raw_data.items() if address in POLLED_ADDRESSES}
+        self._raw_cache.update(raw_data)
+        self._stale.update(raw_data)
+        self._restored_at = timestamp
+        return raw_data
+
+    @property
+    def stale(self) -> bool:
+        """Return True while restored values are not yet confirmed by a poll."""
+        return bool(self._stale)
+
+    @property
+    def stale_age(self) -> float | None:
+        """Return the age in seconds of unconfirmed restored values, None if there are none."""
+        if not self._stale or self._restored_at is None:
+            return None
+        return time.time() - self._restored_at
+
+    def confirmed(self, raw_data: dict[int, int]) -> dict[int, int]:
+        """Return raw_data without the restored values not yet confirmed by a poll."""
+        if not self._stale:
+            return raw_data
+        return {address: value for address, value in raw_data.items() if address not in self._stale}
+
+    def build_data(self, raw_data: dict[int, int]) -> dict[str, Any]:
+        """Build structured data from raw registers, e.g. a locally patched copy."""
+        return self._parse_data(dict(raw_data))
+
+    def transport_stats(self) -> dict[str, Any]:
+        """Return poll statistics of this unit and transport statistics of its gateway."""
+        return {
+            "poll_cycle": self._poll_stats.as_dict(),
+            "last_poll_bytes": self._last_poll_bytes,
+            "pipeline_depth": self._gateway.pipeline_depth if self._gateway is not None else None,
+            "gateway": self._gateway.stats.as_dict() if self._gateway is not None else None,
+            "circuit_breaker": self._gateway.breaker.as_dict() if self._gateway is not None else None,
+        }
 
     async def read_all_data(self) -> dict[str, Any]:
         """Read all register data and return structured data."""
-        raw_data: dict[int, int] = {}
-        
-        # Read all register ranges
-        for start_address, count in REGISTER_RANGES:
-            registers = await self.read_registers(start_address, count)
+        # Read only the blocks that are due; the others keep their cached values
+        started = time.monotonic()
+        poll_bytes = 0
+        for (start_address, count), registers in await self._read_blocks(self._scheduler.due_blocks()):
+            self._scheduler.record(start_address, registers)
             if registers:
+                poll_bytes += 2 * len(registers)
                 for i, value in enumerate(registers):
-                    raw_data[start_address + i] = value
+                    self._raw_cache[start_address + i] = value
+                self._stale.difference_update(range(start_address, start_address + count))
+            else:
+                # Restored values stay (still stale) until a read succeeds
+                for address in range(start_address, start_address + count):
+                    if address not in self._stale:
+                        self._raw_cache.pop(address, None)
+        self._poll_stats.observe(time.monotonic() - started)
+        self._last_poll_bytes = poll_bytes
 
         # Parse raw data into structured format
-        return self._parse_data(raw_data)
+        return self._parse_data(dict(self._raw_cache))
+
+    async def _read_blocks(
+        self, blocks: Iterable[tuple[int, int]]
+    ) -> list[tuple[tuple[int, int], list[int] | None]]:
+        """Read register blocks, all in flight at once on a pipelined gateway."""
+        blocks = list(blocks)
+        if self._gateway is not None and self._gateway.pipeline_depth > 1 and len(blocks) > 1:
+            if not self.is_connected and not await self._reconnect():
+                return [(block, None) for block in blocks]
+            results = await asyncio.gather(
+                *(self.read_registers(start_address, count) for start_address, count in blocks)
+            )
+            return list(zip(blocks, results))
+        return [(block, await self.read_registers(*block)) for block in blocks]
 
     def _parse_data(self, raw_data: dict[int, int]) -> dict[str, Any]:
-        """Parse raw register data into structured format."""
+        """Parse raw register data into structured format.
+
+        Rooms, sections, grouped registers and lookup indexes all come from
+        one pass of the decoder compiled from registers.yaml.
+        """
         result = {
             "connected": self.is_connected,
-            "rooms": [],
-            "system": {},
-            "environment": {},
-            "york": {},
-            "fresh_air": {},
-            "registers": {},
-        }
-
-        # Parse room data
-        for room_id, room_config in ROOMS.items():
-            room_data = {
-                "id": room_id,
-                "name": room_config["name"],
-                "temp": self._get_scaled_value(raw_data, room_config["temp"]),
-                "humidity": self._get_scaled_value(raw_data, room_config["humidity"]),
-                "dew_point": self._get_scaled_value(raw_data, room_config["dew_point"]),
-                "setpoint": self._get_scaled_value(raw_data, room_config["setpoint"]),
-                "radiant": raw_data.get(room_config.get("radiant", 0), 0) == 1 if "radiant" in room_config else None,
-                "design_temp": self._get_scaled_value(raw_data, room_config.get("design_temp")) if "design_temp" in room_config else None,
-            }
-            result["rooms"].append(room_data)
-
-        # Parse system data
-        result["system"] = {
-            "power": raw_data.get(1033, 0) == 1,
-            "home_mode": raw_data.get(1034, 0) == 1,
-            "run_mode": raw_data.get(1041, 1),
-            "fan_speed": raw_data.get(1047, 0),
-            # 新增系统阈值
-            "heating_supply_temp_limit": self._get_scaled_value(raw_data, 1035),
-            "cooling_supply_temp_set": self._get_scaled_value(raw_data, 1036),
-            "humidity_stop_limit": raw_data.get(1037),
-            "humidity_start_point": raw_data.get(1048),
-            "fresh_air_outlet_humidity": self._get_scaled_value(raw_data, 1046),
-        }
-
-        # Parse environment data
-        result["environment"] = {
-            "indoor_pm25": self._get_scaled_value(raw_data, 1024),
-            "indoor_co2": self._get_scaled_value(raw_data, 1026),
-            "outdoor_temp": self._get_scaled_value(raw_data, 1027),
-            "outdoor_humidity": self._get_scaled_value(raw_data, 1028),
+            "stale": bool(self._stale),
+            **DECODER.decode(raw_data),
+            "raw": raw_data,
         }
 
-        # Parse york data
-        result["york"] = {
-            "supply_temp": self._get_scaled_value(raw_data, 1029),
-            "return_temp": self._get_scaled_value(raw_data, 1030),
-            "run_mode_feedback": raw_data.get(1031),
-            "heating_setpoint": self._get_scaled_value(raw_data, 1062),
-            "cooling_setpoint": self._get_scaled_value(raw_data, 1066),
-        }
-
-        # Parse fresh air data
-        result["fresh_air"] = {
-            "status_code1": raw_data.get(1049),
-            "compressor_freq": self._get_scaled_value(raw_data, 1161),
-            "total_current": self._get_scaled_value(raw_data, 1162),
-            "compressor_current": self._get_scaled_value(raw_data, 1163),
-            "supply_temp": self._get_scaled_value(raw_data, 1164),
-            "return_temp": self._get_scaled_value(raw_data, 1165),
-            "humidifier": raw_data.get(1168, 0) == 1,
-        }
-
-        # Parse kitchen data
-        result["kitchen"] = {
-            "radiant": raw_data.get(1133, 0) == 1,
-        }
-
-        # Build grouped registers for compatibility
-        for address, value in raw_data.items():
-            if address in REGISTERS:
-                reg_info = REGISTERS[address]
-                group = reg_info.get("group", "unknown")
-                if group not in result["registers"]:
-                    result["registers"][group] = {}
-                result["registers"][group][address] = {
-                    "address": address,
-                    "name": reg_info["name"],
-                    "value": scale_value(value, address),
-                    "raw": value,
-                    "unit": reg_info.get("unit", ""),
-                    "desc": reg_info.get("desc", ""),
-                }
-
+        # Derived metrics (dew point margin, delta-T, comfort) from the parsed values
+        result["derived"] = compute_derived(result["rooms"], result["york"], result["fresh_air"])
         return result
 
-    def _get_scaled_value(self, raw_data: dict[int, int], address: int) -> float | None:
-        """Get scaled value from raw data."""
-        if address in raw_data:
-            return scale_value(raw_data[address], address)
-        return None
-
     async def set_room_setpoint(self, room_id: str, temperature: float) -> bool:
         """Set room temperature setpoint."""
         if room_id not in ROOMS:
@@ -256,47 +512,47 @@ class HVACModbusClient:
         
         address = ROOMS[room_id]["setpoint"]
         raw_value = unscale_value(temperature, address)
-        return await self.write_register(address, raw_value)
+        return await self.queue_write(address, raw_value)
 
     async def set_system_power(self, power: bool) -> bool:
         """Set system power."""
-        return await self.write_register(1033, 1 if power else 0)
+        return await self.queue_write(DATA_FIELDS["system"]["power"], 1 if power else 0)
 
     async def set_home_mode(self, home_mode: bool) -> bool:
         """Set home mode."""
-        return await self.write_register(1034, 1 if home_mode else 0)
+        return await self.queue_write(DATA_FIELDS["system"]["home_mode"], 1 if home_mode else 0)
 
     async def set_run_mode(self, mode: int) -> bool:
         """Set run mode (1=cooling, 2=heating, 3=ventilation, 4=dehumidification)."""
         if mode not in [1, 2, 3, 4]:
             _LOGGER.error("Invalid run mode: %s", mode)
             return False
-        return await self.write_register(1041, mode)
+        return await self.queue_write(DATA_FIELDS["system"]["run_mode"], mode)
 
     async def set_fan_speed(self, speed: int) -> bool:
         """Set fan speed (0-100%)."""
         if not 0 <= speed <= 100:
             _LOGGER.error("Invalid fan speed: %s", speed)
             return False
-        return await self.write_register(1047, speed)
+        return await self.queue_write(DATA_FIELDS["system"]["fan_speed"], speed)
 
     async def set_kitchen_radiant(self, on: bool) -> bool:
         """Set kitchen radiant."""
-        return await self.write_register(1133, 1 if on else 0)
+        return await self.queue_write(DATA_FIELDS["kitchen"]["radiant"], 1 if on else 0)
 
     async def set_humidifier(self, on: bool) -> bool:
         """Set humidifier."""
-        return await self.write_register(1168, 1 if on else 0)
+        return await self.queue_write(DATA_FIELDS["fresh_air"]["humidifier"], 1 if on else 0)
 
     async def set_heating_setpoint(self, temperature: float) -> bool:
         """Set heating supply water setpoint."""
-        raw_value = unscale_value(temperature, 1062)
-        return await self.write_register(1062, raw_value)
+        address = DATA_FIELDS["york"]["heating_setpoint"]
+        return await self.queue_write(address, unscale_value(temperature, address))
 
     async def set_cooling_setpoint(self, temperature: float) -> bool:
         """Set cooling supply water setpoint."""
-        raw_value = unscale_value(temperature, 1066)
-        return await self.write_register(1066, raw_value)
+        address = DATA_FIELDS["york"]["cooling_setpoint"]
+        return await self.queue_write(address, unscale_value(temperature, address))
 
     async def set_room_radiant(self, room_id: str, on: bool) -> bool:
         """Set room radiant switch."""
@@ -308,19 +564,19 @@ class HVACModbusClient:
             _LOGGER.error("Room %s does not have radiant control", room_id)
             return False
         address = room_config["radiant"]
-        return await self.write_register(address, 1 if on else 0)
+        return await self.queue_write(address, 1 if on else 0)
 
     async def set_humidity_start_point(self, humidity: int) -> bool:
         """Set humidity start point for humidifier."""
         if not 0 <= humidity <= 100:
             _LOGGER.error("Invalid humidity start point: %s", humidity)
             return False
-        return await self.write_register(1048, humidity)
+        return await self.queue_write(DATA_FIELDS["system"]["humidity_start_point"], humidity)
 
     async def test_connection(self) -> bool:
         """Test connection to the Modbus device."""
         if not await self.connect():
             return False
         # Try reading a register to verify communication
-        registers = await self.read_registers(1024, 1)
+        registers = await self.read_registers(REGISTER_RANGES[0][0], 1)
         return registers is not None
@@ -40,7 +40,6 @@ class HVACFanSpeedNumber(NumberEntity):
 
     _attr_has_entity_name = True
     _attr_name = "新风风速"
-    _attr_unique_id = "hvac_fan_speed"
     _attr_device_class = NumberDeviceClass.POWER_FACTOR
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_native_min_value = 0.0
@@ -51,6 +50,7 @@ class HVACFanSpeedNumber(NumberEntity):
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the number."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_fan_speed"
         self._modbus = modbus
 
     @property
@@ -62,17 +62,19 @@ class HVACFanSpeedNumber(NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
         await self._modbus.set_fan_speed(int(value))
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("system", "fan_speed"),
+            )
         )
 
 
@@ -81,7 +83,6 @@ class HVACHeatingSetpointNumber(NumberEntity):
 
     _attr_has_entity_name = True
     _attr_name = "制热供水设定点"
-    _attr_unique_id = "hvac_heating_setpoint"
     _attr_device_class = NumberDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_native_min_value = 30.0
@@ -92,6 +93,7 @@ class HVACHeatingSetpointNumber(NumberEntity):
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the number."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_heating_setpoint"
         self._modbus = modbus
 
     @property
@@ -103,17 +105,19 @@ class HVACHeatingSetpointNumber(NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
         await self._modbus.set_heating_setpoint(value)
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("york", "heating_setpoint"),
+            )
         )
 
 
@@ -122,7 +126,6 @@ class HVACCoolingSetpointNumber(NumberEntity):
 
     _attr_has_entity_name = True
     _attr_name = "制冷供水设定点"
-    _attr_unique_id = "hvac_cooling_setpoint"
     _attr_device_class = NumberDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_native_min_value = 5.0
@@ -133,6 +136,7 @@ class HVACCoolingSetpointNumber(NumberEntity):
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the number."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_cooling_setpoint"
         self._modbus = modbus
 
     @property
@@ -144,17 +148,19 @@ class HVACCoolingSetpointNumber(NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
         await self._modbus.set_cooling_setpoint(value)
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("york", "cooling_setpoint"),
+            )
         )
 
 
@@ -163,7 +169,6 @@ class HVACHumidityStartPointNumber(NumberEntity):
 
     _attr_has_entity_name = True
     _attr_name = "加湿启动湿度起点"
-    _attr_unique_id = "hvac_humidity_start_point"
     _attr_device_class = NumberDeviceClass.HUMIDITY
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_native_min_value = 0.0
@@ -174,6 +179,7 @@ class HVACHumidityStartPointNumber(NumberEntity):
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the number."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_humidity_start_point"
         self._modbus = modbus
 
     @property
@@ -185,15 +191,17 @@ class HVACHumidityStartPointNumber(NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
         await self._modbus.set_humidity_start_point(int(value))
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("system", "humidity_start_point"),
+            )
         )
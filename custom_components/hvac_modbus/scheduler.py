@@ -0,0 +1,81 @@
+"""Adaptive per-block poll scheduling for HVAC Modbus reads."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class _BlockState:
+    """Scheduling state of one register block."""
+
+    start: int
+    count: int
+    min_ticks: int
+    max_ticks: int
+    interval: int
+    countdown: int = 0
+    last_values: list[int] | None = None
+
+
+class AdaptivePollScheduler:
+    """Decide which register blocks are due on each coordinator tick.
+
+    Every block has its own interval, counted in coordinator ticks. A block
+    whose values changed drops back to its minimum interval; each stable read
+    doubles the interval up to its maximum.
+    """
+
+    def __init__(
+        self,
+        ranges: list[tuple[int, int]],
+        ticks: dict[int, tuple[int, int]],
+    ) -> None:
+        """Initialize the scheduler; all blocks are due on the first tick."""
+        self._blocks: list[_BlockState] = []
+        for start, count in ranges:
+            min_ticks, max_ticks = ticks.get(start, (1, 1))
+            self._blocks.append(
+                _BlockState(start, count, min_ticks, max_ticks, interval=min_ticks)
+            )
+
+    def due_blocks(self) -> list[tuple[int, int]]:
+        """Advance one tick and return the blocks to read now."""
+        due = []
+        for block in self._blocks:
+            block.countdown -= 1
+            if block.countdown <= 0:
+                due.append((block.start, block.count))
+        return due
+
+    def record(self, start: int, values: list[int] | None) -> None:
+        """Record the result of reading a block and reschedule it."""
+        block = self._block(start)
+        if block is None:
+            return
+        if values is None:
+            # Retry a failed block on the next tick
+            block.countdown = 1
+            return
+        if values != block.last_values:
+            block.interval = block.min_ticks
+        else:
+            block.interval = min(block.interval * 2, block.max_ticks)
+        block.last_values = values
+        block.countdown = block.interval
+
+    def mark_due(self, address: int) -> None:
+        """Force the block containing address to be read on the next tick."""
+        for block in self._blocks:
+            if block.start <= address < block.start + block.count:
+                block.countdown = 0
+                block.interval = block.min_ticks
+
+    def mark_all_due(self) -> None:
+        """Force every block to be read on the next tick."""
+        for block in self._blocks:
+            block.countdown = 0
+
+    def _block(self, start: int) -> _BlockState | None:
+        for block in self._blocks:
+            if block.start == start:
+                return block
+        return None
@@ -0,0 +1,282 @@
+"""Declarative register schema for the HVAC Modbus integration.
+
+The register map lives in registers.yaml, shared with the backend. At import
+it is compiled into a flat decode plan, so turning raw register values into
+the structured coordinator data is a single pass over the present registers
+with no per-register dictionary lookups. Only registers that need it (signed,
+32-bit) carry a decode function; bitfields are precompiled to shift/mask pairs.
+
+The module also holds the codec of the HVS1 register snapshot file. The
+backend loads this file by path, so both sides share one format and one
+compatibility rule.
+"""
+
+import struct
+import sys
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+SCHEMA_PATH = Path(__file__).with_name("registers.yaml")
+
+# Type -> (signed, registers spanned)
+TYPES = {
+    "uint16": (False, 1),
+    "int16": (True, 1),
+    "bool": (False, 1),
+    "uint32": (False, 2),
+    "int32": (True, 2),
+}
+WORD_ORDERS = ("big", "little")
+
+# (raw value, address, raw lookup) -> decoded integer, or None if incomplete
+Decode = Callable[[int, int, Callable[[int], int | None]], int | None]
+
+
+def _decode_int16(raw: int, address: int, get: Callable[[int], int | None]) -> int:
+    """Decode a two's complement 16-bit register."""
+    return raw - 0x10000 if raw & 0x8000 else raw
+
+
+def _wide_decoder(signed: bool, little: bool) -> Decode:
+    """Return a decoder for a 32-bit value spanning address and address + 1."""
+
+    def decode(raw: int, address: int, get: Callable[[int], int | None]) -> int | None:
+        other = get(address + 1)
+        if other is None:
+            return None
+        value = (other << 16 | raw) if little else (raw << 16 | other)
+        if signed and value & 0x80000000:
+            value -= 0x100000000
+        return value
+
+    return decode
+
+
+def compile_bits(bits: dict[str, int | list[int]] | None) -> tuple[tuple[str, int, int, bool], ...]:
+    """Compile a bitfield spec into (name, shift, mask, is_flag) tuples."""
+    compiled = []
+    for name, position in (bits or {}).items():
+        shift, width = (position, 1) if isinstance(position, int) else position
+        compiled.append((name, shift, (1 << width) - 1, width == 1))
+    return tuple(compiled)
+
+
+def decode_bits(value: int, bits: tuple[tuple[str, int, int, bool], ...]) -> dict[str, bool | int]:
+    """Extract named bitfields from a register value."""
+    return {
+        name: bool(value >> shift & mask) if is_flag else value >> shift & mask
+        for name, shift, mask, is_flag in bits
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class RegisterSpec:
+    """One register of the schema."""
+
+    address: int
+    name: str
+    group: str
+    key: str | None = None
+    type: str = "uint16"
+    scale: float = 1
+    unit: str = ""
+    rw: str = "RO"
+    desc: str = ""
+    enum: dict[int, str] | None = None
+    default: Any = None
+    word_order: str = "big"
+    bits: dict[str, int | list[int]] | None = None
+
+    @property
+    def signed(self) -> bool:
+        """Return True for two's complement registers."""
+        return TYPES[self.type][0]
+
+    @property
+    def width(self) -> int:
+        """Return the number of registers the value spans."""
+        return TYPES[self.type][1]
+
+    def decoder(self) -> Decode | None:
+        """Return the decode function, or None for plain unsigned 16-bit values."""
+        if self.width == 2:
+            return _wide_decoder(self.signed, self.word_order == "little")
+        if self.signed:
+            return _decode_int16
+        return None
+
+    def as_info(self) -> dict[str, Any]:
+        """Return the register as a legacy REGISTERS entry."""
+        info = {
+            "name": self.name,
+            "unit": self.unit,
+            "rw": self.rw,
+            "scaling": self.scale,
+            "desc": self.desc,
+            "group": self.group,
+        }
+        if self.type != "uint16":
+            info["type"] = self.type
+        if self.signed:
+            info["signed"] = True
+        if self.width == 2:
+            info["word_order"] = self.word_order
+        if self.enum:
+            info["enum"] = self.enum
+        if self.bits:
+            info["bits"] = self.bits
+        return info
+
+
+@dataclass(frozen=True, slots=True)
+class RegisterSchema:
+    """Parsed registers.yaml."""
+
+    registers: tuple[RegisterSpec, ...]
+    groups: dict[str, str]
+    rooms: tuple[str, ...]
+
+
+def load_schema(path: Path = SCHEMA_PATH) -> RegisterSchema:
+    """Load and validate the register schema."""
+    with open(path, encoding="utf-8") as file:
+        document = yaml.safe_load(file)
+    groups = dict(document["groups"])
+    registers = []
+    seen: set[int] = set()
+    for item in document["registers"]:
+        spec = RegisterSpec(**item)
+        if spec.type not in TYPES:
+            raise ValueError(f"Register {spec.address}: unknown type {spec.type!r}")
+        if spec.word_order not in WORD_ORDERS:
+            raise ValueError(f"Register {spec.address}: unknown word order {spec.word_order!r}")
+        if spec.group not in groups:
+            raise ValueError(f"Register {spec.address}: unknown group {spec.group!r}")
+        span = set(range(spec.address, spec.address + spec.width))
+        if span & seen:
+            raise ValueError(f"Register {spec.address} overlaps another register in {path.name}")
+        seen |= span
+        registers.append(spec)
+    return RegisterSchema(tuple(registers), groups, tuple(document["rooms"]))
+
+
+# Register snapshot file (little endian): magic, float64 timestamp, uint16 base
+# address, uint16 span, then span uint16 raw values and one presence byte per address
+SNAPSHOT_MAGIC = b"HVS1"
+SNAPSHOT_HEADER = struct.Struct("<4sdHH")
+
+
+def encode_snapshot_body(raw: array, present: bytes | bytearray) -> bytes:
+    """Encode the raw values and presence bytes of an address window."""
+    if sys.byteorder == "big":
+        raw = array("H", raw)
+        raw.byteswap()
+    return raw.tobytes() + bytes(present)
+
+
+def encode_snapshot_header(timestamp: float, base: int, span: int) -> bytes:
+    """Encode the header of a snapshot whose window starts at base."""
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, timestamp, base, span)
+
+
+def decode_snapshot(data: bytes) -> tuple[float, dict[int, int]] | None:
+    """Decode a snapshot file to (timestamp, address -> raw value).
+
+    Returns None for a truncated file or a bad magic. A file written with
+    another address window still maps by address; callers drop the addresses
+    they do not poll.
+    """
+    if len(data) < SNAPSHOT_HEADER.size:
+        return None
+    magic, timestamp, base, span = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or len(data) != SNAPSHOT_HEADER.size + 3 * span:
+        return None
+    raw = array("H")
+    raw.frombytes(data[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + 2 * span])
+    if sys.byteorder == "big":
+        raw.byteswap()
+    present = data[SNAPSHOT_HEADER.size + 2 * span:]
+    return timestamp, {base + offset: raw[offset] for offset in range(span) if present[offset]}
+
+
+class RegisterDecoder:
+    """Decode raw registers into structured data with a precompiled plan."""
+
+    def __init__(self, schema: RegisterSchema) -> None:
+        """Compile the schema into a decode plan and per-section defaults."""
+        self._rooms = schema.rooms
+        # Section (group or room ID) -> field defaults, in schema order
+        self._defaults: dict[str, dict[str, Any]] = {
+            room_id: {"id": room_id, "name": schema.groups[room_id]} for room_id in schema.rooms
+        }
+        # (address, section, key, is_bool, decode, scale, bits, static register entry)
+        plan = []
+        for spec in sorted(schema.registers, key=lambda spec: spec.address):
+            bits = compile_bits(spec.bits)
+            if spec.key is not None:
+                default = spec.default
+                if default is None and spec.type == "bool":
+                    default = False
+                section = self._defaults.setdefault(spec.group, {})
+                section[spec.key] = default
+                if bits:
+                    section[f"{spec.key}_bits"] = None
+            static = {"address": spec.address, "name": spec.name, "unit": spec.unit, "desc": spec.desc}
+            plan.append(
+                (
+                    spec.address,
+                    spec.group,
+                    spec.key,
+                    spec.type == "bool",
+                    spec.decoder(),
+                    spec.scale,
+                    bits,
+                    static,
+                )
+            )
+        self._plan = tuple(plan)
+
+    def decode(self, raw_data: dict[int, int]) -> dict[str, Any]:
+        """Return sections, grouped registers and lookup indexes in one pass."""
+        sections = {section: dict(defaults) for section, defaults in self._defaults.items()}
+        registers: dict[str, dict[int, dict[str, Any]]] = {}
+        register_index: dict[int, dict[str, Any]] = {}
+        name_index: dict[tuple[str, str], dict[str, Any]] = {}
+        get = raw_data.get
+        for address, section, key, is_bool, decode, scale, bits, static in self._plan:
+            raw = get(address)
+            if raw is None:
+                continue
+            value = raw if decode is None else decode(raw, address, get)
+            if value is None:
+                continue
+            if scale != 1:
+                value = value * scale
+            entry = {**static, "value": value, "raw": raw}
+            if bits:
+                entry["bits"] = decode_bits(raw, bits)
+            if key is not None:
+                fields = sections[section]
+                fields[key] = raw == 1 if is_bool else value
+                if bits:
+                    fields[f"{key}_bits"] = entry["bits"]
+            group = registers.get(section)
+            if group is None:
+                group = registers[section] = {}
+            group[address] = entry
+            register_index[address] = entry
+            name_index[(section, static["name"])] = entry
+        rooms = [sections.pop(room_id) for room_id in self._rooms]
+        return {
+            "rooms": rooms,
+            **sections,
+            "registers": registers,
+            "room_index": {room["id"]: room for room in rooms},
+            "register_index": register_index,
+            "name_index": name_index,
+        }
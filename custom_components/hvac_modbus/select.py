@@ -36,13 +36,13 @@ class HVACRunModeSelect(SelectEntity):
 
     _attr_has_entity_name = True
     _attr_name = "运行模式"
-    _attr_unique_id = "hvac_run_mode"
     _attr_icon = "mdi:air-conditioner"
     _attr_options = list(RUN_MODE_REVERSE.keys())
 
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the select."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_run_mode"
         self._modbus = modbus
 
     @property
@@ -60,15 +60,17 @@ class HVACRunModeSelect(SelectEntity):
         if option in RUN_MODE_REVERSE:
             run_mode = RUN_MODE_REVERSE[option]
             await self._modbus.set_run_mode(run_mode)
-            await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("system", "run_mode"),
+            )
         )
@@ -7,6 +7,7 @@ from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, Sen
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, UnitOfTemperature, CONCENTRATION_PARTS_PER_MILLION, CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, UnitOfFrequency, UnitOfElectricCurrent
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN, ROOM_IDS, ROOM_NAMES
@@ -15,6 +16,17 @@ from .coordinator import HVACDataCoordinator
 _LOGGER = logging.getLogger(__name__)
 
 
+def _diagnostic(entity: SensorEntity) -> SensorEntity:
+    """Mark a rarely used sensor as diagnostic and disabled by default.
+
+    Disabled entities are registered but never added to the state machine,
+    so they cost nothing until a user enables them.
+    """
+    entity._attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity._attr_entity_registry_enabled_default = False
+    return entity
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -34,11 +46,11 @@ async def async_setup_entry(
         HVACEnvironmentSensor(coordinator, "outdoor_humidity", "室外湿度", SensorDeviceClass.HUMIDITY, PERCENTAGE),
     ])
     
-    # System threshold sensors (新增)
+    # System threshold sensors (新增，固定阈值，默认禁用)
     entities.extend([
-        HVACSystemSensor(coordinator, "heating_supply_temp_limit", "制热送风温度下限", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
-        HVACSystemSensor(coordinator, "cooling_supply_temp_set", "制冷送风温度设定", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
-        HVACSystemSensor(coordinator, "humidity_stop_limit", "加湿停止上限", SensorDeviceClass.HUMIDITY, PERCENTAGE),
+        _diagnostic(HVACSystemSensor(coordinator, "heating_supply_temp_limit", "制热送风温度下限", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS)),
+        _diagnostic(HVACSystemSensor(coordinator, "cooling_supply_temp_set", "制冷送风温度设定", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS)),
+        _diagnostic(HVACSystemSensor(coordinator, "humidity_stop_limit", "加湿停止上限", SensorDeviceClass.HUMIDITY, PERCENTAGE)),
         HVACSystemSensor(coordinator, "fresh_air_outlet_humidity", "新风机送风口湿度", SensorDeviceClass.HUMIDITY, PERCENTAGE),
     ])
     
@@ -49,29 +61,43 @@ async def async_setup_entry(
             HVACRoomSensor(coordinator, room_id, "temp", f"{room_name}温度", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
             HVACRoomSensor(coordinator, room_id, "humidity", f"{room_name}湿度", SensorDeviceClass.HUMIDITY, PERCENTAGE),
             HVACRoomSensor(coordinator, room_id, "dew_point", f"{room_name}露点", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
-            # 新增房间传感器
-            HVACRoomSensor(coordinator, room_id, "design_temp", f"{room_name}设计基准温", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
-            HVACRoomSensor(coordinator, room_id, "panel_temp", f"{room_name}面板温度", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
-            HVACRoomRadiantSensor(coordinator, room_id, "panel_radiant", f"{room_name}面板辐射"),
+            # 新增房间传感器（诊断用，默认禁用）
+            _diagnostic(HVACRoomSensor(coordinator, room_id, "design_temp", f"{room_name}设计基准温", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS)),
+            _diagnostic(HVACRoomSensor(coordinator, room_id, "panel_temp", f"{room_name}面板温度", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS)),
+            _diagnostic(HVACRoomRadiantSensor(coordinator, room_id, "panel_radiant", f"{room_name}面板辐射")),
         ])
     
     # York sensors (扩展)
     entities.extend([
         HVACYorkSensor(coordinator, "supply_temp", "约克供水温度", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
         HVACYorkSensor(coordinator, "return_temp", "约克回水温度", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
-        HVACYorkRunModeSensor(coordinator, "run_mode_feedback", "约克运行模式反馈"),
+        _diagnostic(HVACYorkRunModeSensor(coordinator, "run_mode_feedback", "约克运行模式反馈")),
     ])
     
     # Fresh air sensors (扩展)
     entities.extend([
-        HVACFreshAirStatusCodeSensor(coordinator, "status_code1", "新风机状态码"),
-        HVACFreshAirSensor(coordinator, "compressor_freq", "新风压缩机频率", SensorDeviceClass.FREQUENCY, UnitOfFrequency.HERTZ),
-        HVACFreshAirSensor(coordinator, "total_current", "新风机整机电流", SensorDeviceClass.CURRENT, UnitOfElectricCurrent.AMPERE),
-        HVACFreshAirSensor(coordinator, "compressor_current", "新风机压缩机电流", SensorDeviceClass.CURRENT, UnitOfElectricCurrent.AMPERE),
+        _diagnostic(HVACFreshAirStatusCodeSensor(coordinator, "status_code1", "新风机状态码")),
+        _diagnostic(HVACFreshAirSensor(coordinator, "compressor_freq", "新风压缩机频率", SensorDeviceClass.FREQUENCY, UnitOfFrequency.HERTZ)),
+        _diagnostic(HVACFreshAirSensor(coordinator, "total_current", "新风机整机电流", SensorDeviceClass.CURRENT, UnitOfElectricCurrent.AMPERE)),
+        _diagnostic(HVACFreshAirSensor(coordinator, "compressor_current", "新风机压缩机电流", SensorDeviceClass.CURRENT, UnitOfElectricCurrent.AMPERE)),
         HVACFreshAirSensor(coordinator, "supply_temp", "新风供水温度", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
         HVACFreshAirSensor(coordinator, "return_temp", "新风回水温度", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
     ])
     
+    # Derived metric sensors (计算值，不额外读取寄存器)
+    entities.extend([
+        HVACDerivedSensor(coordinator, None, "york_delta_t", "约克供回水温差", UnitOfTemperature.CELSIUS, "mdi:thermometer-lines"),
+        HVACDerivedSensor(coordinator, None, "fresh_air_delta_t", "新风供回水温差", UnitOfTemperature.CELSIUS, "mdi:thermometer-lines"),
+        HVACDerivedSensor(coordinator, None, "min_dew_point_margin", "最小露点裕量", UnitOfTemperature.CELSIUS, "mdi:water-thermometer"),
+    ])
+    for room_id in ROOM_IDS:
+        room_name = ROOM_NAMES.get(room_id, room_id)
+        entities.extend([
+            HVACDerivedSensor(coordinator, room_id, "dew_point_margin", f"{room_name}露点裕量", UnitOfTemperature.CELSIUS, "mdi:water-thermometer"),
+            HVACDerivedSensor(coordinator, room_id, "setpoint_deviation", f"{room_name}设定偏差", UnitOfTemperature.CELSIUS, "mdi:thermometer-alert"),
+            HVACDerivedSensor(coordinator, room_id, "humidex", f"{room_name}体感温度", UnitOfTemperature.CELSIUS, "mdi:sun-thermometer"),
+        ])
+    
     # Connection status sensor
     entities.append(HVACConnectionSensor(coordinator))
     
@@ -97,7 +123,7 @@ class HVACRoomSensor(SensorEntity):
         self.coordinator = coordinator
         self._room_id = room_id
         self._data_key = data_key
-        self._attr_unique_id = f"hvac_{room_id}_{data_key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_{room_id}_{data_key}"
         self._attr_name = name
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit
@@ -113,12 +139,15 @@ class HVACRoomSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.room_addresses(self._room_id, self._data_key),
+            )
         )
 
 
@@ -139,7 +168,7 @@ class HVACEnvironmentSensor(SensorEntity):
         """Initialize the sensor."""
         self.coordinator = coordinator
         self._data_key = data_key
-        self._attr_unique_id = f"hvac_env_{data_key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_env_{data_key}"
         self._attr_name = name
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit
@@ -153,12 +182,15 @@ class HVACEnvironmentSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("environment", self._data_key),
+            )
         )
 
 
@@ -179,7 +211,7 @@ class HVACYorkSensor(SensorEntity):
         """Initialize the sensor."""
         self.coordinator = coordinator
         self._data_key = data_key
-        self._attr_unique_id = f"hvac_york_{data_key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_york_{data_key}"
         self._attr_name = name
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit
@@ -193,12 +225,15 @@ class HVACYorkSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("york", self._data_key),
+            )
         )
 
 
@@ -219,7 +254,7 @@ class HVACFreshAirSensor(SensorEntity):
         """Initialize the sensor."""
         self.coordinator = coordinator
         self._data_key = data_key
-        self._attr_unique_id = f"hvac_fresh_air_{data_key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_fresh_air_{data_key}"
         self._attr_name = name
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit
@@ -233,12 +268,15 @@ class HVACFreshAirSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("fresh_air", self._data_key),
+            )
         )
 
 
@@ -257,7 +295,7 @@ class HVACFreshAirStatusCodeSensor(SensorEntity):
         """Initialize the sensor."""
         self.coordinator = coordinator
         self._data_key = data_key
-        self._attr_unique_id = f"hvac_fresh_air_{data_key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_fresh_air_{data_key}"
         self._attr_name = name
 
     @property
@@ -285,17 +323,22 @@ class HVACFreshAirStatusCodeSensor(SensorEntity):
                 attrs["status"] = "正常运行"
             else:
                 attrs["status"] = "未知状态"
+            # 位字段（registers.yaml 中定义的 bits）
+            attrs.update(fresh_air_data.get(f"{self._data_key}_bits") or {})
         return attrs
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("fresh_air", self._data_key),
+            )
         )
 
 
@@ -316,7 +359,7 @@ class HVACSystemSensor(SensorEntity):
         """Initialize the sensor."""
         self.coordinator = coordinator
         self._data_key = data_key
-        self._attr_unique_id = f"hvac_{data_key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_{data_key}"
         self._attr_name = name
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit
@@ -330,12 +373,15 @@ class HVACSystemSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("system", self._data_key),
+            )
         )
 
 
@@ -356,7 +402,7 @@ class HVACRoomRadiantSensor(SensorEntity):
         self.coordinator = coordinator
         self._room_id = room_id
         self._data_key = data_key
-        self._attr_unique_id = f"hvac_{room_id}_{data_key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_{room_id}_{data_key}"
         self._attr_name = name
 
     @property
@@ -372,12 +418,15 @@ class HVACRoomRadiantSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.room_addresses(self._room_id, self._data_key),
+            )
         )
 
 
@@ -402,7 +451,7 @@ class HVACYorkRunModeSensor(SensorEntity):
         """Initialize the sensor."""
         self.coordinator = coordinator
         self._data_key = data_key
-        self._attr_unique_id = f"hvac_york_{data_key}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_york_{data_key}"
         self._attr_name = name
 
     @property
@@ -417,12 +466,60 @@ class HVACYorkRunModeSensor(SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("york", self._data_key),
+            )
+        )
+
+
+class HVACDerivedSensor(SensorEntity):
+    """Sensor entity for a derived metric of the system or a room."""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: HVACDataCoordinator,
+        room_id: str | None,
+        data_key: str,
+        name: str,
+        unit: str | None,
+        icon: str,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self._room_id = room_id
+        self._data_key = data_key
+        scope = room_id or "system"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_derived_{scope}_{data_key}"
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the native value."""
+        return self.coordinator.get_derived_data(self._room_id).get(self._data_key)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.data_available
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        self.async_on_remove(
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.derived_addresses(self._data_key, self._room_id),
+            )
         )
 
 
@@ -431,12 +528,13 @@ class HVACConnectionSensor(SensorEntity):
 
     _attr_has_entity_name = True
     _attr_name = "HVAC 连接状态"
-    _attr_unique_id = "hvac_connection_status"
     _attr_icon = "mdi:connection"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def __init__(self, coordinator: HVACDataCoordinator) -> None:
         """Initialize the sensor."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_connection_status"
 
     @property
     def native_value(self) -> str:
@@ -460,4 +558,6 @@ class HVACConnectionSensor(SensorEntity):
         return {
             "host": self.coordinator.modbus.host,
             "port": self.coordinator.modbus.port,
+            # Values come from the stored snapshot until a poll confirms them
+            "stale": self.coordinator.modbus.stale,
         }
@@ -0,0 +1,51 @@
+"""Compact on-disk register snapshot for the HVAC Modbus integration.
+
+The last polled registers are kept in a small binary file so a restart can
+publish values before the first poll. The HVS1 codec lives in
+schema.py and is shared with the backend's snapshot cache.
+"""
+
+import os
+from array import array
+from pathlib import Path
+
+from .registers import REGISTER_RANGES
+from .schema import decode_snapshot, encode_snapshot_body, encode_snapshot_header
+
+# Address window covering every polled block
+BASE_ADDRESS = min(start for start, _ in REGISTER_RANGES)
+ADDRESS_SPAN = max(start + count for start, count in REGISTER_RANGES) - BASE_ADDRESS
+
+
+def encode_registers(raw_data: dict[int, int]) -> bytes:
+    """Encode raw registers (address -> value) as the values and presence bytes."""
+    raw = array("H", bytes(2 * ADDRESS_SPAN))
+    present = bytearray(ADDRESS_SPAN)
+    for address, value in raw_data.items():
+        offset = address - BASE_ADDRESS
+        if 0 <= offset < ADDRESS_SPAN:
+            raw[offset] = value & 0xFFFF
+            present[offset] = 1
+    return encode_snapshot_body(raw, present)
+
+
+def encode_snapshot(body: bytes, timestamp: float) -> bytes:
+    """Prefix encoded registers with the snapshot header."""
+    return encode_snapshot_header(timestamp, BASE_ADDRESS, ADDRESS_SPAN) + body
+
+
+def read_snapshot(path: str | Path) -> tuple[float, dict[int, int]] | None:
+    """Read a snapshot file; None if missing or unreadable (blocking I/O)."""
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+    return decode_snapshot(data)
+
+
+def write_snapshot(path: str | Path, data: bytes) -> None:
+    """Atomically replace the snapshot file (blocking I/O)."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
@@ -0,0 +1,65 @@
+"""Transport statistics for the HVAC Modbus integration."""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from pymodbus.exceptions import ModbusIOException
+
+
+@dataclass
+class DurationStats:
+    """Count, total and maximum of observed durations in seconds."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class TransportStats:
+    """Request latency, errors and lock contention of one gateway connection."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        # Function code ("03", "06", "16") -> request latency, lock wait excluded
+        self.requests: defaultdict[str, DurationStats] = defaultdict(DurationStats)
+        # (function code, kind) -> count; kind is timeout, exception or error_response
+        self.errors: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.lock_wait = DurationStats()
+        self.reconnects: defaultdict[str, int] = defaultdict(int)
+        self.bytes_read = 0
+
+    def record_error(self, function: str, err: Exception | None) -> None:
+        """Count a failed request; err is None for an error response."""
+        if err is None:
+            kind = "error_response"
+        elif isinstance(err, (ModbusIOException, TimeoutError)):
+            kind = "timeout"
+        else:
+            kind = "exception"
+        self.errors[(function, kind)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as plain data (for diagnostics)."""
+        return {
+            "requests": {function: stats.as_dict() for function, stats in sorted(self.requests.items())},
+            "errors": {f"{function}/{kind}": count for (function, kind), count in sorted(self.errors.items())},
+            "lock_wait": self.lock_wait.as_dict(),
+            "reconnects": dict(self.reconnects),
+            "bytes_read": self.bytes_read,
+        }
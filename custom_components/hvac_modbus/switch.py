@@ -43,13 +43,13 @@ class HVACPowerSwitch(SwitchEntity):
     """Switch entity for HVAC system power."""
 
     _attr_has_entity_name = True
-    _attr_unique_id = "hvac_system_power"
     _attr_name = "系统电源"
     _attr_icon = "mdi:power"
 
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the switch."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_system_power"
         self._modbus = modbus
 
     @property
@@ -61,22 +61,23 @@ class HVACPowerSwitch(SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         await self._modbus.set_system_power(True)
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self._modbus.set_system_power(False)
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("system", "power"),
+            )
         )
 
 
@@ -84,13 +85,13 @@ class HVACHomeModeSwitch(SwitchEntity):
     """Switch entity for home mode."""
 
     _attr_has_entity_name = True
-    _attr_unique_id = "hvac_home_mode"
     _attr_name = "在家模式"
     _attr_icon = "mdi:home"
 
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the switch."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_home_mode"
         self._modbus = modbus
 
     @property
@@ -102,22 +103,23 @@ class HVACHomeModeSwitch(SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         await self._modbus.set_home_mode(True)
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self._modbus.set_home_mode(False)
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("system", "home_mode"),
+            )
         )
 
 
@@ -125,13 +127,13 @@ class HVACKitchenRadiantSwitch(SwitchEntity):
     """Switch entity for kitchen radiant."""
 
     _attr_has_entity_name = True
-    _attr_unique_id = "hvac_kitchen_radiant"
     _attr_name = "厨卫辐射"
     _attr_icon = "mdi:radiator"
 
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the switch."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_kitchen_radiant"
         self._modbus = modbus
 
     @property
@@ -143,22 +145,23 @@ class HVACKitchenRadiantSwitch(SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         await self._modbus.set_kitchen_radiant(True)
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self._modbus.set_kitchen_radiant(False)
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("kitchen", "radiant"),
+            )
         )
 
 
@@ -166,13 +169,13 @@ class HVACHumidifierSwitch(SwitchEntity):
     """Switch entity for humidifier."""
 
     _attr_has_entity_name = True
-    _attr_unique_id = "hvac_humidifier"
     _attr_name = "加湿功能"
     _attr_icon = "mdi:water"
 
     def __init__(self, coordinator: HVACDataCoordinator, modbus) -> None:
         """Initialize the switch."""
         self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_humidifier"
         self._modbus = modbus
 
     @property
@@ -184,22 +187,23 @@ class HVACHumidifierSwitch(SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         await self._modbus.set_humidifier(True)
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self._modbus.set_humidifier(False)
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.field_addresses("fresh_air", "humidifier"),
+            )
         )
 
 
@@ -214,7 +218,7 @@ class HVACRoomRadiantSwitch(SwitchEntity):
         self.coordinator = coordinator
         self._modbus = modbus
         self._room_id = room_id
-        self._attr_unique_id = f"hvac_{room_id}_radiant"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_hvac_{room_id}_radiant"
         self._attr_name = f"{room_name}辐射"
 
     @property
@@ -228,20 +232,21 @@ class HVACRoomRadiantSwitch(SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         await self._modbus.set_room_radiant(self._room_id, True)
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self._modbus.set_room_radiant(self._room_id, False)
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.data_available
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_register_listener(
+                self.async_write_ha_state,
+                self.coordinator.room_addresses(self._room_id, "radiant"),
+            )
         )
@@ -0,0 +1,168 @@
+"""Pipelined Modbus TCP transport for the HVAC Modbus integration.
+
+pymodbus serialises requests on one connection (a single response future
+behind a lock), so a poll sweep costs one round trip per block. Modbus TCP
+itself allows several requests in flight, matched by the MBAP transaction
+ID; this transport keeps up to max_in_flight requests outstanding and
+resolves each response by its transaction ID.
+"""
+
+import asyncio
+import logging
+import struct
+from dataclasses import dataclass, field
+
+from pymodbus.exceptions import ModbusIOException
+
+_LOGGER = logging.getLogger(__name__)
+
+# MBAP header: transaction ID, protocol ID (0), length, unit ID
+_MBAP = struct.Struct(">HHHB")
+# The length field counts the unit ID plus a PDU of at least two bytes
+# (function code and byte count / exception code) and at most 253
+_MIN_LENGTH = 3
+_MAX_LENGTH = 254
+
+
+class FramingError(Exception):
+    """The response stream is not valid Modbus TCP."""
+
+
+@dataclass
+class PipelinedResponse:
+    """Decoded response PDU, duck-typed like a pymodbus response."""
+
+    function_code: int
+    registers: list[int] = field(default_factory=list)
+    exception_code: int = 0
+
+    def isError(self) -> bool:  # noqa: N802 - mirrors the pymodbus API
+        """Return True for a Modbus exception response."""
+        return self.function_code & 0x80 != 0
+
+
+class PipelinedModbusClient:
+    """Modbus TCP client with several requests in flight on one socket."""
+
+    def __init__(self, host: str, port: int, timeout: float, max_in_flight: int) -> None:
+        """Initialize the transport."""
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        # Transaction ID -> (function code, future) of the pending request
+        self._pending: dict[int, tuple[int, asyncio.Future[PipelinedResponse]]] = {}
+        self._next_tid = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the socket is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        """Open the connection and start the response reader."""
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port), self._timeout
+            )
+        except (OSError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Pipelined connect to %s:%s failed: %s", self._host, self._port, err)
+            return False
+        self._reader_task = asyncio.create_task(self._read_responses())
+        return True
+
+    def close(self) -> None:
+        """Close the connection and fail all pending requests."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._fail_pending(ModbusIOException("Connection closed"))
+
+    async def read_holding_registers(self, address: int, count: int, device_id: int) -> PipelinedResponse:
+        """Read holding registers (FC03)."""
+        return await self._execute(device_id, struct.pack(">BHH", 0x03, address, count))
+
+    async def write_register(self, address: int, value: int, device_id: int) -> PipelinedResponse:
+        """Write a single holding register (FC06)."""
+        return await self._execute(device_id, struct.pack(">BHH", 0x06, address, value))
+
+    async def write_registers(self, address: int, values: list[int], device_id: int) -> PipelinedResponse:
+        """Write contiguous holding registers (FC16)."""
+        pdu = struct.pack(f">BHHB{len(values)}H", 0x10, address, len(values), 2 * len(values), *values)
+        return await self._execute(device_id, pdu)
+
+    def _allocate_tid(self) -> int:
+        """Return the next transaction ID that is not in flight."""
+        while True:
+            self._next_tid = self._next_tid % 0xFFFF + 1
+            if self._next_tid not in self._pending:
+                return self._next_tid
+
+    async def _execute(self, device_id: int, pdu: bytes) -> PipelinedResponse:
+        """Send one request and wait for the response with its transaction ID."""
+        async with self._slots:
+            if not self.connected:
+                raise ModbusIOException("Not connected")
+            tid = self._allocate_tid()
+            future: asyncio.Future[PipelinedResponse] = asyncio.get_running_loop().create_future()
+            self._pending[tid] = (pdu[0], future)
+            try:
+                self._writer.write(_MBAP.pack(tid, 0, len(pdu) + 1, device_id) + pdu)
+                return await asyncio.wait_for(future, self._timeout)
+            except asyncio.TimeoutError as err:
+                # A late response finds no pending future and is dropped
+                raise ModbusIOException(f"No response to transaction {tid}") from err
+            finally:
+                self._pending.pop(tid, None)
+
+    async def _read_responses(self) -> None:
+        """Resolve pending requests as their responses arrive, in any order."""
+        try:
+            while True:
+                header = await self._reader.readexactly(_MBAP.size)
+                tid, _, length, _ = _MBAP.unpack(header)
+                if not _MIN_LENGTH <= length <= _MAX_LENGTH:
+                    raise FramingError(f"Invalid MBAP length {length}")
+                pdu = await self._reader.readexactly(length - 1)
+                pending = self._pending.get(tid)
+                if pending is None or pending[1].done():
+                    _LOGGER.debug("Dropping response for unknown transaction %s", tid)
+                    continue
+                function_code, future = pending
+                if pdu[0] & 0x7F != function_code:
+                    raise FramingError(
+                        f"Transaction {tid}: function code {pdu[0]} in response to {function_code}"
+                    )
+                future.set_result(self._decode(pdu))
+        except asyncio.CancelledError:
+            raise
+        except (OSError, asyncio.IncompleteReadError, struct.error, IndexError, FramingError) as err:
+            _LOGGER.debug("Pipelined connection to %s:%s lost: %s", self._host, self._port, err)
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._fail_pending(ModbusIOException(f"Connection lost: {err}"))
+
+    @staticmethod
+    def _decode(pdu: bytes) -> PipelinedResponse:
+        """Decode a response PDU."""
+        function_code = pdu[0]
+        if function_code & 0x80:
+            return PipelinedResponse(function_code, exception_code=pdu[1])
+        if function_code == 0x03:
+            count = pdu[1] // 2
+            return PipelinedResponse(function_code, list(struct.unpack_from(f">{count}H", pdu, 2)))
+        return PipelinedResponse(function_code)
+
+    def _fail_pending(self, err: Exception) -> None:
+        """Fail every request still waiting for a response."""
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(err)
+        self._pending.clear()
@@ -0,0 +1,100 @@
+"""Coalescing write queue for HVAC Modbus registers."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Writes a run of contiguous registers starting at an address
+BlockWriter = Callable[[int, list[int]], Awaitable[bool]]
+# Called with the written and the failed address -> value maps of a batch
+WriteListener = Callable[[dict[int, int], dict[int, int]], None]
+# Called with address and value as soon as a write is queued
+QueuedListener = Callable[[int, int], None]
+
+# Most registers one Write Multiple Registers (FC16) request can carry
+MAX_WRITE_COUNT = 123
+
+
+def contiguous_runs(
+    values: dict[int, int], max_count: int = MAX_WRITE_COUNT
+) -> list[tuple[int, list[int]]]:
+    """Split address -> value pairs into runs of adjacent addresses, at most max_count long."""
+    runs: list[tuple[int, list[int]]] = []
+    for address in sorted(values):
+        if (
+            runs
+            and runs[-1][0] + len(runs[-1][1]) == address
+            and len(runs[-1][1]) < max_count
+        ):
+            runs[-1][1].append(values[address])
+        else:
+            runs.append((address, [values[address]]))
+    return runs
+
+
+class WriteQueue:
+    """Collect register writes for a short window and flush them as batches.
+
+    Writes to adjacent addresses are merged into one Write Multiple Registers
+    (FC16) request; a later write to the same address within the window
+    replaces the earlier one. Queued listeners see each write immediately
+    (for optimistic updates); write listeners are called once per flushed batch.
+    """
+
+    def __init__(self, write_block: BlockWriter, window: float) -> None:
+        """Initialize the write queue."""
+        self._write_block = write_block
+        self._window = window
+        self._pending: dict[int, int] = {}
+        self._waiters: dict[int, list[asyncio.Future[bool]]] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._listeners: list[WriteListener] = []
+        self._queued_listeners: list[QueuedListener] = []
+
+    def add_listener(self, listener: WriteListener) -> Callable[[], None]:
+        """Call listener with the written and failed values after each batch."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def add_queued_listener(self, listener: QueuedListener) -> Callable[[], None]:
+        """Call listener with every write as soon as it is queued."""
+        self._queued_listeners.append(listener)
+        return lambda: self._queued_listeners.remove(listener)
+
+    async def write(self, address: int, value: int) -> bool:
+        """Queue a register write and wait until its batch has been sent."""
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._pending[address] = value
+        self._waiters.setdefault(address, []).append(future)
+        for listener in list(self._queued_listeners):
+            listener(address, value)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        """Wait for the coalescing window, then send the collected writes."""
+        await asyncio.sleep(self._window)
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, {}
+        self._flush_task = None
+
+        written: dict[int, int] = {}
+        failed: dict[int, int] = {}
+        for start, values in contiguous_runs(pending):
+            try:
+                ok = await self._write_block(start, values)
+            except Exception as err:
+                _LOGGER.error("Error writing registers at %s: %s", start, err)
+                ok = False
+            for offset, value in enumerate(values):
+                address = start + offset
+                (written if ok else failed)[address] = value
+                for future in waiters.get(address, []):
+                    if not future.done():
+                        future.set_result(ok)
+
+        for listener in list(self._listeners):
+            listener(written, failed)
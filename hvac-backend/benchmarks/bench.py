@@ -0,0 +1,227 @@
+"""
+热点路径基准测试
+针对本地模拟设备测量轮询、解析和接口序列化的延迟（p50/p99）与内存分配，并与基线比较
+
+用法（在 hvac-backend 目录下）：
+    python benchmarks/bench.py                  # 运行并与 baseline.json 比较，退化时退出码为 1
+    python benchmarks/bench.py --save-baseline  # 运行并保存为新基线
+    python benchmarks/bench.py --only api       # 只输出和比较名称包含 api 的结果
+
+Home Assistant 集成的基准需要安装 homeassistant，否则跳过
+"""
+import argparse
+import asyncio
+import gc
+import importlib.util
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = BACKEND_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(REPO_DIR))
+
+from hvac_backend.modbus_client import ModbusClient
+from hvac_backend.simulator import ModbusSimulator
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summary(samples: list, peak_bytes: int, blocks: int) -> dict:
+    """耗时单位为毫秒；peak_kib 为单次迭代的峰值分配，blocks 为单次迭代净增的内存块数"""
+    return {
+        "p50_ms": round(_percentile(samples, 0.5) * 1000, 4),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 4),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "peak_kib": round(peak_bytes / 1024, 1),
+        "blocks": blocks,
+    }
+
+
+async def _measure(func, iterations: int, warmup: int = 5) -> dict:
+    """多次执行异步函数，记录每次耗时，再单独执行一次统计内存分配"""
+    for _ in range(warmup):
+        await func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    base = tracemalloc.get_traced_memory()[0]
+    await func()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+    return _summary(samples, peak, blocks)
+
+
+async def _asgi_get(app, path: str, headers: list = ()) -> int:
+    """直接调用 ASGI 应用发起 GET 请求，返回状态码（不经过网络栈）"""
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": list(headers),
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 8000),
+    }
+    await app(scope, receive, send)
+    return status
+
+
+async def bench_backend(simulator_port: int, iterations: int, clients: int) -> dict:
+    from hvac_backend.main import app
+    from hvac_backend.state import AppState
+
+    results = {}
+    modbus = ModbusClient({"host": "127.0.0.1", "port": simulator_port, "timeout": 2})
+    await modbus.connect()
+
+    results["backend.poll_sweep"] = await _measure(modbus.poll_once, iterations)
+
+    # 每轮发布新快照，使接口重新序列化（最坏情况）
+    app.state = AppState(config={"modbus": {}}, modbus_client=modbus)
+    for view, path in (("grouped", "/api/registers/grouped"), ("rooms", "/api/rooms")):
+        async def fresh_request(path=path):
+            modbus._publish(modbus.snapshot.with_values({}, modbus._next_version()))
+            await _asgi_get(app, path)
+
+        results[f"backend.api_{view}_fresh"] = await _measure(fresh_request, iterations)
+
+        # 同一快照下多个客户端并发请求，衡量吞吐
+        async def concurrent_requests(path=path):
+            await asyncio.gather(*(_asgi_get(app, path) for _ in range(clients)))
+
+        summary = await _measure(concurrent_requests, max(iterations // 4, 10))
+        summary["req_per_s"] = round(clients / (summary["mean_ms"] / 1000), 1)
+        results[f"backend.api_{view}_x{clients}"] = summary
+
+    await modbus.disconnect()
+    return results
+
+
+async def bench_home_assistant(simulator_port: int, iterations: int) -> dict:
+    if importlib.util.find_spec("homeassistant") is None:
+        print("homeassistant is not installed, skipping Home Assistant benchmarks")
+        return {}
+    from custom_components.hvac_modbus.modbus import HVACModbusClient
+
+    results = {}
+    client = HVACModbusClient(host="127.0.0.1", port=simulator_port, slave_id=1)
+    await client.connect()
+
+    async def read_all_fresh():
+        client._scheduler.mark_all_due()
+        await client.read_all_data()
+
+    results["ha.read_all_data"] = await _measure(read_all_fresh, iterations)
+
+    raw = dict(client._raw_cache)
+
+    async def parse():
+        client._parse_data(dict(raw))
+
+    results["ha.parse_data"] = await _measure(parse, iterations * 10)
+    await client.disconnect()
+    return results
+
+
+# 判定退化时各指标允许的最小绝对差值，避免亚毫秒级的计时噪声误报
+MIN_DELTA = {"p50_ms": 0.5, "p99_ms": 1.0, "peak_kib": 16}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """返回相对基线退化的指标列表"""
+    regressions = []
+    for name, summary in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for metric, min_delta in MIN_DELTA.items():
+            old, new = reference.get(metric), summary.get(metric)
+            if old and new and new > old * tolerance and new - old > min_delta:
+                regressions.append(f"{name}.{metric}: {old} -> {new} (x{new / old:.2f})")
+    return regressions
+
+
+async def run(args) -> dict:
+    simulator = ModbusSimulator(latency=args.latency, jitter=args.jitter, seed=0)
+    port = await simulator.start(port=0)
+    try:
+        results = {}
+        results.update(await bench_backend(port, args.iterations, args.clients))
+        results.update(await bench_home_assistant(port, args.iterations))
+    finally:
+        await simulator.stop()
+    if args.only:
+        results = {name: summary for name, summary in results.items() if args.only in name}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HVAC 热点路径基准测试")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=50, help="并发请求数")
+    parser.add_argument("--latency", type=float, default=0.0, help="模拟设备的请求延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="模拟设备的随机延迟上限（秒）")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="超过基线多少倍视为退化")
+    parser.add_argument("--only", help="只保留名称包含该字符串的结果")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    width = max(len(name) for name in results) if results else 0
+    for name, summary in results.items():
+        fields = "  ".join(f"{key}={value}" for key, value in summary.items())
+        print(f"{name:<{width}}  {fields}")
+
+    if args.save_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to {BASELINE_PATH}")
+        return
+
+    if BASELINE_PATH.exists():
+        regressions = compare(results, json.loads(BASELINE_PATH.read_text()), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Modbus 连接断路器
+网关不可达时快速失败，按带抖动的指数退避间隔重试，避免请求和重连堆积
+
+状态：closed（正常）-> open（拒绝请求）-> half_open（放行一次试探）-> closed / open
+"""
+import random
+import time
+from typing import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 状态 -> 指标中的数值
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """连续失败达到阈值（或调用 trip）后打开，退避到期后放行一次试探，成功则关闭并重置退避"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """当前状态，打开状态到期后转为半开"""
+        if self._state == OPEN and self._clock() >= self._open_until:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """距离允许下次尝试的秒数"""
+        if self.state != OPEN:
+            return 0.0
+        return max(self._open_until - self._clock(), 0.0)
+
+    def allow(self) -> bool:
+        """当前是否允许发起调用（半开状态下只放行一次试探）"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self._state = CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self):
+        """立即打开，退避时间按打开次数翻倍（带抖动，有上限）"""
+        delay = min(self.base_delay * (2 ** self._trips), self.max_delay)
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        self._trips += 1
+        self._failures = 0
+        self._state = OPEN
+        self._open_until = self._clock() + delay
+        self._trial_in_flight = False
+
+    def reset(self):
+        """清除失败记录（例如连接目标改变后）"""
+        self.record_success()
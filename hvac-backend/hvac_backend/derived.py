@@ -0,0 +1,90 @@
+"""
+派生指标计算
+每个快照从缩放值数组一次性计算所有房间的露点裕量、温差和舒适度指标，无需额外读取总线
+
+房间字段地址在导入时预先转换为偏移数组，计算时按数组整体取值与运算
+"""
+import math
+from array import array
+from operator import sub
+from typing import Optional
+
+from hvac_backend import registers as reg
+
+# 供水温度与露点的最小安全裕量（°C），低于该值辐射面板有结露风险
+CONDENSATION_MARGIN = 2.0
+
+# 计算所需的系统寄存器，按寄存器表中的字段名查找地址
+SUPPLY_WATER = reg.FIELDS["york"]["supply_temp"]          # 约克供水温度
+RETURN_WATER = reg.FIELDS["york"]["return_temp"]          # 约克回水温度
+FRESH_AIR_SUPPLY = reg.FIELDS["fresh_air"]["supply_temp"]  # 新风供水温度
+FRESH_AIR_RETURN = reg.FIELDS["fresh_air"]["return_temp"]  # 新风回水温度
+
+ROOM_IDS = tuple(reg.ROOMS)
+
+
+def _room_offsets(key: str) -> array:
+    return array("H", (reg.ROOMS[room_id][key] - reg.BASE_ADDRESS for room_id in ROOM_IDS))
+
+
+# 房间字段 -> 各房间寄存器偏移
+ROOM_OFFSETS = {key: _room_offsets(key) for key in ("temp", "dew_point", "setpoint")}
+
+
+def humidex(temp: float, dew_point: float) -> float:
+    """加拿大湿热指数（Humidex），由温度和露点计算体感温度"""
+    vapor_pressure = 6.11 * math.exp(5417.7530 * (1 / 273.16 - 1 / (273.15 + dew_point)))
+    return temp + 0.5555 * (vapor_pressure - 10)
+
+
+def _gather(values, offsets: array) -> array:
+    return array("d", map(values.__getitem__, offsets))
+
+
+def _delta(scaled, present, minuend: int, subtrahend: int) -> Optional[float]:
+    a, b = minuend - reg.BASE_ADDRESS, subtrahend - reg.BASE_ADDRESS
+    if present[a] and present[b]:
+        return round(scaled[a] - scaled[b], 2)
+    return None
+
+
+def compute(scaled: array, present: bytes) -> dict:
+    """根据快照的缩放值数组与读取标记计算派生指标
+
+    每项指标只要求其用到的寄存器已读取到（与集成的 compute_derived 一致）
+    """
+    temp = _gather(scaled, ROOM_OFFSETS["temp"])
+    dew_point = _gather(scaled, ROOM_OFFSETS["dew_point"])
+    setpoint = _gather(scaled, ROOM_OFFSETS["setpoint"])
+    has_temp = _gather(present, ROOM_OFFSETS["temp"])
+    has_dew_point = _gather(present, ROOM_OFFSETS["dew_point"])
+    has_setpoint = _gather(present, ROOM_OFFSETS["setpoint"])
+
+    supply_offset = SUPPLY_WATER - reg.BASE_ADDRESS
+    has_supply = bool(present[supply_offset])
+    supply = scaled[supply_offset]
+
+    margins = array("d", (supply - value for value in dew_point))
+    deviations = array("d", map(sub, temp, setpoint))
+
+    rooms = {}
+    valid_margins = []
+    for i, room_id in enumerate(ROOM_IDS):
+        margin = round(margins[i], 2) if has_supply and has_dew_point[i] else None
+        if margin is not None:
+            valid_margins.append(margin)
+        rooms[room_id] = {
+            "dew_point_margin": margin,
+            "condensation_risk": margin < CONDENSATION_MARGIN if margin is not None else None,
+            "setpoint_deviation": round(deviations[i], 2) if has_temp[i] and has_setpoint[i] else None,
+            "humidex": round(humidex(temp[i], dew_point[i]), 1) if has_temp[i] and has_dew_point[i] else None,
+        }
+
+    min_margin = min(valid_margins) if valid_margins else None
+    return {
+        "york_delta_t": _delta(scaled, present, RETURN_WATER, SUPPLY_WATER),
+        "fresh_air_delta_t": _delta(scaled, present, FRESH_AIR_RETURN, FRESH_AIR_SUPPLY),
+        "min_dew_point_margin": min_margin,
+        "condensation_risk": min_margin < CONDENSATION_MARGIN if min_margin is not None else None,
+        "rooms": rooms,
+    }
@@ -0,0 +1,214 @@
+"""
+寄存器历史数据存储
+每次轮询的快照先追加到内存缓冲，定期批量写入 SQLite
+
+原始采样只保留较短时间，过期前汇总为 1 分钟和 1 小时的 min/mean/max 桶，
+各级数据按保留期限删除，长期运行时磁盘和内存占用保持有界
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from hvac_backend import registers as reg
+from hvac_backend.snapshot import RegisterSnapshot
+
+logger = logging.getLogger(__name__)
+
+# 汇总级别 -> 桶宽度（秒）
+ROLLUPS = {"1m": 60, "1h": 3600}
+
+# 缓冲区最多保留的采样行数，写库失败时丢弃最旧的数据
+MAX_BUFFER_ROWS = 200_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    address INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (address, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_1m (
+    address INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    min REAL NOT NULL,
+    mean REAL NOT NULL,
+    max REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (address, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_1h (
+    address INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    min REAL NOT NULL,
+    mean REAL NOT NULL,
+    max REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (address, ts)
+) WITHOUT ROWID;
+"""
+
+
+class HistoryStore:
+    """按地址存储寄存器缩放值的时间序列"""
+
+    def __init__(self, config: dict):
+        self.path = config.get("path", "history.db")
+        self.flush_interval = config.get("flush_interval", 30)
+        # 各级数据保留时长（秒）
+        self.retention = {
+            "raw": config.get("raw_retention_hours", 24) * 3600,
+            "1m": config.get("minute_retention_days", 30) * 86400,
+            "1h": config.get("hour_retention_days", 730) * 86400,
+        }
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # 数据库操作在线程池中执行，串行化对连接的访问
+        self._db_lock = threading.Lock()
+        self._buffer: list = []
+        # 正在写库的采样，写入完成前仍由查询从内存读取
+        self._flushing: list = []
+
+    def append(self, snapshot: RegisterSnapshot):
+        """将快照中已读取到的寄存器追加到写入缓冲"""
+        ts = int(snapshot.timestamp)
+        scaled, present = snapshot.scaled, snapshot.valid
+        self._buffer.extend(
+            (reg.BASE_ADDRESS + offset, ts, scaled[offset])
+            for offset in reg.OFFSETS
+            if present[offset]
+        )
+        if len(self._buffer) > MAX_BUFFER_ROWS:
+            del self._buffer[:len(self._buffer) - MAX_BUFFER_ROWS]
+
+    async def flush(self):
+        """批量写入缓冲的采样，并执行汇总和过期清理"""
+        rows, self._buffer = self._buffer, []
+        self._flushing = rows
+        try:
+            await asyncio.to_thread(self._flush, rows, time.time())
+        except sqlite3.Error as e:
+            logger.error(f"Error writing history: {e}")
+            # 写入失败时放回缓冲，下次重试
+            self._buffer[:0] = rows
+        finally:
+            self._flushing = []
+
+    def _flush(self, rows: list, now: float):
+        with self._db_lock, self._conn:
+            if rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO samples (address, ts, value) VALUES (?, ?, ?)", rows
+                )
+            self._rollup("samples", "rollup_1m", ROLLUPS["1m"], now)
+            self._rollup("rollup_1m", "rollup_1h", ROLLUPS["1h"], now)
+            for table, level in (("samples", "raw"), ("rollup_1m", "1m"), ("rollup_1h", "1h")):
+                self._conn.execute(f"DELETE FROM {table} WHERE ts < ?", (int(now - self.retention[level]),))
+
+    def _rollup(self, source: str, target: str, width: int, now: float):
+        """将 source 中已结束的时间桶汇总到 target（只处理上次汇总之后的桶）"""
+        last = self._conn.execute(f"SELECT MAX(ts) FROM {target}").fetchone()[0]
+        begin = last + width if last is not None else 0
+        end = int(now) // width * width
+        if begin >= end:
+            return
+        if source == "samples":
+            select = (
+                f"SELECT address, ts / {width} * {width}, MIN(value), AVG(value), MAX(value), COUNT(*) "
+                f"FROM samples WHERE ts >= ? AND ts < ? GROUP BY address, ts / {width}"
+            )
+        else:
+            # 按采样数加权合并下级桶
+            select = (
+                f"SELECT address, ts / {width} * {width}, MIN(min), SUM(mean * count) / SUM(count), "
+                f"MAX(max), SUM(count) FROM {source} WHERE ts >= ? AND ts < ? GROUP BY address, ts / {width}"
+            )
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {target} (address, ts, min, mean, max, count) {select}",
+            (begin, end),
+        )
+
+    def _pick_step(self, start: float, end: float) -> str:
+        """自动选择精度：原始数据未过期且范围不超过 2 小时用原始采样，2 天以内用分钟桶，否则用小时桶"""
+        now = time.time()
+        if end - start <= 2 * 3600 and start >= now - self.retention["raw"]:
+            return "raw"
+        if end - start <= 2 * 86400 and start >= now - self.retention["1m"]:
+            return "1m"
+        return "1h"
+
+    async def query(
+        self, addresses: Iterable[int], start: float, end: float, step: Optional[str] = None
+    ) -> dict:
+        """查询时间范围内的数据，返回按地址的列式序列
+
+        step 为 raw / 1m / 1h，未指定时按时间范围自动选择
+        """
+        if step is None or step == "auto":
+            step = self._pick_step(start, end)
+        if step != "raw" and step not in ROLLUPS:
+            raise ValueError(f"Unsupported step: {step}")
+        addresses = sorted(set(addresses))
+        start, end = int(start), int(end)
+        # 缓冲中尚未写库的采样直接并入原始序列，查询不触发写库和汇总
+        buffered = {}
+        if step == "raw":
+            wanted = set(addresses)
+            for address, ts, value in (*self._flushing, *self._buffer):
+                if address in wanted and start <= ts <= end:
+                    buffered.setdefault(address, {})[ts] = value
+        series = await asyncio.to_thread(self._query, addresses, start, end, step, buffered)
+        return {"step": step, "from": start, "to": end, "series": series}
+
+    def _query(self, addresses: list, start: int, end: int, step: str, buffered: dict) -> dict:
+        series = {}
+        with self._db_lock:
+            for address in addresses:
+                if step == "raw":
+                    rows = self._conn.execute(
+                        "SELECT ts, value FROM samples WHERE address = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                        (address, start, end),
+                    ).fetchall()
+                    if address in buffered:
+                        rows = sorted({**dict(rows), **buffered[address]}.items())
+                    series[address] = {
+                        "t": [row[0] for row in rows],
+                        "value": [row[1] for row in rows],
+                    }
+                else:
+                    rows = self._conn.execute(
+                        f"SELECT ts, min, mean, max FROM rollup_{step} "
+                        "WHERE address = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                        (address, start, end),
+                    ).fetchall()
+                    series[address] = {
+                        "t": [row[0] for row in rows],
+                        "min": [row[1] for row in rows],
+                        "mean": [row[2] for row in rows],
+                        "max": [row[3] for row in rows],
+                    }
+        return series
+
+    async def run(self, modbus_client):
+        """记录每个新发布的快照，并按 flush_interval 批量写库"""
+        version = modbus_client.snapshot.version
+        last_flush = time.monotonic()
+        while True:
+            snapshot = await modbus_client.wait_for_snapshot(version, self.flush_interval)
+            if snapshot.version != version:
+                version = snapshot.version
+                # 过期快照含磁盘上的旧值，不记入历史
+                if not snapshot.stale:
+                    self.append(snapshot)
+            if time.monotonic() - last_flush >= self.flush_interval:
+                last_flush = time.monotonic()
+                await self.flush()
+
+    async def close(self):
+        await self.flush()
+        with self._db_lock:
+            self._conn.close()
@@ -1,12 +1,16 @@
 import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 import yaml
 from pathlib import Path
 
+from hvac_backend import metrics
+from hvac_backend.breaker import STATE_VALUES
+from hvac_backend.history import HistoryStore
 from hvac_backend.modbus_client import ModbusClient
 from hvac_backend.router import router as api_router
+from hvac_backend.snapshot_cache import SnapshotCache
 from hvac_backend.state import AppState
 
 
@@ -22,20 +26,42 @@ async def lifespan(app: FastAPI):
     # Startup
     config = load_config()
     
+    # Initialize snapshot cache
+    snapshot_cache = None
+    snapshot_config = config.get("snapshot", {})
+    if snapshot_config.get("enabled", True):
+        snapshot_path = Path(__file__).parent.parent / snapshot_config.get("path", "data/snapshot.bin")
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        snapshot_cache = SnapshotCache({**snapshot_config, "path": str(snapshot_path)})
+    
     # Initialize Modbus client
-    modbus_client = ModbusClient(config["modbus"])
+    modbus_client = ModbusClient(config["modbus"], snapshot_cache=snapshot_cache)
+    
+    # Initialize history store
+    history = None
+    history_config = config.get("history", {})
+    if history_config.get("enabled", True):
+        history_path = Path(__file__).parent.parent / history_config.get("path", "data/history.db")
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        history = HistoryStore({**history_config, "path": str(history_path)})
     
     # Initialize app state
-    app.state = AppState(config=config, modbus_client=modbus_client)
+    app.state = AppState(config=config, modbus_client=modbus_client, history=history)
     
     # Start background tasks
     asyncio.create_task(modbus_client.auto_reconnect())
     asyncio.create_task(modbus_client.poll_environment_data())
+    if history is not None:
+        asyncio.create_task(history.run(modbus_client))
     
     yield
     
     # Shutdown
+    if snapshot_cache is not None:
+        await snapshot_cache.save(modbus_client.snapshot, force=True)
     await modbus_client.disconnect()
+    if history is not None:
+        await history.close()
 
 
 # Create FastAPI app
@@ -67,3 +93,12 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+async def get_metrics(request: Request):
+    """Prometheus 指标"""
+    modbus_client = request.app.state.modbus_client
+    metrics.MODBUS_CONNECTED.set(1 if modbus_client.is_connected else 0)
+    metrics.MODBUS_CIRCUIT_STATE.set(STATE_VALUES[modbus_client.breaker.state])
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
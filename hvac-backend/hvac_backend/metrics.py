@@ -0,0 +1,166 @@
+"""
+运行指标
+计数器、仪表和直方图，按 Prometheus 文本格式（0.0.4）输出，供 /metrics 抓取
+
+所有指标定义在模块级，由 Modbus 客户端在请求、轮询和重连时更新
+"""
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Iterable
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: dict = {}
+        if not self.labels and self.kind != "histogram":
+            self._values[()] = 0
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Counter(_Metric):
+    """只增计数器"""
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """可任意设置的当前值"""
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """按上界分桶统计观测值"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float], labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # [各桶计数（不累计）..., +Inf 桶计数, 总和]
+            state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """统计代码块的耗时（秒）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[:-1]) if state else 0
+
+    def _samples(self) -> list:
+        lines = []
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = _format_labels(self.labels, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REGISTRY: list = []
+
+# 请求耗时桶（秒），覆盖局域网网关的正常响应到超时重试
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+MODBUS_REQUEST_SECONDS = Histogram(
+    "hvac_modbus_request_duration_seconds",
+    "Modbus request latency by function code (excluding bus lock wait)",
+    LATENCY_BUCKETS,
+    labels=("function",),
+)
+MODBUS_REQUEST_ERRORS = Counter(
+    "hvac_modbus_request_errors_total",
+    "Failed Modbus requests by function code and kind (timeout, exception, error_response)",
+    labels=("function", "kind"),
+)
+MODBUS_LOCK_WAIT_SECONDS = Histogram(
+    "hvac_modbus_lock_wait_seconds",
+    "Time spent waiting for the Modbus bus lock",
+    (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+MODBUS_RECONNECTS = Counter(
+    "hvac_modbus_reconnects_total",
+    "Modbus connection attempts by result",
+    labels=("result",),
+)
+MODBUS_CONNECTED = Gauge("hvac_modbus_connected", "Whether the Modbus connection is up (1) or down (0)")
+MODBUS_CIRCUIT_STATE = Gauge(
+    "hvac_modbus_circuit_state", "Reconnect circuit breaker state (0 closed, 1 half-open, 2 open)"
+)
+POLL_SECONDS = Histogram(
+    "hvac_poll_duration_seconds",
+    "Duration of a full register poll cycle",
+    LATENCY_BUCKETS,
+)
+POLL_BYTES = Gauge("hvac_poll_bytes", "Register payload bytes read in the last poll cycle")
+READ_BYTES = Counter("hvac_modbus_read_bytes_total", "Register payload bytes read")
+
+
+def render() -> bytes:
+    """输出所有指标的 Prometheus 文本格式"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return ("\n".join(lines) + "\n").encode("utf-8")
@@ -1,54 +1,102 @@
 import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 from typing import Optional
-from pymodbus.client import ModbusTcpClient
-from pymodbus.exceptions import ModbusException
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusException, ModbusIOException
 
+from hvac_backend import metrics
+from hvac_backend.breaker import CircuitBreaker
 from hvac_backend import registers as reg
+from hvac_backend.raw_cache import RawRegisterCache
+from hvac_backend.snapshot import EMPTY_SNAPSHOT, RegisterSnapshot
+from hvac_backend.snapshot_cache import SnapshotCache
 
 logger = logging.getLogger(__name__)
 
 
 class ModbusClient:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, snapshot_cache: Optional[SnapshotCache] = None):
         self.host = config.get("host", "192.168.110.200")
         self.port = config.get("port", 502)
         self.slave_id = config.get("slave_id", 1)
         self.timeout = config.get("timeout", 5)
+        # 批量读取块规划
+        self.max_gap = config.get("max_gap", reg.DEFAULT_MAX_GAP)
+        self.read_blocks = reg.build_read_blocks(reg.READ_ADDRESSES, self.max_gap)
         
-        self._client: Optional[ModbusTcpClient] = None
+        self._client: Optional[AsyncModbusTcpClient] = None
         self._connected = False
+        # 串行化总线请求，避免并发请求交错
+        self._lock = asyncio.Lock()
+        # 网关不可达时快速失败，按指数退避重连
+        self.breaker = CircuitBreaker(
+            base_delay=config.get("reconnect_delay", 1.0),
+            max_delay=config.get("reconnect_max_delay", 60.0),
+        )
         
-        # 所有寄存器数据缓存
-        self.all_registers_data = {}
-        # 按分组缓存
-        self.grouped_data = {}
+        # 当前寄存器快照，每次轮询后整体替换
+        self.snapshot: RegisterSnapshot = EMPTY_SNAPSHOT
+        self._version = 0
+        # 快照更新通知，每次发布后替换为新的 Event
+        self._snapshot_event = asyncio.Event()
+        # 按地址范围读取任意寄存器（调试接口）的读穿缓存
+        self.raw_cache = RawRegisterCache(
+            self.read_registers,
+            ttl=config.get("raw_cache_ttl", 2.0),
+            max_entries=config.get("raw_cache_size", 4096),
+        )
+        
+        # 启动时先发布磁盘上的快照（标记为过期），首轮轮询前接口不为空
+        self.snapshot_cache = snapshot_cache
+        if snapshot_cache is not None:
+            restored = snapshot_cache.load(self._next_version())
+            if restored is not None:
+                self.snapshot = restored
+    
+    @property
+    def all_registers_data(self) -> dict:
+        """所有寄存器数据缓存"""
+        return self.snapshot.registers
+    
+    @property
+    def grouped_data(self) -> dict:
+        """按分组缓存"""
+        return self.snapshot.grouped
     
     @property
     def is_connected(self) -> bool:
-        return self._connected and self._client is not None
+        return self._connected and self._client is not None and self._client.connected
     
     async def connect(self) -> bool:
         try:
             if self._client is not None:
                 self._client.close()
             
-            self._client = ModbusTcpClient(
+            self._client = AsyncModbusTcpClient(
                 host=self.host,
                 port=self.port,
                 timeout=self.timeout
             )
             
-            if self._client.connect():
+            if await self._client.connect():
                 self._connected = True
+                self.breaker.record_success()
+                metrics.MODBUS_RECONNECTS.inc(result="success")
                 logger.info(f"Connected to Modbus at {self.host}:{self.port}")
                 return True
             else:
                 self._connected = False
+                self.breaker.trip()
+                metrics.MODBUS_RECONNECTS.inc(result="failure")
+                logger.warning(f"Failed to connect to Modbus, retrying in {self.breaker.retry_in:.1f}s")
                 return False
         except Exception as e:
-            logger.error(f"Error connecting to Modbus: {e}")
             self._connected = False
+            self.breaker.trip()
+            metrics.MODBUS_RECONNECTS.inc(result="failure")
+            logger.error(f"Error connecting to Modbus: {e}, retrying in {self.breaker.retry_in:.1f}s")
             return False
     
     async def disconnect(self):
@@ -58,86 +106,212 @@ class ModbusClient:
             self._client = None
     
     async def reconnect(self):
+        # 连接目标可能已改变，清除之前的失败记录
+        self.breaker.reset()
         await self.disconnect()
         await self.connect()
     
     async def auto_reconnect(self):
         while True:
-            if not self.is_connected:
+            if not self.is_connected and self.breaker.allow():
                 await self.connect()
-            await asyncio.sleep(10)
+            # 断路器打开时等到退避结束，否则每秒检查一次连接状态
+            await asyncio.sleep(max(self.breaker.retry_in, 1))
+    
+    def _mark_disconnected(self):
+        """传输错误后标记连接断开，并计入断路器失败次数"""
+        self._connected = False
+        self.breaker.record_failure()
+    
+    async def read_register(self, address: int) -> Optional[int]:
+        registers = await self.read_registers(address, 1)
+        if registers:
+            return registers[0]
+        return None
+    
+    @asynccontextmanager
+    async def _bus(self):
+        """持有总线锁，并记录等待锁的时间"""
+        start = time.perf_counter()
+        async with self._lock:
+            metrics.MODBUS_LOCK_WAIT_SECONDS.observe(time.perf_counter() - start)
+            yield
     
-    def read_register(self, address: int) -> Optional[int]:
+    @staticmethod
+    def _record_failure(function: str, error: Optional[Exception] = None):
+        """按功能码记录失败请求：超时、异常或设备返回的错误响应"""
+        if error is None:
+            kind = "error_response"
+        elif isinstance(error, ModbusIOException):
+            kind = "timeout"
+        else:
+            kind = "exception"
+        metrics.MODBUS_REQUEST_ERRORS.inc(function=function, kind=kind)
+    
+    async def read_registers(self, address: int, count: int) -> Optional[list]:
+        """批量读取连续寄存器"""
         if not self.is_connected:
             return None
-        try:
-            result = self._client.read_holding_registers(
-                address=address, count=1, device_id=self.slave_id
-            )
-            if not result.isError():
-                return result.registers[0]
-            return None
-        except ModbusException as e:
-            logger.error(f"Error reading register {address}: {e}")
-            self._connected = False
-            return None
+        async with self._bus():
+            start = time.perf_counter()
+            try:
+                result = await self._client.read_holding_registers(
+                    address=address, count=count, device_id=self.slave_id
+                )
+                if not result.isError():
+                    metrics.READ_BYTES.inc(2 * count)
+                    return list(result.registers)
+                self._record_failure("03")
+                logger.error(f"Error reading registers {address}-{address + count - 1}: {result}")
+                return None
+            except ModbusException as e:
+                self._record_failure("03", e)
+                logger.error(f"Error reading registers {address}-{address + count - 1}: {e}")
+                self._mark_disconnected()
+                return None
+            finally:
+                metrics.MODBUS_REQUEST_SECONDS.observe(time.perf_counter() - start, function="03")
+    
+    async def write_register(self, address: int, value: int) -> bool:
+        return await self.write_registers(address, [value])
     
-    def write_register(self, address: int, value: int) -> bool:
+    async def write_registers(self, address: int, values: list) -> bool:
+        """批量写入连续寄存器（单个寄存器时使用 FC06，否则 FC16）"""
         if not self.is_connected:
             return False
+        async with self._bus():
+            return await self._write_block(address, values)
+    
+    async def _write_block(self, address: int, values: list) -> bool:
+        """在已持有总线锁时写入一个连续块"""
+        function = "06" if len(values) == 1 else "16"
+        start = time.perf_counter()
         try:
-            result = self._client.write_register(
-                address=address, value=value, device_id=self.slave_id
-            )
-            return not result.isError()
+            if len(values) == 1:
+                result = await self._client.write_register(
+                    address=address, value=values[0], device_id=self.slave_id
+                )
+            else:
+                result = await self._client.write_registers(
+                    address=address, values=values, device_id=self.slave_id
+                )
+            if result.isError():
+                self._record_failure(function)
+                logger.error(f"Error writing registers {address}-{address + len(values) - 1}: {result}")
+                return False
+            self.raw_cache.store(address, [value & 0xFFFF for value in values])
+            return True
         except ModbusException as e:
-            logger.error(f"Error writing register {address}: {e}")
+            self._record_failure(function, e)
+            logger.error(f"Error writing registers {address}-{address + len(values) - 1}: {e}")
+            self._mark_disconnected()
             return False
+        finally:
+            metrics.MODBUS_REQUEST_SECONDS.observe(time.perf_counter() - start, function=function)
+    
+    async def write_batch(self, values: dict) -> dict:
+        """批量写入多个寄存器（地址 -> 工程值）
+
+        校验地址、读写属性与取值范围后，将相邻地址合并为 FC16 请求，在一次持有总线锁期间依次发送，
+        返回地址 -> {"success": bool, "raw": 原始值, "error": 错误信息}
+        """
+        results = {}
+        raw_values = {}
+        for address, value in values.items():
+            info = reg.REGISTERS.get(address)
+            if info is None:
+                results[address] = {"success": False, "raw": None, "error": "Unknown register"}
+            elif info["rw"] != "RW":
+                results[address] = {"success": False, "raw": None, "error": "Register is read-only"}
+            else:
+                raw_value = reg.to_raw(value, address)
+                if raw_value is None:
+                    results[address] = {"success": False, "raw": None, "error": "Value out of range"}
+                else:
+                    raw_values[address] = raw_value
+        
+        written = {}
+        blocks = reg.build_write_blocks(raw_values)
+        if blocks and self.is_connected:
+            async with self._bus():
+                for start, block in blocks:
+                    if await self._write_block(start, block):
+                        written.update(zip(range(start, start + len(block)), block))
+        
+        for address, raw_value in raw_values.items():
+            success = address in written
+            results[address] = {
+                "success": success,
+                "raw": raw_value,
+                "error": None if success else "Write failed",
+            }
+        
+        # 所有成功写入的寄存器合并为一个新快照
+        if written:
+            self._publish(self.snapshot.with_values(written, self._next_version()))
+            logger.info(f"Batch write: {len(written)}/{len(raw_values)} registers in {len(blocks)} requests")
+        return results
+    
+    async def poll_once(self) -> RegisterSnapshot:
+        """完成一轮轮询并发布新快照"""
+        # 按读取块批量读取，直接写入快照的原始值数组
+        blocks = []
+        with metrics.POLL_SECONDS.time():
+            for start, count in self.read_blocks:
+                values = await self.read_registers(start, count)
+                if values:
+                    blocks.append((start, values))
+        metrics.POLL_BYTES.set(sum(2 * len(values) for _, values in blocks))
+        
+        # 构建完整快照后整体替换
+        snapshot = RegisterSnapshot.from_blocks(blocks, self._next_version())
+        if self.snapshot.stale and len(blocks) < len(self.read_blocks):
+            # 尚未完整读取一轮时，未读到的寄存器沿用磁盘快照，仍标记为过期
+            snapshot = snapshot.fill_from(self.snapshot)
+        self._publish(snapshot)
+        if self.snapshot_cache is not None:
+            await self.snapshot_cache.save(snapshot)
+        return snapshot
     
     async def poll_environment_data(self):
         while True:
             if self.is_connected:
                 try:
-                    # 读取所有寄存器
-                    self.all_registers_data = {}
-                    self.grouped_data = {}
-                    
-                    for address, info in reg.REGISTERS.items():
-                        raw_value = self.read_register(address)
-                        scaled_value = reg.scale_value(raw_value or 0, address)
-                        
-                        self.all_registers_data[address] = {
-                            "name": info["name"],
-                            "address": address,
-                            "raw": raw_value,
-                            "value": scaled_value,
-                            "unit": info["unit"],
-                            "rw": info["rw"],
-                            "desc": info["desc"],
-                            "group": info["group"],
-                        }
-                        
-                        # 按分组存储
-                        group = info["group"]
-                        if group not in self.grouped_data:
-                            self.grouped_data[group] = {}
-                        self.grouped_data[group][address] = {
-                            "name": info["name"],
-                            "address": address,
-                            "raw": raw_value,
-                            "value": scaled_value,
-                            "unit": info["unit"],
-                            "rw": info["rw"],
-                            "desc": info["desc"],
-                        }
-                        
+                    await self.poll_once()
                 except Exception as e:
                     logger.error(f"Error polling data: {e}")
             
             await asyncio.sleep(3)
     
+    def _next_version(self) -> int:
+        self._version += 1
+        return self._version
+    
+    def _publish(self, snapshot: RegisterSnapshot):
+        """原子替换当前快照并唤醒等待方"""
+        self.snapshot = snapshot
+        event, self._snapshot_event = self._snapshot_event, asyncio.Event()
+        event.set()
+    
+    async def wait_for_snapshot(self, version: int, timeout: float) -> RegisterSnapshot:
+        """等待版本号大于 version 的快照，超时返回当前快照"""
+        if self.snapshot.version <= version:
+            try:
+                await asyncio.wait_for(self._snapshot_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.snapshot
+    
     def get_status(self) -> dict:
-        return {"connected": self.is_connected, "host": self.host, "port": self.port}
+        snapshot = self.snapshot
+        return {
+            "connected": self.is_connected,
+            "host": self.host,
+            "port": self.port,
+            "version": snapshot.version,
+            "updated_at": snapshot.timestamp,
+            "stale": snapshot.stale,
+        }
     
     def get_all_registers(self) -> dict:
         """获取所有寄存器数据"""
@@ -149,86 +323,56 @@ class ModbusClient:
     
     def get_environment(self) -> dict:
         """获取环境数据（兼容旧接口）"""
-        env_group = self.grouped_data.get("environment", {})
-        result = {}
-        for addr, data in env_group.items():
-            name_map = {
-                "室内 PM2.5": "pm25",
-                "室内 CO2": "co2",
-                "室外温度": "outdoor_temp",
-                "室外湿度": "outdoor_humidity",
-            }
-            key = name_map.get(data["name"])
-            if key:
-                result[key] = data["value"]
-        return result
+        return self.snapshot.environment
     
     def get_system(self) -> dict:
         """获取系统数据（返回完整寄存器信息）"""
-        sys_group = self.grouped_data.get("system", {})
-        result = {}
-        for addr, data in sys_group.items():
-            name_map = {
-                "系统总电源": "power",
-                "在家/离家模式": "home_mode",
-                "运行模式": "run_mode",
-                "新风风速设定": "fan_speed",
-            }
-            key = name_map.get(data["name"])
-            if key:
-                result[key] = data
-        return result
+        return self.snapshot.system
     
     def get_rooms(self) -> dict:
         """获取房间数据（返回完整寄存器信息）"""
-        result = {}
-        for room_id, room_info in reg.ROOMS.items():
-            group_data = self.grouped_data.get(room_id, {})
-            result[room_id] = {
-                "temp": group_data.get(room_info["temp"], {}),
-                "humidity": group_data.get(room_info["humidity"], {}),
-                "dew_point": group_data.get(room_info["dew_point"], {}),
-                "setpoint": group_data.get(room_info["setpoint"], {}),
-            }
-        return result
+        return self.snapshot.rooms
     
-    def set_power(self, on: bool) -> bool:
+    async def set_power(self, on: bool) -> bool:
         """设置系统总电源"""
-        result = self.write_register(reg.RegisterAddress.SYSTEM_POWER, 1 if on else 0)
+        result = await self.write_register(reg.FIELDS["system"]["power"], 1 if on else 0)
         if result:
-            self._update_cache(reg.RegisterAddress.SYSTEM_POWER, 1 if on else 0)
+            self._update_cache(reg.FIELDS["system"]["power"], 1 if on else 0)
         return result
     
-    def set_home_mode(self, home: bool) -> bool:
+    async def set_home_mode(self, home: bool) -> bool:
         """设置在家/离家模式"""
-        result = self.write_register(reg.RegisterAddress.HOME_MODE, 1 if home else 0)
+        result = await self.write_register(reg.FIELDS["system"]["home_mode"], 1 if home else 0)
         if result:
-            self._update_cache(reg.RegisterAddress.HOME_MODE, 1 if home else 0)
+            self._update_cache(reg.FIELDS["system"]["home_mode"], 1 if home else 0)
         return result
     
-    def set_run_mode(self, mode: int) -> bool:
+    async def set_run_mode(self, mode: int) -> bool:
         """设置运行模式"""
-        result = self.write_register(reg.RegisterAddress.RUN_MODE, mode)
+        result = await self.write_register(reg.FIELDS["system"]["run_mode"], mode)
         if result:
-            self._update_cache(reg.RegisterAddress.RUN_MODE, mode)
+            self._update_cache(reg.FIELDS["system"]["run_mode"], mode)
         return result
     
-    def set_fan_speed(self, speed: int) -> bool:
+    async def set_fan_speed(self, speed: int) -> bool:
         """设置新风风速"""
-        result = self.write_register(reg.RegisterAddress.FAN_SPEED, speed)
+        result = await self.write_register(reg.FIELDS["system"]["fan_speed"], speed)
         if result:
-            self._update_cache(reg.RegisterAddress.FAN_SPEED, speed)
+            self._update_cache(reg.FIELDS["system"]["fan_speed"], speed)
         return result
     
-    def set_room_setpoint(self, room_id: str, temp: float) -> bool:
+    async def set_room_setpoint(self, room_id: str, temp: float) -> bool:
         """设置房间温度设定值"""
         if room_id not in reg.ROOMS:
             logger.warning(f"Unknown room_id: {room_id}")
             return False
         setpoint_addr = reg.ROOMS[room_id]["setpoint"]
-        value = reg.unscale_value(temp, setpoint_addr)
+        value = reg.to_raw(temp, setpoint_addr)
+        if value is None:
+            logger.warning(f"Setpoint out of range for {room_id}: {temp}")
+            return False
         logger.info(f"Setting {room_id} temperature: {temp}°C -> register {setpoint_addr} = {value}")
-        result = self.write_register(setpoint_addr, value)
+        result = await self.write_register(setpoint_addr, value)
         logger.info(f"Write result: {result}")
         
         # 写入成功后立即更新缓存
@@ -238,49 +382,26 @@ class ModbusClient:
         return result
     
     def _update_cache(self, address: int, raw_value: int):
-        """更新本地缓存中的寄存器值"""
+        """写入成功后基于当前快照生成新快照"""
         if address not in reg.REGISTERS:
             return
         
-        info = reg.REGISTERS[address]
-        scaled_value = reg.scale_value(raw_value, address)
-        group = info["group"]
+        self._publish(self.snapshot.with_values({address: raw_value}, self._next_version()))
         
-        # 更新全局缓存
-        self.all_registers_data[address] = {
-            "name": info["name"],
-            "address": address,
-            "raw": raw_value,
-            "value": scaled_value,
-            "unit": info["unit"],
-            "rw": info["rw"],
-            "desc": info["desc"],
-            "group": group,
-        }
-        
-        # 更新分组缓存
-        if group not in self.grouped_data:
-            self.grouped_data[group] = {}
-        self.grouped_data[group][address] = {
-            "name": info["name"],
-            "address": address,
-            "raw": raw_value,
-            "value": scaled_value,
-            "unit": info["unit"],
-            "rw": info["rw"],
-            "desc": info["desc"],
-        }
-        
-        logger.info(f"Cache updated: {info['name']} = {scaled_value} (raw: {raw_value})")
+        entry = self.snapshot.registers[address]
+        logger.info(f"Cache updated: {entry['name']} = {entry['value']} (raw: {raw_value})")
     
-    def write_register_by_address(self, address: int, value: float) -> bool:
+    async def write_register_by_address(self, address: int, value: float) -> bool:
         """通过地址写入寄存器"""
         if address not in reg.REGISTERS:
             return False
         if reg.REGISTERS[address]["rw"] != "RW":
             return False
-        raw_value = reg.unscale_value(value, address)
-        result = self.write_register(address, raw_value)
+        raw_value = reg.to_raw(value, address)
+        if raw_value is None:
+            logger.warning(f"Value out of range for register {address}: {value}")
+            return False
+        result = await self.write_register(address, raw_value)
         if result:
             self._update_cache(address, raw_value)
         return result
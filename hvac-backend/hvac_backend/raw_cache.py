@@ -0,0 +1,105 @@
+"""
+任意地址寄存器的读穿缓存
+供调试接口按地址范围读取寄存器表以外的地址：每个地址单独记录读取时间，超过 TTL 后重新读取，
+条目数超过上限时淘汰最久未使用的地址；并发请求中重叠的地址共用同一次总线读取
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from hvac_backend import registers as reg
+
+logger = logging.getLogger(__name__)
+
+# (起始地址, 数量) -> 寄存器值列表，读取失败返回 None
+ReadFunc = Callable[[int, int], Awaitable[Optional[list]]]
+
+
+class RawRegisterCache:
+    """按地址缓存的原始寄存器值（LRU + 每地址 TTL）"""
+
+    def __init__(self, read: ReadFunc, ttl: float = 2.0, max_entries: int = 4096, max_gap: int = 0):
+        self._read = read
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # 缺失地址之间间隔不超过 max_gap 时合并为一次读取
+        self.max_gap = max_gap
+        # 地址 -> (原始值, 读取时间)，按最近使用排序
+        self._entries: OrderedDict = OrderedDict()
+        # 正在读取的地址 -> 所属读取块的 Future（结果为 地址 -> 值，失败为 None）
+        self._pending: dict = {}
+        # 读取任务独立于发起请求运行，请求断开不会让等待同一块的其他请求挂起
+        self._tasks: set = set()
+
+    def _lookup(self, address: int, now: float) -> Optional[int]:
+        """未过期时返回缓存值并标记为最近使用"""
+        entry = self._entries.get(address)
+        if entry is None:
+            return None
+        if now - entry[1] > self.ttl:
+            del self._entries[address]
+            return None
+        self._entries.move_to_end(address)
+        return entry[0]
+
+    def store(self, start: int, values: list, now: Optional[float] = None):
+        """写入一段连续地址的值（读取完成或写入成功后调用）"""
+        now = time.monotonic() if now is None else now
+        entries = self._entries
+        for address, value in enumerate(values, start):
+            entries[address] = (value, now)
+            entries.move_to_end(address)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    async def _fetch(self, start: int, count: int, future: asyncio.Future):
+        """执行一次总线读取并唤醒所有等待该块的请求"""
+        try:
+            values = await self._read(start, count)
+            if values is None:
+                future.set_result(None)
+            else:
+                self.store(start, values)
+                future.set_result(dict(zip(range(start, start + count), values)))
+        except Exception as e:
+            logger.error(f"Error reading registers {start}-{start + count - 1}: {e}")
+            future.set_result(None)
+        finally:
+            for address in range(start, start + count):
+                if self._pending.get(address) is future:
+                    del self._pending[address]
+
+    async def read(self, start: int, count: int) -> Optional[list]:
+        """读取 start 起 count 个寄存器，任一地址读取失败时返回 None"""
+        now = time.monotonic()
+        values = {}
+        waiting = {}
+        missing = []
+        for address in range(start, start + count):
+            value = self._lookup(address, now)
+            if value is not None:
+                values[address] = value
+            elif address in self._pending:
+                waiting[address] = self._pending[address]
+            else:
+                missing.append(address)
+
+        # 其余缺失地址按连续块读取，登记后其他请求可直接等待
+        for block_start, block_count in reg.build_read_blocks(missing, self.max_gap, pairs=()):
+            future = asyncio.get_running_loop().create_future()
+            for address in range(block_start, block_start + block_count):
+                self._pending[address] = future
+            task = asyncio.create_task(self._fetch(block_start, block_count, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        for address in missing:
+            waiting[address] = self._pending[address]
+
+        for address, future in waiting.items():
+            result = await future
+            if result is None:
+                return None
+            values[address] = result[address]
+        return [values[address] for address in range(start, start + count)]
@@ -1,109 +1,167 @@
 """
 Modbus 寄存器地址定义
-基于 docs/modbus.jpg 中的寄存器映射表
+基于 docs/modbus.jpg 中的寄存器映射表，寄存器表本身定义在共用的 registers.yaml 中
 """
+import importlib.util
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional
 
-# 常用寄存器地址常量
-class RegisterAddress:
-    # 系统控制
-    SYSTEM_POWER = 1033          # 系统总电源
-    HOME_MODE = 1034             # 在家/离家模式
-    RUN_MODE = 1041              # 运行模式
-    FAN_SPEED = 1047             # 新风风速设定
-    
-    # 厨卫功能
-    KITCHEN_RADIANT = 1133       # 厨卫辐射开关
-    
-    # 新风系统
-    HUMIDIFIER = 1168            # 面板加湿开关
-
-# 寄存器完整定义：地址 -> {名称, 单位, 读写, 缩放因子, 描述, 分组}
+
+# 寄存器表定义在 Home Assistant 集成目录下的 registers.yaml，后端与集成共用同一份
+INTEGRATION_DIR = Path(__file__).resolve().parents[2] / "custom_components" / "hvac_modbus"
+SCHEMA_PATH = Path(os.environ.get("HVAC_REGISTER_SCHEMA", INTEGRATION_DIR / "registers.yaml"))
+
+
+def _load_codec(schema_path: Path):
+    """按文件路径加载寄存器表的校验与解码模块 schema.py（只依赖 yaml 与标准库），规则只维护一份
+
+    优先使用 registers.yaml 同目录下的 schema.py（单独部署时两者放在一起），其次是集成目录
+    """
+    for directory in dict.fromkeys((schema_path.parent, INTEGRATION_DIR)):
+        path = directory / "schema.py"
+        if path.is_file():
+            break
+    else:
+        raise ImportError(
+            f"schema.py not found next to {schema_path} or in {INTEGRATION_DIR}; "
+            "copy custom_components/hvac_modbus/schema.py alongside registers.yaml"
+        )
+    spec = importlib.util.spec_from_file_location("hvac_register_schema", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+codec = _load_codec(SCHEMA_PATH)
+SCHEMA = codec.load_schema(SCHEMA_PATH)
+
+# 寄存器完整定义：地址 -> {名称, 单位, 读写, 缩放因子, 描述, 分组, 字段名, 类型}
 REGISTERS = {
-    # ========== 系统环境区 ==========
-    1024: {"name": "室内 PM2.5", "unit": "μg/m³", "rw": "RO", "scaling": 1, "desc": "室内空气质量", "group": "environment"},
-    1026: {"name": "室内 CO2", "unit": "PPM", "rw": "RO", "scaling": 1, "desc": "室内二氧化碳浓度", "group": "environment"},
-    1027: {"name": "室外温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "室外环境温度", "group": "environment"},
-    1028: {"name": "室外湿度", "unit": "%", "rw": "RO", "scaling": 0.1, "desc": "室外环境湿度", "group": "environment"},
-    
-    # ========== 系统控制区 ==========
-    1033: {"name": "系统总电源", "unit": "", "rw": "RW", "scaling": 1, "desc": "1:开 0:关", "group": "system"},
-    1034: {"name": "在家/离家模式", "unit": "", "rw": "RW", "scaling": 1, "desc": "1:在家 0:离家", "group": "system"},
-    1041: {"name": "运行模式", "unit": "", "rw": "RW", "scaling": 1, "desc": "1:制冷 2:制热 3:通风 4:除湿", "group": "system"},
-    1047: {"name": "新风风速设定", "unit": "%", "rw": "RW", "scaling": 1, "desc": "风速百分比", "group": "system"},
-    
-    # ========== 约克主机区 ==========
-    1029: {"name": "约克供水温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "主机供水温度", "group": "york"},
-    1030: {"name": "约克回水温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "主机回水温度", "group": "york"},
-    1062: {"name": "制热供水设定点", "unit": "°C", "rw": "RW", "scaling": 0.1, "desc": "制热模式供水温度设定", "group": "york"},
-    1066: {"name": "制冷供水设定点", "unit": "°C", "rw": "RW", "scaling": 0.1, "desc": "制冷模式供水温度设定", "group": "york"},
-    
-    # ========== 客厅 ==========
-    1085: {"name": "客厅实际温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "客厅当前温度", "group": "living_room"},
-    1087: {"name": "客厅实际湿度", "unit": "%", "rw": "RO", "scaling": 0.1, "desc": "客厅当前湿度", "group": "living_room"},
-    1088: {"name": "客厅露点温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "客厅露点温度", "group": "living_room"},
-    1090: {"name": "客厅设定温度", "unit": "°C", "rw": "RW", "scaling": 0.5, "desc": "客厅目标温度", "group": "living_room"},
-    
-    # ========== 主卧 ==========
-    1095: {"name": "主卧实际温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "主卧当前温度", "group": "master_bedroom"},
-    1097: {"name": "主卧实际湿度", "unit": "%", "rw": "RO", "scaling": 0.1, "desc": "主卧当前湿度", "group": "master_bedroom"},
-    1098: {"name": "主卧露点温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "主卧露点温度", "group": "master_bedroom"},
-    1101: {"name": "主卧设定温度", "unit": "°C", "rw": "RW", "scaling": 0.5, "desc": "主卧目标温度", "group": "master_bedroom"},
-    
-    # ========== 次卧 ==========
-    1105: {"name": "次卧实际温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "次卧当前温度", "group": "second_bedroom"},
-    1107: {"name": "次卧实际湿度", "unit": "%", "rw": "RO", "scaling": 0.1, "desc": "次卧当前湿度", "group": "second_bedroom"},
-    1108: {"name": "次卧露点温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "次卧露点温度", "group": "second_bedroom"},
-    1110: {"name": "次卧设定温度", "unit": "°C", "rw": "RW", "scaling": 0.5, "desc": "次卧目标温度", "group": "second_bedroom"},
-    
-    # ========== 书房 ==========
-    1117: {"name": "书房实际温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "书房当前温度", "group": "study_room"},
-    1119: {"name": "书房实际湿度", "unit": "%", "rw": "RO", "scaling": 0.1, "desc": "书房当前湿度", "group": "study_room"},
-    1120: {"name": "书房露点温度", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "书房露点温度", "group": "study_room"},
-    1123: {"name": "书房设定温度", "unit": "°C", "rw": "RW", "scaling": 0.5, "desc": "书房目标温度", "group": "study_room"},
-    
-    # ========== 厨卫与功能区 ==========
-    1133: {"name": "厨卫辐射开关", "unit": "", "rw": "RW", "scaling": 1, "desc": "厨房卫生间辐射控制", "group": "kitchen"},
-    1161: {"name": "新风压缩机频率", "unit": "Hz", "rw": "RO", "scaling": 1, "desc": "新风机压缩机运行频率", "group": "fresh_air"},
-    1164: {"name": "新风内部供水温", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "新风内部换热器供水温度", "group": "fresh_air"},
-    1165: {"name": "新风内部回水温", "unit": "°C", "rw": "RO", "scaling": 0.1, "desc": "新风内部换热器回水温度", "group": "fresh_air"},
-    1168: {"name": "面板加湿开关", "unit": "", "rw": "RW", "scaling": 1, "desc": "1:开 0:关", "group": "fresh_air"},
-    1049: {"name": "新风机状态码1", "unit": "", "rw": "RO", "scaling": 1, "desc": "0x8104表示正常运行", "group": "fresh_air"},
+    spec.address: {
+        "name": spec.name,
+        "unit": spec.unit,
+        "rw": spec.rw,
+        "scaling": spec.scale,
+        "desc": spec.desc,
+        "group": spec.group,
+        "key": spec.key,
+        "type": spec.type,
+        "signed": spec.signed,
+        "width": spec.width,
+        "bits": codec.compile_bits(spec.bits),
+    }
+    for spec in SCHEMA.registers
 }
 
-# 房间配置
+# 房间配置：房间 ID -> {名称, 字段名 -> 地址}
 ROOMS = {
-    "living_room": {"name": "客厅", "temp": 1085, "humidity": 1087, "dew_point": 1088, "setpoint": 1090},
-    "master_bedroom": {"name": "主卧", "temp": 1095, "humidity": 1097, "dew_point": 1098, "setpoint": 1101},
-    "second_bedroom": {"name": "次卧", "temp": 1105, "humidity": 1107, "dew_point": 1108, "setpoint": 1110},
-    "study_room": {"name": "书房", "temp": 1117, "humidity": 1119, "dew_point": 1120, "setpoint": 1123},
+    room_id: {
+        "name": SCHEMA.groups[room_id],
+        **{info["key"]: address for address, info in REGISTERS.items() if info["group"] == room_id and info["key"]},
+    }
+    for room_id in SCHEMA.rooms
 }
 
+# 字段地址：分组 -> 字段名 -> 地址（房间分组同样包含在内）
+FIELDS = {}
+for _address, _info in REGISTERS.items():
+    if _info["key"]:
+        FIELDS.setdefault(_info["group"], {})[_info["key"]] = _address
+del _address, _info
+
+# 单次 FC03 读取的寄存器数量上限（Modbus PDU 限制）
+MAX_READ_COUNT = 125
+
+# 单次 FC16 写入的寄存器数量上限（Modbus PDU 限制）
+MAX_WRITE_COUNT = 123
+
+# 合并读取块时允许跨越的默认地址间隔
+DEFAULT_MAX_GAP = 10
+
 # 分组名称
-GROUP_NAMES = {
-    "environment": "环境监测",
-    "system": "系统控制",
-    "york": "约克主机",
-    "living_room": "客厅",
-    "master_bedroom": "主卧",
-    "second_bedroom": "次卧",
-    "study_room": "书房",
-    "kitchen": "厨卫功能",
-    "fresh_air": "新风系统",
-}
+GROUP_NAMES = SCHEMA.groups
+
+
+# ========== 紧凑寄存器表（导入时预计算） ==========
+# 以 BASE_ADDRESS 为起点、按地址偏移索引的并行数组，供快照按偏移直接取值
+BASE_ADDRESS = min(REGISTERS)
+ADDRESS_SPAN = max(address + info["width"] for address, info in REGISTERS.items()) - BASE_ADDRESS
+
+# 需要读取的全部地址（32 位寄存器包含第二个字）
+READ_ADDRESSES = tuple(
+    sorted(address + i for address, info in REGISTERS.items() for i in range(info["width"]))
+)
+
+# 地址 -> 缩放因子
+SCALING = {address: info.get("scaling", 1) for address, info in REGISTERS.items()}
+
+# 分组编号 -> 分组名
+GROUPS = tuple(dict.fromkeys(info["group"] for info in REGISTERS.values()))
+
+# 已定义寄存器的偏移（按地址排序）
+OFFSETS = array("H", sorted(address - BASE_ADDRESS for address in REGISTERS))
+# 偏移 -> 缩放因子 / 分组编号（-1 表示未定义）
+SCALES = array("d", [1.0] * ADDRESS_SPAN)
+GROUP_IDS = array("b", [-1] * ADDRESS_SPAN)
+# 需要额外解码的偏移：int16 与 32 位寄存器，以及各自的解码函数（来自 schema.py）
+SIGNED_OFFSETS = array("H")
+WIDE_OFFSETS = array("H")
+DECODERS = {}
+# 地址 -> 编译后的位字段
+BITFIELDS = {}
+for _spec in SCHEMA.registers:
+    _offset = _spec.address - BASE_ADDRESS
+    SCALES[_offset] = _spec.scale
+    GROUP_IDS[_offset] = GROUPS.index(_spec.group)
+    if _spec.width == 2:
+        WIDE_OFFSETS.append(_offset)
+    elif _spec.signed:
+        SIGNED_OFFSETS.append(_offset)
+    if _spec.decoder() is not None:
+        DECODERS[_offset] = _spec.decoder()
+    if _spec.bits:
+        BITFIELDS[_spec.address] = REGISTERS[_spec.address]["bits"]
+WIDE = frozenset(WIDE_OFFSETS)
+# 32 位寄存器第一个字的地址，读取分块时两个字必须在同一块内
+WIDE_ADDRESSES = frozenset(BASE_ADDRESS + offset for offset in WIDE)
+SIGNED_SET = frozenset(SIGNED_OFFSETS)
+del _spec, _offset
+
+decode_bits = codec.decode_bits
+
+
+def decode_at(raw, present, offset: int) -> Optional[int]:
+    """按寄存器类型解码原始值数组中某个偏移的整数值，未读到时返回 None
+
+    32 位寄存器要求两个字都已读到
+    """
+    if not present[offset]:
+        return None
+    decode = DECODERS.get(offset)
+    if decode is None:
+        return raw[offset]
+    # 解码函数按地址取相邻字，这里以偏移代替地址
+    return decode(raw[offset], offset, lambda other: raw[other] if present[other] else None)
 
 
 def scale_value(value: int, address: int) -> float:
-    """根据寄存器地址缩放值"""
-    if address in REGISTERS:
-        scaling = REGISTERS[address].get("scaling", 1)
+    """根据寄存器地址缩放单个 16 位寄存器的值（int16 先按补码解码）"""
+    if address - BASE_ADDRESS in SIGNED_SET and value & 0x8000:
+        value -= 0x10000
+    scaling = SCALING.get(address)
+    if scaling is not None:
         return value * scaling
     return value
 
 
 def unscale_value(value: float, address: int) -> int:
     """将值反缩放后用于写入寄存器"""
-    if address in REGISTERS:
-        scaling = REGISTERS[address].get("scaling", 1)
+    scaling = SCALING.get(address)
+    if scaling is not None:
         if scaling == 0.5:
             # 温度设定：20°C -> 40
             result = int(value * 2)
@@ -115,6 +173,64 @@ def unscale_value(value: float, address: int) -> int:
     return int(value)
 
 
+def to_raw(value: float, address: int) -> Optional[int]:
+    """将工程值反缩放为待写入的 16 位原始值，超出寄存器类型的取值范围时返回 None
+
+    uint16 / bool 为 0..65535，int16 为 -32768..32767（按补码写入）
+    """
+    try:
+        raw = unscale_value(value, address)
+    except (ValueError, OverflowError):
+        return None
+    low, high = (-0x8000, 0x7FFF) if address - BASE_ADDRESS in SIGNED_SET else (0, 0xFFFF)
+    if not low <= raw <= high:
+        return None
+    return raw & 0xFFFF
+
+
+def build_read_blocks(
+    addresses,
+    max_gap: int = DEFAULT_MAX_GAP,
+    max_count: int = MAX_READ_COUNT,
+    pairs=WIDE_ADDRESSES,
+) -> list:
+    """将寄存器地址合并为连续的批量读取块
+
+    间隔不超过 max_gap 的相邻地址合并为一块，每块长度不超过 max_count，
+    pairs 中的地址与下一个地址（32 位寄存器的两个字）总在同一块内，
+    返回 [(起始地址, 数量), ...]
+    """
+    blocks = []
+    start = end = None
+    for address in sorted(set(addresses)):
+        last = address + 1 if address in pairs else address
+        if start is not None and address - end - 1 <= max_gap and last - start < max_count:
+            end = max(end, last)
+            continue
+        if start is not None:
+            blocks.append((start, end - start + 1))
+        start, end = address, last
+    if start is not None:
+        blocks.append((start, end - start + 1))
+    return blocks
+
+
+def build_write_blocks(values: dict, max_count: int = MAX_WRITE_COUNT) -> list:
+    """将地址 -> 原始值按连续地址合并为批量写入块
+
+    写入不能跨越间隔，只合并严格相邻的地址，返回 [(起始地址, [值, ...]), ...]
+    """
+    blocks = []
+    for address in sorted(values):
+        if blocks:
+            start, block = blocks[-1]
+            if start + len(block) == address and len(block) < max_count:
+                block.append(values[address])
+                continue
+        blocks.append((address, [values[address]]))
+    return blocks
+
+
 def get_registers_by_group(group: str) -> dict:
     """获取指定分组的所有寄存器"""
     return {addr: info for addr, info in REGISTERS.items() if info.get("group") == group}
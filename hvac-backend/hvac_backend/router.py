@@ -1,9 +1,36 @@
-from fastapi import APIRouter, Request
+import time
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from hvac_backend import registers as reg
 
 router = APIRouter()
 
+# 推送流无数据时的保活间隔（秒）
+STREAM_KEEPALIVE = 15
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """判断 If-None-Match 是否命中当前 ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+def _snapshot_response(request: Request, view: str) -> Response:
+    """返回当前快照预序列化的视图，ETag 命中时返回 304"""
+    snapshot = request.app.state.modbus_client.snapshot
+    etag = snapshot.etag(view)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=snapshot.json_bytes(view), media_type="application/json", headers=headers
+    )
+
 
 class ModbusConfig(BaseModel):
     host: str
@@ -28,6 +55,10 @@ class RegisterWrite(BaseModel):
     value: float
 
 
+class RegisterBatchWrite(BaseModel):
+    writes: list[RegisterWrite]
+
+
 @router.get("/config")
 async def get_config(request: Request):
     config = request.app.state.config["modbus"]
@@ -64,21 +95,45 @@ async def get_status(request: Request):
 @router.get("/registers")
 async def get_all_registers(request: Request):
     """获取所有寄存器数据"""
-    return request.app.state.modbus_client.get_all_registers()
+    return _snapshot_response(request, "registers")
 
 
 @router.get("/registers/grouped")
 async def get_grouped_registers(request: Request):
     """获取按分组的寄存器数据"""
-    grouped_data = request.app.state.modbus_client.get_grouped_data()
-    # 添加分组名称
-    result = {}
-    for group, data in grouped_data.items():
-        result[group] = {
-            "name": reg.GROUP_NAMES.get(group, group),
-            "registers": data
-        }
-    return result
+    return _snapshot_response(request, "grouped")
+
+
+@router.get("/stream")
+async def stream_registers(request: Request):
+    """推送寄存器变化（SSE）：连接时发送全量快照，之后每轮只发送原始值变化的寄存器"""
+    modbus = request.app.state.modbus_client
+    
+    async def events():
+        previous = None
+        connected = None
+        while not await request.is_disconnected():
+            snapshot = await modbus.wait_for_snapshot(
+                previous.version if previous is not None else -1, STREAM_KEEPALIVE
+            )
+            # 首次连接、连接状态变化或过期快照被确认时发送全量快照
+            if previous is None or modbus.is_connected != connected or snapshot.stale != previous.stale:
+                connected = modbus.is_connected
+                event, payload = "snapshot", snapshot.stream_payload(connected)
+            elif snapshot.version != previous.version:
+                event, payload = "delta", snapshot.stream_payload(connected, previous)
+            else:
+                yield b": keepalive\n\n"
+                continue
+            previous = snapshot
+            if payload is not None:
+                yield b"event: " + event.encode() + b"\nid: " + str(snapshot.version).encode() + b"\ndata: " + payload + b"\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/registers/groups")
@@ -87,67 +142,132 @@ async def get_register_groups():
     return reg.GROUP_NAMES
 
 
+@router.get("/registers/raw")
+async def read_raw_registers(
+    request: Request,
+    start: int = Query(..., ge=0, le=0xFFFF),
+    count: int = Query(1, ge=1, le=reg.MAX_READ_COUNT),
+):
+    """按地址范围读取原始寄存器值（不限于寄存器表），经读穿缓存合并重复的总线读取"""
+    if start + count > 0x10000:
+        raise HTTPException(status_code=400, detail="Address range exceeds 65535")
+    modbus = request.app.state.modbus_client
+    values = await modbus.raw_cache.read(start, count)
+    if values is None:
+        detail = "Read failed" if modbus.is_connected else "Modbus not connected"
+        raise HTTPException(status_code=503, detail=detail)
+    return {"start": start, "count": count, "values": values}
+
+
 @router.post("/registers/write")
 async def write_register(write_data: RegisterWrite, request: Request):
     """通过地址写入寄存器"""
-    success = request.app.state.modbus_client.write_register_by_address(
+    success = await request.app.state.modbus_client.write_register_by_address(
         write_data.address, write_data.value
     )
     if success:
         return {"message": "Register updated", "address": write_data.address, "value": write_data.value}
     else:
-        return {"error": "Failed to write register"}, 400
+        return JSONResponse(status_code=400, content={"error": "Failed to write register"})
+
+
+@router.post("/registers/write-batch")
+async def write_registers_batch(batch: RegisterBatchWrite, request: Request):
+    """批量写入寄存器：相邻地址合并为 FC16 请求，返回每个寄存器的写入结果"""
+    # 同一地址多次出现时以最后一次为准
+    values = {item.address: item.value for item in batch.writes}
+    results = await request.app.state.modbus_client.write_batch(values)
+    return _batch_results(values, results)
+
+
+def _batch_results(values: dict, results: dict) -> dict:
+    """批量写入的响应体：总体是否成功及每个寄存器的写入结果"""
+    return {
+        "success": all(result["success"] for result in results.values()),
+        "results": [
+            {"address": address, "value": value, **results[address]}
+            for address, value in values.items()
+        ],
+    }
+
+
+@router.get("/history")
+async def get_history(
+    request: Request,
+    addresses: str,
+    start: float | None = Query(None, alias="from"),
+    end: float | None = Query(None, alias="to"),
+    step: str = "auto",
+):
+    """查询寄存器历史数据
+
+    addresses 为逗号分隔的地址，from/to 为 Unix 时间戳（默认最近 1 小时），
+    step 为 raw / 1m / 1h / auto
+    """
+    history = request.app.state.history
+    if history is None:
+        raise HTTPException(status_code=404, detail="History is disabled")
+    try:
+        address_list = [int(address) for address in addresses.split(",") if address.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid addresses")
+    unknown = [address for address in address_list if address not in reg.REGISTERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown registers: {unknown}")
+    end = time.time() if end is None else end
+    start = end - 3600 if start is None else start
+    try:
+        return await history.query(address_list, start, end, step)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/environment")
 async def get_environment(request: Request):
-    return request.app.state.modbus_client.get_environment()
+    return _snapshot_response(request, "environment")
 
 
 @router.get("/system")
 async def get_system(request: Request):
-    return request.app.state.modbus_client.get_system()
+    return _snapshot_response(request, "system")
 
 
 @router.put("/system")
 async def update_system(control: SystemControl, request: Request):
-    modbus = request.app.state.modbus_client
-    
+    # 所有字段合并为一次批量写入（电源与在家模式地址相邻，合并为一个 FC16 请求）
+    values = {}
     if control.power is not None:
-        modbus.set_power(control.power)
+        values[reg.FIELDS["system"]["power"]] = 1 if control.power else 0
     if control.home_mode is not None:
-        modbus.set_home_mode(control.home_mode)
+        values[reg.FIELDS["system"]["home_mode"]] = 1 if control.home_mode else 0
     if control.run_mode is not None:
-        modbus.set_run_mode(control.run_mode)
+        values[reg.FIELDS["system"]["run_mode"]] = control.run_mode
     if control.fan_speed is not None:
-        modbus.set_fan_speed(control.fan_speed)
+        values[reg.FIELDS["system"]["fan_speed"]] = control.fan_speed
     
-    return {"message": "System control updated"}
+    results = await request.app.state.modbus_client.write_batch(values) if values else {}
+    body = {"message": "System control updated", **_batch_results(values, results)}
+    if not body["success"]:
+        body["message"] = "Failed to update system control"
+        return JSONResponse(status_code=400, content=body)
+    return body
 
 
 @router.get("/rooms")
 async def get_rooms(request: Request):
     """获取房间数据"""
-    room_data = request.app.state.modbus_client.get_rooms()
-    
-    result = []
-    for room_id, room_info in reg.ROOMS.items():
-        data = room_data.get(room_id, {})
-        result.append({
-            "id": room_id,
-            "name": room_info["name"],
-            "temp": data.get("temp"),
-            "humidity": data.get("humidity"),
-            "dew_point": data.get("dew_point"),
-            "setpoint": data.get("setpoint"),
-        })
-    
-    return result
+    return _snapshot_response(request, "rooms")
+
+
+@router.get("/derived")
+async def get_derived(request: Request):
+    """获取派生指标（露点裕量、结露风险、供回水温差、舒适度）"""
+    return _snapshot_response(request, "derived")
 
 
 @router.put("/rooms/{room_id}")
 async def update_room(room_id: str, setpoint: RoomSetpoint, request: Request):
-    success = request.app.state.modbus_client.set_room_setpoint(room_id, setpoint.temp)
+    success = await request.app.state.modbus_client.set_room_setpoint(room_id, setpoint.temp)
     
     if success:
         return {"message": "Room setpoint updated"}
@@ -0,0 +1,269 @@
+"""
+Modbus TCP 设备模拟器
+按 REGISTERS 寄存器表模拟网关，用于在没有实际设备时测试轮询延迟、写入往返和重连行为
+
+支持 FC03（读保持寄存器）、FC06（写单个寄存器）、FC16（写多个寄存器），
+可配置每个请求的延迟、抖动、丢弃响应的比例，以及慢速网关的串行处理；
+还可以回放录制的寄存器变化轨迹
+
+用法：
+    python -m hvac_backend.simulator --port 5020 --latency 0.05 --jitter 0.02 --drop 0.01 --serialize
+    python -m hvac_backend.simulator --trace trace.jsonl --loop
+
+轨迹文件为 JSON Lines，每行 {"t": 相对秒数, "registers": {"地址": 原始值, ...}}
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import struct
+from typing import Iterable, Optional
+
+from hvac_backend import registers as reg
+
+logger = logging.getLogger(__name__)
+
+# Modbus 异常码
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+
+# 各单位寄存器的初始工程值
+DEFAULT_VALUES = {"°C": 25.0, "%": 50.0}
+
+# 寄存器表末尾之后仍可读取的地址数（HA 集成按固定块读取，会越过最后一个定义的寄存器）
+SPARE_ADDRESSES = 16
+
+
+def default_registers() -> dict:
+    """根据寄存器表生成初始原始值（温度 25°C、百分比 50%，其余为 0）"""
+    values = {}
+    for address, info in reg.REGISTERS.items():
+        value = DEFAULT_VALUES.get(info["unit"], 0)
+        values[address] = int(value / reg.SCALING[address]) & 0xFFFF
+    return values
+
+
+class SimulatedDevice:
+    """模拟设备的寄存器存储，表内未定义但处于地址范围内的寄存器读为 0"""
+
+    def __init__(self, values: Optional[dict] = None):
+        self.start = reg.BASE_ADDRESS
+        self.end = reg.BASE_ADDRESS + reg.ADDRESS_SPAN + SPARE_ADDRESSES
+        self.values = default_registers() if values is None else dict(values)
+
+    def in_range(self, address: int, count: int) -> bool:
+        return self.start <= address and address + count <= self.end
+
+    def read(self, address: int, count: int) -> list:
+        return [self.values.get(a, 0) for a in range(address, address + count)]
+
+    def write(self, address: int, values: Iterable[int]):
+        for offset, value in enumerate(values):
+            self.values[address + offset] = value & 0xFFFF
+
+
+class ModbusSimulator:
+    """Modbus TCP 服务端（MBAP 帧），每个请求按配置的延迟/抖动/丢弃处理"""
+
+    def __init__(
+        self,
+        device: Optional[SimulatedDevice] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        serialize: bool = False,
+        seed: Optional[int] = None,
+    ):
+        self.device = device or SimulatedDevice()
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        # 串行模式下所有连接的请求排队依次处理，模拟慢速网关
+        self.serialize = serialize
+        self._bus_lock = asyncio.Lock()
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._writers: set = set()
+        # 统计
+        self.requests = 0
+        self.dropped = 0
+        self.connections = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 5020) -> int:
+        """启动监听，返回实际端口（port=0 时自动分配）"""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Modbus simulator listening on {host}:{port}")
+        return port
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                transaction_id, protocol_id, length, unit_id = struct.unpack(">HHHB", header)
+                # 长度包含单元标识和至少 1 字节功能码，否则无法分帧，关闭连接
+                if not 2 <= length <= 254:
+                    logger.warning(f"Invalid MBAP length {length}, closing connection")
+                    break
+                pdu = await reader.readexactly(length - 1)
+                # 每个请求独立处理，允许客户端在一个连接上并发发送请求
+                task = asyncio.create_task(
+                    self._handle_request(writer, write_lock, transaction_id, unit_id, pdu)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # 客户端断开或模拟器停止
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            self._writers.discard(writer)
+            self.connections -= 1
+
+    async def _handle_request(
+        self,
+        writer: asyncio.StreamWriter,
+        write_lock: asyncio.Lock,
+        transaction_id: int,
+        unit_id: int,
+        pdu: bytes,
+    ):
+        self.requests += 1
+        if self.serialize:
+            async with self._bus_lock:
+                response = await self._delayed_response(pdu)
+        else:
+            response = await self._delayed_response(pdu)
+
+        if self._random.random() < self.drop_rate:
+            self.dropped += 1
+            return
+        frame = struct.pack(">HHHB", transaction_id, 0, len(response) + 1, unit_id) + response
+        async with write_lock:
+            writer.write(frame)
+            await writer.drain()
+
+    async def _delayed_response(self, pdu: bytes) -> bytes:
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self.process(pdu)
+
+    def process(self, pdu: bytes) -> bytes:
+        """处理请求 PDU，返回响应 PDU"""
+        function = pdu[0]
+        try:
+            if function == 0x03:
+                address, count = struct.unpack(">HH", pdu[1:5])
+                if not 1 <= count <= reg.MAX_READ_COUNT:
+                    return bytes([function | 0x80, ILLEGAL_DATA_VALUE])
+                if not self.device.in_range(address, count):
+                    return bytes([function | 0x80, ILLEGAL_DATA_ADDRESS])
+                values = self.device.read(address, count)
+                return struct.pack(f">BB{count}H", function, count * 2, *values)
+            if function == 0x06:
+                address, value = struct.unpack(">HH", pdu[1:5])
+                if not self.device.in_range(address, 1):
+                    return bytes([function | 0x80, ILLEGAL_DATA_ADDRESS])
+                self.device.write(address, [value])
+                return pdu[:5]
+            if function == 0x10:
+                address, count, byte_count = struct.unpack(">HHB", pdu[1:6])
+                if not 1 <= count <= reg.MAX_WRITE_COUNT or byte_count != count * 2:
+                    return bytes([function | 0x80, ILLEGAL_DATA_VALUE])
+                if not self.device.in_range(address, count):
+                    return bytes([function | 0x80, ILLEGAL_DATA_ADDRESS])
+                self.device.write(address, struct.unpack(f">{count}H", pdu[6:6 + byte_count]))
+                return struct.pack(">BHH", function, address, count)
+        except struct.error:
+            return bytes([function | 0x80, ILLEGAL_DATA_VALUE])
+        return bytes([function | 0x80, ILLEGAL_FUNCTION])
+
+
+def load_trace(path: str) -> list:
+    """读取轨迹文件，返回 [(相对秒数, {地址: 原始值}), ...]"""
+    trace = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            trace.append(
+                (float(item["t"]), {int(address): int(value) for address, value in item["registers"].items()})
+            )
+    trace.sort(key=lambda entry: entry[0])
+    return trace
+
+
+async def replay(device: SimulatedDevice, trace: list, speed: float = 1.0, loop: bool = False):
+    """按时间轴回放寄存器轨迹，speed > 1 时加速回放"""
+    while True:
+        elapsed = 0.0
+        for t, values in trace:
+            if t > elapsed:
+                await asyncio.sleep((t - elapsed) / speed)
+                elapsed = t
+            for address, value in values.items():
+                device.write(address, [value])
+        if not loop or not trace:
+            return
+
+
+async def _run(args):
+    simulator = ModbusSimulator(
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop,
+        serialize=args.serialize,
+        seed=args.seed,
+    )
+    await simulator.start(args.host, args.port)
+    if args.trace:
+        trace = load_trace(args.trace)
+        logger.info(f"Replaying {len(trace)} trace entries from {args.trace}")
+        asyncio.create_task(replay(simulator.device, trace, args.speed, args.loop))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HVAC Modbus TCP 设备模拟器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的固定延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="附加的随机延迟上限（秒）")
+    parser.add_argument("--drop", type=float, default=0.0, help="丢弃响应的比例（0-1）")
+    parser.add_argument("--serialize", action="store_true", help="所有连接的请求串行处理（慢速网关）")
+    parser.add_argument("--seed", type=int, default=None, help="随机数种子")
+    parser.add_argument("--trace", help="回放的寄存器轨迹文件（JSON Lines）")
+    parser.add_argument("--speed", type=float, default=1.0, help="轨迹回放速度倍数")
+    parser.add_argument("--loop", action="store_true", help="循环回放轨迹")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
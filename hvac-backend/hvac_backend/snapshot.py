@@ -0,0 +1,320 @@
+"""
+寄存器数据快照
+轮询线程构建完整快照后整体替换，读取方始终拿到同一版本的一致数据
+
+原始值按地址偏移存放在 array('H') 中，缩放值与 JSON 视图在首次访问时才生成，
+各接口视图按快照版本序列化一次后直接复用字节
+"""
+import json
+import secrets
+import time
+from array import array
+from dataclasses import dataclass, field
+from functools import cached_property
+from operator import mul
+from typing import Iterable, Optional
+
+from hvac_backend import derived
+from hvac_backend import registers as reg
+
+
+# 进程启动标识，保证重启后版本号从头计数时 ETag 不会与旧响应冲突
+_BOOT_ID = secrets.token_hex(4)
+
+# 环境/系统视图中寄存器名称到字段名的映射
+ENVIRONMENT_FIELDS = {
+    "室内 PM2.5": "pm25",
+    "室内 CO2": "co2",
+    "室外温度": "outdoor_temp",
+    "室外湿度": "outdoor_humidity",
+}
+SYSTEM_FIELDS = {
+    "系统总电源": "power",
+    "在家/离家模式": "home_mode",
+    "运行模式": "run_mode",
+    "新风风速设定": "fan_speed",
+}
+
+
+def _empty_raw() -> array:
+    return array("H", bytes(2 * reg.ADDRESS_SPAN))
+
+
+def _empty_present() -> bytes:
+    return bytes(reg.ADDRESS_SPAN)
+
+
+def _register_entry(address: int, raw_value: Optional[int], decoded: int) -> dict:
+    """构建单个寄存器的数据项"""
+    info = reg.REGISTERS[address]
+    entry = {
+        "name": info["name"],
+        "address": address,
+        "raw": raw_value,
+        "value": decoded * reg.SCALING[address],
+        "unit": info["unit"],
+        "rw": info["rw"],
+        "desc": info["desc"],
+        "group": info["group"],
+    }
+    bits = reg.BITFIELDS.get(address)
+    if bits:
+        entry["bits"] = reg.decode_bits(raw_value, bits) if raw_value is not None else None
+    return entry
+
+
+@dataclass(frozen=True)
+class RegisterSnapshot:
+    """某一轮询周期的不可变寄存器快照"""
+
+    version: int
+    timestamp: float
+    # 按 address - BASE_ADDRESS 索引的原始值，以及是否成功读取的标记
+    raw: array = field(default_factory=_empty_raw)
+    present: bytes = field(default_factory=_empty_present)
+    # 从磁盘加载、尚未被完整轮询确认的快照
+    stale: bool = False
+    # 视图名 -> 序列化后的 JSON 字节
+    _json_cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_blocks(
+        cls, blocks: Iterable[tuple], version: int, timestamp: Optional[float] = None
+    ) -> "RegisterSnapshot":
+        """根据批量读取结果 [(起始地址, [值, ...]), ...] 构建快照"""
+        raw = _empty_raw()
+        present = bytearray(reg.ADDRESS_SPAN)
+        for start, values in blocks:
+            begin = max(start - reg.BASE_ADDRESS, 0)
+            end = min(start - reg.BASE_ADDRESS + len(values), reg.ADDRESS_SPAN)
+            if begin >= end:
+                continue
+            skip = begin - (start - reg.BASE_ADDRESS)
+            raw[begin:end] = array("H", values[skip:skip + end - begin])
+            present[begin:end] = b"\x01" * (end - begin)
+        return cls(
+            version=version,
+            timestamp=time.time() if timestamp is None else timestamp,
+            raw=raw,
+            present=bytes(present),
+        )
+
+    def with_values(self, values: dict, version: int) -> "RegisterSnapshot":
+        """返回更新了部分寄存器值的新快照"""
+        raw = array("H", self.raw)
+        present = bytearray(self.present)
+        for address, value in values.items():
+            offset = address - reg.BASE_ADDRESS
+            if 0 <= offset < reg.ADDRESS_SPAN:
+                raw[offset] = value & 0xFFFF
+                present[offset] = 1
+        return RegisterSnapshot(
+            version=version, timestamp=time.time(), raw=raw, present=bytes(present), stale=self.stale
+        )
+
+    def fill_from(self, fallback: "RegisterSnapshot") -> "RegisterSnapshot":
+        """用 fallback 补齐本快照未读到的寄存器，结果标记为过期"""
+        raw = array("H", self.raw)
+        present = bytearray(self.present)
+        for offset in range(reg.ADDRESS_SPAN):
+            if not present[offset] and fallback.present[offset]:
+                raw[offset] = fallback.raw[offset]
+                present[offset] = 1
+        return RegisterSnapshot(
+            version=self.version, timestamp=self.timestamp, raw=raw, present=bytes(present), stale=True
+        )
+
+    def raw_value(self, address: int) -> Optional[int]:
+        """获取寄存器原始值，未读到时返回 None"""
+        offset = address - reg.BASE_ADDRESS
+        if 0 <= offset < reg.ADDRESS_SPAN and self.present[offset]:
+            return self.raw[offset]
+        return None
+
+    def _decoded(self, offset: int) -> Optional[int]:
+        return reg.decode_at(self.raw, self.present, offset)
+
+    def value(self, address: int) -> Optional[float]:
+        """获取寄存器缩放后的值，未读到时返回 None"""
+        offset = address - reg.BASE_ADDRESS
+        if 0 <= offset < reg.ADDRESS_SPAN:
+            decoded = self._decoded(offset)
+            if decoded is not None:
+                return decoded * reg.SCALING.get(address, 1)
+        return None
+
+    @cached_property
+    def valid(self) -> bytes:
+        """可解码标记：present 中去掉第二个字未读到的 32 位寄存器"""
+        present = self.present
+        if not any(present[offset] and not present[offset + 1] for offset in reg.WIDE):
+            return present
+        valid = bytearray(present)
+        for offset in reg.WIDE:
+            if not present[offset + 1]:
+                valid[offset] = 0
+        return bytes(valid)
+
+    @cached_property
+    def scaled(self) -> array:
+        """所有偏移的缩放值（按偏移索引，未定义地址按缩放因子 1 处理）"""
+        raw = self.raw
+        decoded = array("d", raw)
+        # 只有 int16 / 32 位寄存器需要修正，其余偏移的原始值即解码值
+        for offset in reg.SIGNED_OFFSETS:
+            if raw[offset] & 0x8000:
+                decoded[offset] -= 0x10000
+        present = self.present
+        for offset in reg.WIDE_OFFSETS:
+            # 第二个字未读到时无法组合，按未读到处理（见 valid）
+            decoded[offset] = reg.decode_at(raw, present, offset) or 0
+        return array("d", map(mul, decoded, reg.SCALES))
+
+    @cached_property
+    def registers(self) -> dict:
+        """地址 -> 寄存器数据项"""
+        registers = {}
+        for offset in reg.OFFSETS:
+            address = reg.BASE_ADDRESS + offset
+            decoded = self._decoded(offset)
+            raw_value = self.raw[offset] if decoded is not None else None
+            registers[address] = _register_entry(address, raw_value, decoded or 0)
+        return registers
+
+    @cached_property
+    def grouped(self) -> dict:
+        """分组 -> 地址 -> 寄存器数据项"""
+        grouped = {}
+        registers = self.registers
+        for offset in reg.OFFSETS:
+            group = reg.GROUPS[reg.GROUP_IDS[offset]]
+            address = reg.BASE_ADDRESS + offset
+            grouped.setdefault(group, {})[address] = registers[address]
+        return grouped
+
+    @cached_property
+    def grouped_view(self) -> dict:
+        """分组 -> {分组名称, 寄存器}"""
+        return {
+            group: {"name": reg.GROUP_NAMES.get(group, group), "registers": data}
+            for group, data in self.grouped.items()
+        }
+
+    @cached_property
+    def environment(self) -> dict:
+        """环境数据（兼容旧接口，仅返回数值）"""
+        result = {}
+        for data in self.grouped.get("environment", {}).values():
+            key = ENVIRONMENT_FIELDS.get(data["name"])
+            if key:
+                result[key] = data["value"]
+        return result
+
+    @cached_property
+    def system(self) -> dict:
+        """系统数据（返回完整寄存器信息）"""
+        result = {}
+        for data in self.grouped.get("system", {}).values():
+            key = SYSTEM_FIELDS.get(data["name"])
+            if key:
+                result[key] = data
+        return result
+
+    @cached_property
+    def rooms(self) -> dict:
+        """房间 ID -> 房间寄存器信息"""
+        result = {}
+        for room_id, room_info in reg.ROOMS.items():
+            group_data = self.grouped.get(room_id, {})
+            result[room_id] = {
+                "temp": group_data.get(room_info["temp"], {}),
+                "humidity": group_data.get(room_info["humidity"], {}),
+                "dew_point": group_data.get(room_info["dew_point"], {}),
+                "setpoint": group_data.get(room_info["setpoint"], {}),
+            }
+        return result
+
+    @cached_property
+    def derived(self) -> dict:
+        """派生指标（露点裕量、供回水温差、舒适度）"""
+        return derived.compute(self.scaled, self.valid)
+
+    @cached_property
+    def room_list(self) -> list:
+        """房间列表（/api/rooms 返回格式）"""
+        rooms = self.rooms
+        derived_rooms = self.derived["rooms"]
+        return [
+            {"id": room_id, "name": room_info["name"], **rooms[room_id], "derived": derived_rooms[room_id]}
+            for room_id, room_info in reg.ROOMS.items()
+        ]
+
+    def etag(self, view: str) -> str:
+        """视图的强 ETag"""
+        return f'"{_BOOT_ID}-{self.version}-{view}"'
+
+    def json_bytes(self, view: str) -> bytes:
+        """获取视图序列化后的 JSON，每个快照每个视图只序列化一次"""
+        body = self._json_cache.get(view)
+        if body is None:
+            body = json.dumps(
+                getattr(self, VIEWS[view]), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+            self._json_cache[view] = body
+        return body
+
+    def changed_addresses(self, previous: "RegisterSnapshot") -> list:
+        """与上一快照相比原始值（或读取状态）发生变化的寄存器地址（32 位寄存器比较两个字）"""
+        raw, present = self.raw, self.present
+        prev_raw, prev_present = previous.raw, previous.present
+        changed = [
+            reg.BASE_ADDRESS + offset
+            for offset in reg.OFFSETS
+            if raw[offset] != prev_raw[offset] or present[offset] != prev_present[offset]
+        ]
+        for offset in reg.WIDE:
+            second = offset + 1
+            if raw[second] != prev_raw[second] or present[second] != prev_present[second]:
+                changed.append(reg.BASE_ADDRESS + offset)
+        return sorted(set(changed)) if reg.WIDE else changed
+
+    def stream_payload(self, connected: bool, previous: Optional["RegisterSnapshot"] = None) -> Optional[bytes]:
+        """推送流消息：无 previous 时为全量快照，否则只含变化的寄存器，无变化时返回 None"""
+        key = ("stream", connected, previous.version if previous is not None else None)
+        if key not in self._json_cache:
+            if previous is None:
+                registers = self.json_bytes("registers")
+            else:
+                changed = self.changed_addresses(previous)
+                registers = json.dumps(
+                    {address: self.registers[address] for address in changed},
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                ).encode("utf-8") if changed else None
+            body = None
+            if registers is not None:
+                header = json.dumps(
+                    {
+                        "version": self.version,
+                        "timestamp": self.timestamp,
+                        "stale": self.stale,
+                        "connected": connected,
+                    },
+                    separators=(",", ":"),
+                ).encode("utf-8")
+                body = header[:-1] + b',"registers":' + registers + b"}"
+            self._json_cache[key] = body
+        return self._json_cache[key]
+
+
+# 可缓存的接口视图：视图名 -> 快照属性
+VIEWS = {
+    "registers": "registers",
+    "grouped": "grouped_view",
+    "environment": "environment",
+    "system": "system",
+    "rooms": "room_list",
+    "derived": "derived",
+}
+
+EMPTY_SNAPSHOT = RegisterSnapshot(version=0, timestamp=0.0)
@@ -0,0 +1,101 @@
+"""
+寄存器快照持久化
+最近一次轮询的原始值以紧凑二进制格式保存在磁盘上，重启后立即加载为过期快照，
+首轮完整轮询前接口和推送流不再为空
+
+文件格式（HVS1）的编解码由集成的 schema.py 实现，与集成共用同一套兼容规则：
+地址窗口不同的文件按地址还原，窗口以外的地址丢弃
+"""
+import asyncio
+import logging
+import os
+import time
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from hvac_backend import registers as reg
+from hvac_backend.snapshot import RegisterSnapshot
+
+logger = logging.getLogger(__name__)
+
+_HEADER_SIZE = reg.codec.SNAPSHOT_HEADER.size
+
+
+def encode(snapshot: RegisterSnapshot) -> bytes:
+    """将快照编码为文件内容"""
+    header = reg.codec.encode_snapshot_header(snapshot.timestamp, reg.BASE_ADDRESS, reg.ADDRESS_SPAN)
+    return header + reg.codec.encode_snapshot_body(snapshot.raw, snapshot.present)
+
+
+def decode(data: bytes, version: int) -> Optional[RegisterSnapshot]:
+    """解码文件内容为过期快照，文件损坏或没有本寄存器表内的地址时返回 None"""
+    decoded = reg.codec.decode_snapshot(data)
+    if decoded is None:
+        return None
+    timestamp, values = decoded
+    raw = array("H", bytes(2 * reg.ADDRESS_SPAN))
+    present = bytearray(reg.ADDRESS_SPAN)
+    for address, value in values.items():
+        offset = address - reg.BASE_ADDRESS
+        if 0 <= offset < reg.ADDRESS_SPAN:
+            raw[offset] = value
+            present[offset] = 1
+    if not any(present):
+        return None
+    return RegisterSnapshot(version=version, timestamp=timestamp, raw=raw, present=bytes(present), stale=True)
+
+
+class SnapshotCache:
+    """磁盘上的快照文件：原始值变化时写入，同一内容不会重复写盘"""
+
+    def __init__(self, config: dict):
+        self.path = Path(config.get("path", "snapshot.bin"))
+        # 两次写盘的最小间隔（秒），轮询值持续变化时限制写入频率
+        self.save_interval = config.get("save_interval", 30)
+        # 上次写入的原始值与读取标记，用于跳过无变化的写入
+        self._saved: Optional[bytes] = None
+        self._saved_at = 0.0
+
+    def load(self, version: int) -> Optional[RegisterSnapshot]:
+        """读取快照文件，不存在或无法解析时返回 None"""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading snapshot cache {self.path}: {e}")
+            return None
+        snapshot = decode(data, version)
+        if snapshot is None:
+            logger.info(f"Ignoring snapshot cache {self.path}: unreadable or no known registers")
+            return None
+        self._saved = encode(snapshot)[_HEADER_SIZE:]
+        logger.info(f"Loaded snapshot from {time.time() - snapshot.timestamp:.0f}s ago")
+        return snapshot
+
+    def _write(self, data: bytes):
+        """写入临时文件后替换，中途断电不会留下半个文件"""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self.path)
+
+    async def save(self, snapshot: RegisterSnapshot, force: bool = False) -> bool:
+        """快照内容变化且距上次写入超过 save_interval 时写盘，返回是否写入"""
+        # 过期快照和未读到任何寄存器的快照不会覆盖已有文件
+        if snapshot.stale or not any(snapshot.present):
+            return False
+        if not force and time.monotonic() - self._saved_at < self.save_interval:
+            return False
+        data = encode(snapshot)
+        body = data[_HEADER_SIZE:]
+        if body == self._saved:
+            return False
+        try:
+            await asyncio.to_thread(self._write, data)
+        except OSError as e:
+            logger.error(f"Error writing snapshot cache {self.path}: {e}")
+            return False
+        self._saved = body
+        self._saved_at = time.monotonic()
+        return True
@@ -11,9 +11,10 @@ class Room:
 
 
 class AppState:
-    def __init__(self, config: dict, modbus_client):
+    def __init__(self, config: dict, modbus_client, history=None):
         self.config = config
         self.modbus_client = modbus_client
+        self.history = history
         
         # Room configurations
         self.rooms = [
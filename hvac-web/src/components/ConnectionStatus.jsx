@@ -1,9 +1,9 @@
-import { usePolling } from '../hooks/usePolling';
-import { getStatus } from '../services/api';
+import { useHvacData } from '../contexts/HvacDataContext';
 
 export function ConnectionStatus() {
-  const { data, loading } = usePolling(getStatus, 5000);
-  const isConnected = data?.connected;
+  const { connection } = useHvacData();
+  const loading = connection.lastUpdate === null;
+  const isConnected = connection.status === 'connected';
   
   return (
     <div className="connection-status">
@@ -1,8 +1,18 @@
-import { createContext, useContext, useState, useEffect, useCallback } from 'react';
-import { getStatus, getGroupedRegisters, getSystem, getRooms } from '../services/api';
+import { createContext, useContext, useState, useEffect, useCallback, useRef } from 'react';
+import { getStatus, getAllRegisters, getRooms, openRegisterStream } from '../services/api';
 
 const HvacDataContext = createContext(null);
 
+// 系统控制寄存器地址
+const SYSTEM_ADDRESSES = {
+  power: 1033,
+  home_mode: 1034,
+  run_mode: 1041,
+  fan_speed: 1047
+};
+
+const ROOM_FIELDS = ['temp', 'humidity', 'dew_point', 'setpoint'];
+
 export function HvacDataProvider({ children }) {
   const [connection, setConnection] = useState({ status: 'disconnected', lastUpdate: null });
   const [environment, setEnvironment] = useState(null);
@@ -10,83 +20,114 @@ export function HvacDataProvider({ children }) {
   const [york, setYork] = useState(null);
   const [rooms, setRooms] = useState([]);
   const [freshAir, setFreshAir] = useState(null);
-  const [isPolling, setIsPolling] = useState(true);
+  const [isStreaming, setIsStreaming] = useState(true);
+
+  // 地址 -> 寄存器数据，由推送流增量更新
+  const registersRef = useRef({});
+  // 房间结构（各字段对应的寄存器地址）
+  const roomLayoutRef = useRef([]);
+
+  // 根据寄存器表派生各区域数据（保留完整对象）
+  const applyRegisters = useCallback(() => {
+    const regs = registersRef.current;
+
+    setEnvironment({
+      pm25: regs[1024],
+      co2: regs[1026],
+      outdoor_temp: regs[1027],
+      outdoor_humidity: regs[1028]
+    });
+
+    setYork({
+      supplyTemp: regs[1030],
+      returnTemp: regs[1029],
+      heatingSetpoint: regs[1062],
+      coolingSetpoint: regs[1066]
+    });
+
+    const sys = {};
+    Object.entries(SYSTEM_ADDRESSES).forEach(([key, address]) => {
+      if (regs[address]) sys[key] = regs[address];
+    });
+    setSystem(sys);
+
+    setFreshAir({
+      compressorFreq: regs[1161],
+      supplyTemp: regs[1164],
+      returnTemp: regs[1165],
+      statusCode: regs[1049]?.value,
+      humidifier: regs[1168]?.value,
+      fanSpeed: sys.fan_speed
+    });
+
+    setRooms(roomLayoutRef.current.map(room => {
+      const updated = { ...room };
+      ROOM_FIELDS.forEach(field => {
+        const address = room[field]?.address;
+        if (address !== undefined && regs[address]) updated[field] = regs[address];
+      });
+      return updated;
+    }));
+  }, []);
 
-  // 获取所有数据
+  // 全量获取所有数据（推送流不可用或写入后主动刷新时使用）
   const fetchAllData = useCallback(async () => {
     try {
-      // 获取连接状态
-      const statusRes = await getStatus();
+      const [statusRes, registersRes, roomsRes] = await Promise.all([
+        getStatus(),
+        getAllRegisters(),
+        getRooms()
+      ]);
       setConnection({
         status: statusRes.data.connected ? 'connected' : 'disconnected',
         lastUpdate: new Date()
       });
-
-      if (statusRes.data.connected) {
-        // 并行获取分组数据、系统、房间数据
-        const [groupedRes, sysRes, roomsRes] = await Promise.all([
-          getGroupedRegisters(),
-          getSystem(),
-          getRooms()
-        ]);
-
-        const grouped = groupedRes.data;
-
-        // 提取环境监测数据（保留完整对象）
-        const envGroup = grouped.environment?.registers || {};
-        setEnvironment({
-          pm25: envGroup[1024],
-          co2: envGroup[1026],
-          outdoor_temp: envGroup[1027],
-          outdoor_humidity: envGroup[1028]
-        });
-
-        // 提取约克主机数据（保留完整对象）
-        const yorkGroup = grouped.york?.registers || {};
-        setYork({
-          supplyTemp: yorkGroup[1029],
-          returnTemp: yorkGroup[1030],
-          heatingSetpoint: yorkGroup[1062],
-          coolingSetpoint: yorkGroup[1066]
-        });
-
-        // 提取新风系统数据（保留完整对象）
-        const freshAirGroup = grouped.fresh_air?.registers || {};
-        setFreshAir({
-          compressorFreq: freshAirGroup[1161],
-          supplyTemp: freshAirGroup[1164],
-          returnTemp: freshAirGroup[1165],
-          statusCode: freshAirGroup[1049]?.value,
-          humidifier: freshAirGroup[1168]?.value,
-          fanSpeed: sysRes.data.fan_speed
-        });
-
-        setSystem(sysRes.data);
-        setRooms(roomsRes.data);
-      }
+      registersRef.current = registersRes.data;
+      roomLayoutRef.current = roomsRes.data;
+      applyRegisters();
     } catch (error) {
       console.error('Failed to fetch data:', error);
       setConnection({ status: 'error', lastUpdate: new Date() });
     }
-  }, []);
+  }, [applyRegisters]);
 
   // 初始加载
   useEffect(() => {
     fetchAllData();
   }, [fetchAllData]);
 
-  // 轮询逻辑
+  // 订阅寄存器推送流：连接时收到全量快照，之后只收到变化的寄存器
   useEffect(() => {
-    if (!isPolling) return;
+    if (!isStreaming) return;
+
+    const source = openRegisterStream();
+
+    const handleMessage = (full) => (event) => {
+      const message = JSON.parse(event.data);
+      registersRef.current = full
+        ? message.registers
+        : { ...registersRef.current, ...message.registers };
+      setConnection({
+        status: message.connected ? 'connected' : 'disconnected',
+        lastUpdate: new Date()
+      });
+      applyRegisters();
+    };
+
+    source.addEventListener('snapshot', handleMessage(true));
+    source.addEventListener('delta', handleMessage(false));
+    source.onerror = () => {
+      // EventSource 会自动重连，重连后服务端重新发送全量快照
+      setConnection(prev => ({ ...prev, status: 'error' }));
+    };
 
-    const interval = setInterval(fetchAllData, 5000);
-    return () => clearInterval(interval);
-  }, [isPolling, fetchAllData]);
+    return () => source.close();
+  }, [isStreaming, applyRegisters]);
 
-  // 窗口失焦时暂停轮询
+  // 窗口失焦时断开推送流
   useEffect(() => {
     const handleVisibilityChange = () => {
-      setIsPolling(!document.hidden);
+      setIsStreaming(!document.hidden);
     };
 
     document.addEventListener('visibilitychange', handleVisibilityChange);
@@ -18,6 +18,9 @@ export const updateSystem = (control) => api.put('/system', control);
 export const getRooms = () => api.get('/rooms');
 export const updateRoomSetpoint = (roomId, temp) => api.put('/rooms/' + roomId, { temp });
 
+// 寄存器推送流（SSE）：连接时推送全量快照（snapshot），之后推送变化的寄存器（delta）
+export const openRegisterStream = () => new EventSource(api.defaults.baseURL + '/stream');
+
 // 新风控制
 export const updateFreshAirSpeed = (speed) => writeRegister(1047, speed);
 export const updateHumidifier = (enabled) => writeRegister(1168, enabled ? 1 : 0);
@@ -0,0 +1,116 @@
+"""
+测试后端与 Home Assistant 集成的断路器：状态转换与带抖动的指数退避
+"""
+import pytest
+
+from hvac_backend import breaker as backend_breaker
+from hvac_modbus import breaker as ha_breaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=[backend_breaker, ha_breaker], ids=["backend", "integration"])
+def module(request):
+    return request.param
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _breaker(module, clock, **kwargs):
+    kwargs.setdefault("jitter", 0)
+    return module.CircuitBreaker(base_delay=1.0, max_delay=8.0, clock=clock, **kwargs)
+
+
+def test_opens_after_threshold(module, clock):
+    breaker = _breaker(module, clock, failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == module.CLOSED
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == module.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in == pytest.approx(1.0)
+
+
+def test_success_resets_failure_count(module, clock):
+    breaker = _breaker(module, clock, failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == module.CLOSED
+
+
+def test_half_open_allows_single_trial(module, clock):
+    breaker = _breaker(module, clock)
+    breaker.trip()
+    clock.now += 0.5
+    assert breaker.state == module.OPEN
+    clock.now += 0.5
+    assert breaker.state == module.HALF_OPEN
+    assert breaker.retry_in == 0
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_half_open_success_closes(module, clock):
+    breaker = _breaker(module, clock)
+    breaker.trip()
+    clock.now += 1
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == module.CLOSED
+    # 退避已重置，下次打开从 base_delay 开始
+    breaker.trip()
+    assert breaker.retry_in == pytest.approx(1.0)
+
+
+def test_half_open_failure_reopens_with_doubled_delay(module, clock):
+    breaker = _breaker(module, clock)
+    breaker.trip()
+    clock.now += 1
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == module.OPEN
+    assert breaker.retry_in == pytest.approx(2.0)
+
+
+def test_backoff_is_capped(module, clock):
+    breaker = _breaker(module, clock)
+    delays = []
+    for _ in range(6):
+        breaker.trip()
+        delays.append(breaker.retry_in)
+        clock.now += breaker.retry_in
+    assert delays == pytest.approx([1, 2, 4, 8, 8, 8])
+
+
+def test_jitter_stays_within_bounds(module, clock, monkeypatch):
+    breaker = _breaker(module, clock, jitter=0.2)
+    for bound in (-0.2, 0.2):
+        monkeypatch.setattr(module.random, "uniform", lambda low, high, bound=bound: bound)
+        breaker.reset()
+        breaker.trip()
+        assert breaker.retry_in == pytest.approx(1 + bound)
+    monkeypatch.undo()
+    for _ in range(50):
+        breaker.reset()
+        breaker.trip()
+        assert 0.8 <= breaker.retry_in <= 1.2
+
+
+def test_reset_closes(module, clock):
+    breaker = _breaker(module, clock)
+    breaker.trip()
+    breaker.reset()
+    assert breaker.state == module.CLOSED
+    assert breaker.allow()
@@ -0,0 +1,80 @@
+"""
+测试历史数据的分钟/小时汇总、加权合并、过期清理和查询
+"""
+import asyncio
+
+import pytest
+
+from hvac_backend.history import HistoryStore
+
+# 某个整点（小时桶与分钟桶的起点）
+T0 = 1_700_002_800
+
+
+@pytest.fixture
+def store():
+    store = HistoryStore({"path": ":memory:"})
+    yield store
+    store._conn.close()
+
+
+def _rows(store, table):
+    return store._conn.execute(
+        f"SELECT address, ts, min, mean, max, count FROM {table} ORDER BY address, ts"
+    ).fetchall()
+
+
+def test_minute_rollup_covers_only_finished_buckets(store):
+    store._flush(
+        [(1027, T0, 1.0), (1027, T0 + 20, 3.0), (1027, T0 + 40, 5.0), (1027, T0 + 61, 7.0)],
+        now=T0 + 90,
+    )
+    # 第二个分钟桶尚未结束，不汇总
+    assert _rows(store, "rollup_1m") == [(1027, T0, 1.0, 3.0, 5.0, 3)]
+
+
+def test_rollup_is_incremental(store):
+    store._flush([(1027, T0, 1.0), (1027, T0 + 61, 7.0)], now=T0 + 90)
+    store._flush([(1027, T0 + 62, 9.0)], now=T0 + 130)
+    assert _rows(store, "rollup_1m") == [
+        (1027, T0, 1.0, 1.0, 1.0, 1),
+        (1027, T0 + 60, 7.0, 8.0, 9.0, 2),
+    ]
+
+
+def test_hour_rollup_weights_minute_means_by_count(store):
+    # 第一分钟 3 个采样均值 2，第二分钟 1 个采样均值 10：小时均值 (3*2 + 10) / 4 = 4
+    store._flush(
+        [(1027, T0, 1.0), (1027, T0 + 1, 2.0), (1027, T0 + 2, 3.0), (1027, T0 + 60, 10.0)],
+        now=T0 + 3600,
+    )
+    assert _rows(store, "rollup_1h") == [(1027, T0, 1.0, 4.0, 10.0, 4)]
+
+
+def test_retention_deletes_expired_rows(store):
+    store.retention = {"raw": 3600, "1m": 2 * 3600, "1h": 4 * 3600}
+    store._flush([(1027, T0, 1.0), (1027, T0 + 3 * 3600, 2.0)], now=T0 + 3 * 3600 + 1800)
+    assert store._conn.execute("SELECT ts FROM samples").fetchall() == [(T0 + 3 * 3600,)]
+    assert [row[1] for row in _rows(store, "rollup_1m")] == [T0 + 3600 * 3]
+    assert [row[1] for row in _rows(store, "rollup_1h")] == [T0]
+
+
+def test_raw_query_merges_buffer_without_flushing(store):
+    store._flush([(1027, T0, 1.0)], now=T0 + 1)
+    store._buffer = [(1027, T0 + 3, 2.0), (1028, T0 + 3, 50.0), (1027, T0 + 9999, 3.0)]
+    result = asyncio.run(store.query([1027], T0, T0 + 10, "raw"))
+    assert result["series"][1027] == {"t": [T0, T0 + 3], "value": [1.0, 2.0]}
+    # 查询不写库也不清空缓冲
+    assert store._conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0] == 1
+    assert len(store._buffer) == 3
+
+
+def test_rollup_query(store):
+    store._flush([(1027, T0, 1.0), (1027, T0 + 30, 3.0)], now=T0 + 60)
+    result = asyncio.run(store.query([1027], T0, T0 + 60, "1m"))
+    assert result["series"][1027] == {"t": [T0], "min": [1.0], "mean": [2.0], "max": [3.0]}
+
+
+def test_unsupported_step(store):
+    with pytest.raises(ValueError):
+        asyncio.run(store.query([1027], T0, T0 + 60, "5m"))
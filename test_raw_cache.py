@@ -0,0 +1,128 @@
+"""
+测试任意地址读穿缓存：并发合并读取、TTL 过期、LRU 淘汰与读取失败
+"""
+import asyncio
+
+from hvac_backend import raw_cache
+from hvac_backend.raw_cache import RawRegisterCache
+
+
+class FakeBus:
+    """记录每次读取的假总线，值为地址本身；release 之前读取保持挂起"""
+
+    def __init__(self, fail: bool = False):
+        self.reads = []
+        self.fail = fail
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def read(self, start: int, count: int):
+        self.reads.append((start, count))
+        await self.release.wait()
+        if self.fail:
+            return None
+        return list(range(start, start + count))
+
+
+def test_overlapping_concurrent_reads_share_one_bus_read():
+    async def scenario():
+        bus = FakeBus()
+        bus.release.clear()
+        cache = RawRegisterCache(bus.read)
+        first = asyncio.create_task(cache.read(1000, 10))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.read(1002, 4))
+        await asyncio.sleep(0)
+        bus.release.set()
+        return bus, await first, await second
+
+    bus, first, second = asyncio.run(scenario())
+    assert bus.reads == [(1000, 10)]
+    assert first == list(range(1000, 1010))
+    assert second == list(range(1002, 1006))
+
+
+def test_partial_overlap_reads_only_missing_addresses():
+    async def scenario():
+        bus = FakeBus()
+        cache = RawRegisterCache(bus.read)
+        await cache.read(1000, 4)
+        return bus, await cache.read(1002, 4)
+
+    bus, values = asyncio.run(scenario())
+    assert bus.reads == [(1000, 4), (1004, 2)]
+    assert values == [1002, 1003, 1004, 1005]
+
+
+def test_expired_entries_are_read_again(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(raw_cache.time, "monotonic", lambda: now[0])
+
+    async def scenario():
+        bus = FakeBus()
+        cache = RawRegisterCache(bus.read, ttl=2.0)
+        await cache.read(1000, 2)
+        now[0] += 1.5
+        await cache.read(1000, 2)
+        now[0] += 1.0
+        await cache.read(1000, 2)
+        return bus
+
+    assert asyncio.run(scenario()).reads == [(1000, 2), (1000, 2)]
+
+
+def test_least_recently_used_entry_is_evicted():
+    async def scenario():
+        bus = FakeBus()
+        cache = RawRegisterCache(bus.read, max_entries=2)
+        await cache.read(1000, 1)
+        await cache.read(1001, 1)
+        # 访问 1000 后，1001 成为最久未使用的条目
+        await cache.read(1000, 1)
+        await cache.read(1002, 1)
+        await cache.read(1000, 1)
+        await cache.read(1001, 1)
+        return bus
+
+    assert asyncio.run(scenario()).reads == [(1000, 1), (1001, 1), (1002, 1), (1001, 1)]
+
+
+def test_failed_read_returns_none_for_every_waiter():
+    async def scenario():
+        bus = FakeBus(fail=True)
+        bus.release.clear()
+        cache = RawRegisterCache(bus.read)
+        first = asyncio.create_task(cache.read(1000, 4))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.read(1001, 2))
+        await asyncio.sleep(0)
+        bus.release.set()
+        results = await first, await second
+        # 失败的读取不登记为进行中，下次请求重新读取
+        bus.fail = False
+        return bus, results, await cache.read(1000, 4)
+
+    bus, results, retry = asyncio.run(scenario())
+    assert results == (None, None)
+    assert retry == [1000, 1001, 1002, 1003]
+    assert bus.reads == [(1000, 4), (1000, 4)]
+
+
+def test_read_exception_returns_none():
+    async def broken(start, count):
+        raise ConnectionError("bus down")
+
+    assert asyncio.run(RawRegisterCache(broken).read(1000, 2)) is None
+
+
+def test_store_after_write_serves_new_values():
+    async def scenario():
+        bus = FakeBus()
+        cache = RawRegisterCache(bus.read)
+        await cache.read(1000, 3)
+        cache.store(1001, [7])
+        return bus, await cache.read(1000, 3)
+
+    bus, values = asyncio.run(scenario())
+    assert values == [1000, 7, 1002]
+    assert bus.reads == [(1000, 3)]
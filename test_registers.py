@@ -0,0 +1,161 @@
+"""
+测试后端寄存器表的 32 位寄存器解码与读取分块，以及集成读取块对寄存器表的覆盖
+"""
+import asyncio
+import importlib
+import shutil
+from array import array
+
+import pytest
+
+from hvac_backend import registers as reg
+from hvac_backend import snapshot
+from hvac_modbus import registers as ha_reg
+from hvac_modbus.schema import load_schema
+
+WIDE_SCHEMA = """
+groups: {system: 系统}
+rooms: []
+registers:
+  - {address: 1180, group: system, key: a, name: "A"}
+  - {address: 1182, group: system, key: total, type: uint32, word_order: little, name: "累计"}
+  - {address: 1184, group: system, key: b, type: int16, name: "B"}
+"""
+
+
+@pytest.fixture
+def wide_reg(tmp_path, monkeypatch):
+    """使用含 32 位寄存器的临时寄存器表重新加载 registers 模块，结束后恢复"""
+    path = tmp_path / "registers.yaml"
+    path.write_text(WIDE_SCHEMA, encoding="utf-8")
+    monkeypatch.setenv("HVAC_REGISTER_SCHEMA", str(path))
+    yield importlib.reload(reg)
+    monkeypatch.delenv("HVAC_REGISTER_SCHEMA")
+    importlib.reload(reg)
+
+
+def _arrays(wide_reg, values: dict):
+    raw = array("H", bytes(2 * wide_reg.ADDRESS_SPAN))
+    present = bytearray(wide_reg.ADDRESS_SPAN)
+    for address, value in values.items():
+        raw[address - wide_reg.BASE_ADDRESS] = value
+        present[address - wide_reg.BASE_ADDRESS] = 1
+    return raw, present
+
+
+def test_wide_value_needs_both_words(wide_reg):
+    offset = 1182 - wide_reg.BASE_ADDRESS
+    raw, present = _arrays(wide_reg, {1182: 2, 1183: 1})
+    assert wide_reg.decode_at(raw, present, offset) == 0x10002
+    raw, present = _arrays(wide_reg, {1182: 2})
+    assert wide_reg.decode_at(raw, present, offset) is None
+
+
+def test_int16_decoding(wide_reg):
+    raw, present = _arrays(wide_reg, {1184: 0xFFF6})
+    assert wide_reg.decode_at(raw, present, 1184 - wide_reg.BASE_ADDRESS) == -10
+
+
+def test_read_blocks_keep_wide_pair_together(wide_reg):
+    assert wide_reg.READ_ADDRESSES == (1180, 1182, 1183, 1184)
+    # 块长度上限落在 32 位寄存器中间时，整对移到下一块
+    assert wide_reg.build_read_blocks(wide_reg.READ_ADDRESSES, max_gap=10, max_count=3) == [
+        (1180, 1),
+        (1182, 3),
+    ]
+    assert wide_reg.build_read_blocks(wide_reg.READ_ADDRESSES, max_gap=10, max_count=4) == [
+        (1180, 4),
+        (1184, 1),
+    ]
+    assert wide_reg.build_read_blocks(wide_reg.READ_ADDRESSES, max_gap=10) == [(1180, 5)]
+
+
+def test_read_blocks_without_pairs():
+    assert reg.build_read_blocks([1, 2, 3, 10], max_gap=0, max_count=2, pairs=()) == [
+        (1, 2),
+        (3, 1),
+        (10, 1),
+    ]
+
+
+def test_snapshot_treats_incomplete_wide_value_as_missing(wide_reg):
+    # snapshot 在调用时读取 registers 的属性，重新加载寄存器表即可
+    partial = snapshot.RegisterSnapshot.from_blocks([(1180, [7, 0, 2])], version=1)
+    assert partial.value(1182) is None
+    assert partial.registers[1182]["raw"] is None
+    assert not partial.valid[1182 - wide_reg.BASE_ADDRESS]
+    full = snapshot.RegisterSnapshot.from_blocks([(1180, [7, 0, 2, 1])], version=2)
+    assert full.value(1182) == 0x10002
+    assert full.scaled[1182 - wide_reg.BASE_ADDRESS] == 0x10002
+    # 只有第二个字变化时也算该寄存器变化
+    changed = snapshot.RegisterSnapshot.from_blocks([(1180, [7, 0, 2, 5])], version=3)
+    assert changed.changed_addresses(full) == [1182]
+
+
+def test_standalone_layout_loads_schema_module_next_to_yaml(tmp_path, monkeypatch):
+    # 单独部署：registers.yaml 与 schema.py 放在同一目录，由 HVAC_REGISTER_SCHEMA 指定
+    shutil.copy(reg.INTEGRATION_DIR / "schema.py", tmp_path / "schema.py")
+    (tmp_path / "registers.yaml").write_text(WIDE_SCHEMA, encoding="utf-8")
+    monkeypatch.setenv("HVAC_REGISTER_SCHEMA", str(tmp_path / "registers.yaml"))
+    try:
+        importlib.reload(reg)
+        assert reg.codec.__file__ == str(tmp_path / "schema.py")
+        assert reg.READ_ADDRESSES == (1180, 1182, 1183, 1184)
+    finally:
+        monkeypatch.delenv("HVAC_REGISTER_SCHEMA")
+        importlib.reload(reg)
+    assert reg.codec.__file__ == str(reg.INTEGRATION_DIR / "schema.py")
+
+
+def test_missing_schema_module_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(reg, "INTEGRATION_DIR", tmp_path / "missing")
+    with pytest.raises(ImportError, match="schema.py not found"):
+        reg._load_codec(tmp_path / "registers.yaml")
+
+
+def test_integration_ranges_cover_schema():
+    assert ha_reg.uncovered_addresses() == []
+    # 去掉新风块后，该组寄存器都不再被读取
+    ranges = [block for block in ha_reg.REGISTER_RANGES if block[0] != 1161]
+    assert 1161 in ha_reg.uncovered_addresses(ranges)
+
+
+def test_integration_ranges_need_both_wide_words(tmp_path, monkeypatch):
+    path = tmp_path / "registers.yaml"
+    path.write_text(WIDE_SCHEMA, encoding="utf-8")
+    monkeypatch.setattr(ha_reg, "SCHEMA", load_schema(path))
+    assert ha_reg.uncovered_addresses([(1180, 5)]) == []
+    # 块在 32 位寄存器的第一个字处结束，第二个字未被读取
+    assert ha_reg.uncovered_addresses([(1180, 3), (1184, 1)]) == [1183]
+
+
+def test_integration_setters_write_schema_addresses():
+    from hvac_modbus.modbus import HVACModbusClient
+
+    client = HVACModbusClient("127.0.0.1")
+    writes = []
+
+    async def queue_write(address, value):
+        writes.append(address)
+        return True
+
+    client.queue_write = queue_write
+
+    async def set_all():
+        await client.set_system_power(True)
+        await client.set_fan_speed(50)
+        await client.set_kitchen_radiant(True)
+        await client.set_humidifier(True)
+        await client.set_cooling_setpoint(18.0)
+
+    asyncio.run(set_all())
+    fields = ha_reg.DATA_FIELDS
+    assert writes == [
+        fields["system"]["power"],
+        fields["system"]["fan_speed"],
+        fields["kitchen"]["radiant"],
+        fields["fresh_air"]["humidifier"],
+        fields["york"]["cooling_setpoint"],
+    ]
+    # 后端按同一寄存器表查找同一地址
+    assert reg.FIELDS["system"]["power"] == fields["system"]["power"]
@@ -0,0 +1,47 @@
+"""
+测试集成从快照恢复的过期值：读取块以外的地址在加载时丢弃，持续失败的读取块中的值不会写回快照
+"""
+import asyncio
+import time
+
+from hvac_modbus import modbus
+from hvac_modbus.modbus import HVACModbusClient
+
+
+def _client(failing: int | None = None) -> HVACModbusClient:
+    """读取值为地址本身的客户端，起始地址为 failing 的读取块总是失败"""
+    client = HVACModbusClient("127.0.0.1")
+
+    async def read_registers(address, count):
+        if address == failing:
+            return None
+        return list(range(address, address + count))
+
+    client.read_registers = read_registers
+    return client
+
+
+def test_restore_drops_addresses_outside_polled_blocks():
+    client = _client()
+    assert 1058 not in modbus.POLLED_ADDRESSES
+    assert client.restore_raw({1024: 5, 1058: 7}, time.time()) == {1024: 5}
+
+    async def poll():
+        for _ in range(30):
+            await client.read_all_data()
+
+    asyncio.run(poll())
+    assert not client.stale
+    assert client.stale_age is None
+
+
+def test_failing_block_keeps_only_its_values_stale():
+    client = _client(failing=1062)
+    client.restore_raw({1024: 5, 1062: 9}, time.time() - 60)
+    data = asyncio.run(client.read_all_data())
+    assert data["stale"] and data["raw"][1062] == 9
+    assert 50 < client.stale_age < 70
+    # 保存快照时只跳过仍未确认的地址
+    confirmed = client.confirmed(data["raw"])
+    assert confirmed[1024] == 1024
+    assert 1062 not in confirmed
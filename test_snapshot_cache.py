@@ -0,0 +1,89 @@
+"""
+测试 HVS1 快照文件格式：后端 snapshot_cache 与集成 snapshot 共用的编解码及损坏文件处理
+"""
+import asyncio
+import struct
+
+from hvac_backend import snapshot_cache
+from hvac_backend.snapshot import RegisterSnapshot
+from hvac_modbus import snapshot as ha_snapshot
+
+VALUES = {1024: 215, 1033: 1, 1041: 0xFFFF, 1168: 42}
+
+
+def _backend_snapshot() -> RegisterSnapshot:
+    blocks = [(address, [value]) for address, value in VALUES.items()]
+    return RegisterSnapshot.from_blocks(blocks, version=1, timestamp=1700000000.5)
+
+
+def _ha_file() -> bytes:
+    return ha_snapshot.encode_snapshot(ha_snapshot.encode_registers(VALUES), 1700000000.5)
+
+
+def test_backend_round_trip():
+    original = _backend_snapshot()
+    loaded = snapshot_cache.decode(snapshot_cache.encode(original), version=7)
+    assert loaded.version == 7 and loaded.stale
+    assert loaded.timestamp == original.timestamp
+    assert loaded.raw == original.raw and loaded.present == original.present
+    assert loaded.raw_value(1041) == 0xFFFF and loaded.raw_value(1025) is None
+
+
+def test_backend_rejects_truncated_and_bad_magic():
+    data = snapshot_cache.encode(_backend_snapshot())
+    assert snapshot_cache.decode(data[:-1], version=1) is None
+    assert snapshot_cache.decode(data[:10], version=1) is None
+    assert snapshot_cache.decode(b"HVS0" + data[4:], version=1) is None
+
+
+def test_backend_maps_other_window_by_address():
+    header = struct.Struct("<4sdHH")
+    # 起始地址不同的文件按地址还原，本寄存器表窗口以外的地址丢弃
+    data = header.pack(b"HVS1", 1.0, 1033, 2) + struct.pack("<HH", 1, 7) + b"\x01\x01"
+    moved = snapshot_cache.decode(data, version=1)
+    assert moved.stale and moved.raw_value(1033) == 1 and moved.raw_value(1034) == 7
+    assert moved.raw_value(1024) is None
+    outside = header.pack(b"HVS1", 1.0, 2000, 1) + struct.pack("<H", 1) + b"\x01"
+    assert snapshot_cache.decode(outside, version=1) is None
+
+
+def test_backend_cache_file(tmp_path):
+    cache = snapshot_cache.SnapshotCache({"path": tmp_path / "snapshot.bin", "save_interval": 0})
+    assert cache.load(version=1) is None
+    assert asyncio.run(cache.save(_backend_snapshot()))
+    # 内容未变化时不重复写盘
+    assert not asyncio.run(cache.save(_backend_snapshot()))
+    assert cache.load(version=2).raw_value(1168) == 42
+    (tmp_path / "snapshot.bin").write_bytes(b"HVS1")
+    assert cache.load(version=3) is None
+
+
+def test_integration_round_trip(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    ha_snapshot.write_snapshot(path, _ha_file())
+    assert ha_snapshot.read_snapshot(path) == (1700000000.5, VALUES)
+    assert ha_snapshot.read_snapshot(tmp_path / "missing.bin") is None
+
+
+def test_integration_rejects_truncated_and_bad_magic():
+    data = _ha_file()
+    assert ha_snapshot.decode_snapshot(data[:-1]) is None
+    assert ha_snapshot.decode_snapshot(data[:10]) is None
+    assert ha_snapshot.decode_snapshot(b"HVS0" + data[4:]) is None
+
+
+def test_integration_maps_other_window_by_address():
+    header = struct.Struct("<4sdHH")
+    # 起始地址不同的文件按地址还原，长度与跨度不符时作废
+    data = header.pack(b"HVS1", 1.0, 1033, 2) + struct.pack("<HH", 1, 7) + b"\x01\x00"
+    assert ha_snapshot.decode_snapshot(data) == (1.0, {1033: 1})
+    assert ha_snapshot.decode_snapshot(data + b"\x00") is None
+
+
+def test_formats_are_interchangeable():
+    timestamp, values = ha_snapshot.decode_snapshot(snapshot_cache.encode(_backend_snapshot()))
+    assert timestamp == 1700000000.5
+    assert {address: values[address] for address in VALUES} == VALUES
+    # 两端地址窗口不同（集成按读取块，后端按寄存器表），同样按地址还原
+    loaded = snapshot_cache.decode(_ha_file(), version=1)
+    assert {address: loaded.raw_value(address) for address in VALUES} == VALUES
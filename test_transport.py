@@ -0,0 +1,79 @@
+"""
+测试流水线传输对异常 MBAP 帧的处理：帧错误时关闭连接并让等待中的请求立即失败
+"""
+import asyncio
+import struct
+
+import pytest
+from pymodbus.exceptions import ModbusIOException
+
+from hvac_modbus.transport import PipelinedModbusClient
+
+
+async def _serve(respond):
+    """启动一个对每个请求调用 respond(tid, pdu) 并回写其结果的服务器"""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                tid, _, length, _ = struct.unpack(">HHHB", await reader.readexactly(7))
+                pdu = await reader.readexactly(length - 1)
+                writer.write(respond(tid, pdu))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def _frame(tid, pdu, length=None):
+    return struct.pack(">HHHB", tid, 0, len(pdu) + 1 if length is None else length, 1) + pdu
+
+
+async def _read(respond, check=None):
+    server, port = await _serve(respond)
+    client = PipelinedModbusClient("127.0.0.1", port, timeout=2, max_in_flight=4)
+    assert await client.connect()
+    try:
+        return await client.read_holding_registers(1024, 2, 1)
+    finally:
+        if check is not None:
+            check(client)
+        client.close()
+        server.close()
+        await server.wait_closed()
+
+
+def test_read():
+    response = asyncio.run(_read(lambda tid, pdu: _frame(tid, b"\x03\x04\x00\x01\x00\x02")))
+    assert response.registers == [1, 2]
+
+
+def test_exception_response():
+    response = asyncio.run(_read(lambda tid, pdu: _frame(tid, b"\x83\x02")))
+    assert response.isError()
+    assert response.exception_code == 2
+
+
+@pytest.mark.parametrize(
+    "respond",
+    [
+        # 长度为 0：无法分帧
+        lambda tid, pdu: _frame(tid, b"", length=0),
+        # 功能码与请求不符
+        lambda tid, pdu: _frame(tid, b"\x04\x04\x00\x01\x00\x02"),
+    ],
+    ids=["zero-length", "wrong-function"],
+)
+def test_framing_error_closes_connection(respond):
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        connected = []
+        with pytest.raises(ModbusIOException):
+            await _read(respond, lambda client: connected.append(client.connected))
+        assert connected == [False]
+        # 立即失败而不是等到超时
+        assert loop.time() - start < 1
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+"""
+测试后端写入前的取值范围校验：超出寄存器类型范围的值按单个寄存器失败返回，不会被截断后写入设备
+"""
+import asyncio
+
+import pytest
+
+from hvac_backend import registers as reg
+from hvac_backend.modbus_client import ModbusClient
+
+FAN_SPEED = reg.FIELDS["system"]["fan_speed"]
+
+
+def test_to_raw_checks_unsigned_range():
+    assert reg.to_raw(65535, FAN_SPEED) == 65535
+    assert reg.to_raw(70000, FAN_SPEED) is None
+    assert reg.to_raw(-1, FAN_SPEED) is None
+    assert reg.to_raw(float("inf"), FAN_SPEED) is None
+    assert reg.to_raw(float("nan"), FAN_SPEED) is None
+
+
+def test_to_raw_checks_signed_range(monkeypatch):
+    offset = FAN_SPEED - reg.BASE_ADDRESS
+    monkeypatch.setattr(reg, "SIGNED_SET", reg.SIGNED_SET | {offset})
+    assert reg.to_raw(-1, FAN_SPEED) == 0xFFFF
+    assert reg.to_raw(-32768, FAN_SPEED) == 0x8000
+    assert reg.to_raw(32768, FAN_SPEED) is None
+    assert reg.to_raw(-32769, FAN_SPEED) is None
+
+
+@pytest.mark.parametrize("value", [70000, -1])
+def test_write_batch_reports_out_of_range_per_register(value):
+    async def write():
+        client = ModbusClient({})
+        return await client.write_batch({FAN_SPEED: value})
+
+    assert asyncio.run(write()) == {
+        FAN_SPEED: {"success": False, "raw": None, "error": "Value out of range"}
+    }
+
+
+def test_out_of_range_value_is_never_sent():
+    async def write():
+        client = ModbusClient({})
+        sent = []
+
+        async def write_block(start, values):
+            sent.append((start, values))
+            return True
+
+        client._write_block = write_block
+        client._connected = True
+        client._client = type("Connected", (), {"connected": True})()
+        results = await client.write_batch({FAN_SPEED: 70000, FAN_SPEED + 1: 5})
+        return sent, results
+
+    sent, results = asyncio.run(write())
+    assert results[FAN_SPEED]["error"] == "Value out of range"
+    assert results[FAN_SPEED + 1]["success"]
+    assert sent == [(FAN_SPEED + 1, [5])]